@@ -23,8 +23,22 @@ import os, sys
 # sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__name__))))
 from models.base import Base
 
+from models.system.syslog.log_partition import LogPartitionRouter
+
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """日志分区表(sys_logs_YYYYMM/sys_logs_YYYYMMDD)和全文索引表由程序按需创建，不参与自动迁移"""
+    if type_ == "table" and LogPartitionRouter.partition_range(name) is not None:
+        return False
+    # 日志全文索引表(FTS5 虚拟表及其影子表)由程序按需创建
+    if type_ == "table" and name.startswith("sys_logs_fts"):
+        return False
+    if type_ == "index" and LogPartitionRouter.partition_range(object.table.name) is not None:
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -47,6 +61,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -69,7 +84,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,34 @@
+"""缓存版本表
+
+Revision ID: a1c3e5f7b9d2
+Revises: f4283f07d33b
+Create Date: 2025-08-02 10:12:40.318202
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b9d2'
+down_revision: Union[str, None] = 'f4283f07d33b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sys_cache_version',
+    sa.Column('namespace', sa.String(length=50), nullable=False, comment='缓存命名空间'),
+    sa.Column('version', sa.Integer(), nullable=False, comment='版本号'),
+    sa.Column('update_time', sa.DateTime(), nullable=False, comment='最后变更时间'),
+    sa.PrimaryKeyConstraint('namespace'),
+    comment='缓存版本表'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sys_cache_version')
@@ -0,0 +1,37 @@
+"""缓存变更日志表
+
+Revision ID: b3d6f9a2c8e4
+Revises: e5b8f1c3a7d9
+Create Date: 2025-08-14 15:27:03.581946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d6f9a2c8e4'
+down_revision: Union[str, None] = 'e5b8f1c3a7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sys_cache_change',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='主键'),
+    sa.Column('namespace', sa.String(length=50), nullable=False, comment='缓存命名空间'),
+    sa.Column('item_key', sa.String(length=64), nullable=False, comment='条目键'),
+    sa.Column('create_time', sa.DateTime(), nullable=False, comment='记录时间'),
+    sa.PrimaryKeyConstraint('id'),
+    comment='缓存变更日志表'
+    )
+    op.create_index(op.f('ix_sys_cache_change_create_time'), 'sys_cache_change', ['create_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sys_cache_change_create_time'), table_name='sys_cache_change')
+    op.drop_table('sys_cache_change')
@@ -0,0 +1,55 @@
+"""日志组合索引
+
+Revision ID: c7d2e9a4b6f1
+Revises: a1c3e5f7b9d2
+Create Date: 2025-08-09 15:26:11.804517
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e9a4b6f1'
+down_revision: Union[str, None] = 'a1c3e5f7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 组合索引: (索引名后缀, 字段)，索引名为 idx_<表名>_<后缀>
+COMPOSITE_INDEXES = (
+    ('timestamp_level', ['timestamp', 'log_level']),
+    ('user_timestamp', ['user_id', 'timestamp']),
+    ('module_operation_timestamp', ['logmodule', 'operation', 'timestamp']),
+)
+# 被组合索引前缀覆盖的单列索引
+REPLACED_INDEXES = (
+    ('logmodule', ['logmodule']),
+    ('user_id', ['user_id']),
+)
+
+
+def log_tables() -> list[str]:
+    """sys_logs 及已创建的日志分区表"""
+    names = sa.inspect(op.get_bind()).get_table_names()
+    return [name for name in names if re.match(r'^sys_logs(_\d{6}|_\d{8})?$', name)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in log_tables():
+        for suffix, columns in COMPOSITE_INDEXES:
+            op.create_index(f'idx_{table_name}_{suffix}', table_name, columns, unique=False)
+        for suffix, _ in REPLACED_INDEXES:
+            op.drop_index(f'ix_{table_name}_{suffix}', table_name=table_name)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in log_tables():
+        for suffix, columns in REPLACED_INDEXES:
+            op.create_index(f'ix_{table_name}_{suffix}', table_name, columns, unique=False)
+        for suffix, _ in COMPOSITE_INDEXES:
+            op.drop_index(f'idx_{table_name}_{suffix}', table_name=table_name)
@@ -0,0 +1,52 @@
+"""日志指标汇总表
+
+Revision ID: e5b8f1c3a7d9
+Revises: c7d2e9a4b6f1
+Create Date: 2025-08-12 09:41:37.215863
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8f1c3a7d9'
+down_revision: Union[str, None] = 'c7d2e9a4b6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sys_log_metrics_minute',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='主键'),
+    sa.Column('bucket', sa.DateTime(), nullable=False, comment='分钟时间'),
+    sa.Column('logmodule', sa.String(length=50), nullable=False, comment='日志模块'),
+    sa.Column('operation', sa.String(length=100), nullable=False, comment='操作标识'),
+    sa.Column('count', sa.Integer(), nullable=False, comment='日志条数'),
+    sa.Column('error_count', sa.Integer(), nullable=False, comment='失败条数'),
+    sa.Column('duration_sum', sa.BigInteger(), nullable=False, comment='耗时合计(毫秒)'),
+    sa.Column('duration_min', sa.Integer(), nullable=False, comment='最小耗时(毫秒)'),
+    sa.Column('duration_max', sa.Integer(), nullable=False, comment='最大耗时(毫秒)'),
+    sa.Column('le_1', sa.Integer(), nullable=False, comment='耗时<=1ms'),
+    sa.Column('le_5', sa.Integer(), nullable=False, comment='耗时<=5ms'),
+    sa.Column('le_10', sa.Integer(), nullable=False, comment='耗时<=10ms'),
+    sa.Column('le_50', sa.Integer(), nullable=False, comment='耗时<=50ms'),
+    sa.Column('le_100', sa.Integer(), nullable=False, comment='耗时<=100ms'),
+    sa.Column('le_500', sa.Integer(), nullable=False, comment='耗时<=500ms'),
+    sa.Column('le_1000', sa.Integer(), nullable=False, comment='耗时<=1000ms'),
+    sa.Column('le_5000', sa.Integer(), nullable=False, comment='耗时<=5000ms'),
+    sa.Column('gt_5000', sa.Integer(), nullable=False, comment='耗时>5000ms'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket', 'logmodule', 'operation', name='uq_log_metrics_minute'),
+    comment='日志指标分钟汇总表'
+    )
+    op.create_index(op.f('ix_sys_log_metrics_minute_bucket'), 'sys_log_metrics_minute', ['bucket'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sys_log_metrics_minute_bucket'), table_name='sys_log_metrics_minute')
+    op.drop_table('sys_log_metrics_minute')
@@ -0,0 +1,108 @@
+"""
+子部门查询基准测试: 递归CTE vs dept_path 前缀范围扫描
+
+在内存 SQLite 中生成合成部门树(默认 50000 个部门)，
+分别用 BaseService 中的两种查询构建方法查询若干子树，比较耗时并校验结果一致。
+
+用法:
+    python -m benchmarks.dept_subtree_bench
+    python -m benchmarks.dept_subtree_bench --depts 50000 --fanout 8 --repeat 20
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.pool import StaticPool
+
+from models.base_service import BaseService
+from models.system import DeptModel
+
+
+def build_tree(conn, total: int, fanout: int):
+    """按层生成部门树，每个部门最多 fanout 个子部门，返回 {部门ID: dept_path}"""
+    now = datetime.now()
+    paths = {1: ".1."}
+    rows = [
+        dict(id=1, name="root", dept_path=".1.", parent_id=0, order_num=0,
+             status=True, del_flag=False, create_by=1, create_time=now)
+    ]
+    next_id = 2
+    frontier = [1]
+    while next_id <= total:
+        new_frontier = []
+        for parent_id in frontier:
+            for _ in range(fanout):
+                if next_id > total:
+                    break
+                paths[next_id] = f"{paths[parent_id]}{next_id}."
+                rows.append(
+                    dict(id=next_id, name=f"dept{next_id}", dept_path=paths[next_id],
+                         parent_id=parent_id, order_num=0, status=True,
+                         del_flag=False, create_by=1, create_time=now)
+                )
+                new_frontier.append(next_id)
+                next_id += 1
+        frontier = new_frontier
+    conn.execute(insert(DeptModel.__table__), rows)
+    return paths
+
+
+def timed(conn, stmt, repeat: int) -> tuple[float, set[int]]:
+    """执行 repeat 次，返回平均耗时(毫秒)和结果"""
+    result = set()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = set(conn.scalars(stmt).all())
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="子部门查询基准测试")
+    parser.add_argument("--depts", type=int, default=50000, help="部门总数")
+    parser.add_argument("--fanout", type=int, default=8, help="每个部门的子部门数")
+    parser.add_argument("--repeat", type=int, default=20, help="每个查询重复次数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    DeptModel.__table__.create(engine)
+    with engine.begin() as conn:
+        paths = build_tree(conn, args.depts, args.fanout)
+
+    random.seed(args.seed)
+    depth_of = {dept_id: path.count(".") - 1 for dept_id, path in paths.items()}
+    max_depth = max(depth_of.values())
+    samples = [("根部门", {1})]
+    for depth in range(2, max_depth + 1):
+        candidates = [d for d, level in depth_of.items() if level == depth]
+        samples.append((f"第{depth}层部门", set(random.sample(candidates, 1))))
+    candidates = [d for d, level in depth_of.items() if level == 3]
+    samples.append(("第3层多部门", set(random.sample(candidates, min(5, len(candidates))))))
+
+    print(f"部门总数: {args.depts}, 每层子部门数: {args.fanout}, 树深度: {max_depth}")
+    print(f"{'子树':<12}{'结果数':>10}{'CTE(ms)':>12}{'path(ms)':>12}{'加速比':>10}")
+    with engine.connect() as conn:
+        for label, dept_ids in samples:
+            cte_ms, cte_ids = timed(
+                conn, BaseService.build_descendant_cte_query(dept_ids), args.repeat
+            )
+            root_paths = conn.scalars(
+                select(DeptModel.dept_path).where(DeptModel.id.in_(dept_ids))
+            ).all()
+            path_ms, path_ids = timed(
+                conn, BaseService.build_descendant_path_query(root_paths), args.repeat
+            )
+            assert cte_ids == path_ids, f"{label} 查询结果不一致"
+            print(
+                f"{label:<12}{len(cte_ids):>10}{cte_ms:>12.2f}{path_ms:>12.2f}"
+                f"{cte_ms / path_ms if path_ms else float('inf'):>10.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+日志格式化开销基准测试: JSON 格式字符串(SafeFormatter) vs 结构化格式化器(StructuredFormatter)
+
+模拟 logconfig 的三个处理器(控制台、文件、数据库)共用一个格式化器，
+统计每条日志经过全部处理器格式化的平均耗时(微秒/条)，并检查输出是否为合法 JSON。
+
+用法:
+    python -m benchmarks.formatter_bench
+    python -m benchmarks.formatter_bench --records 50000 --handlers 3
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from tools.public.enum import LogModule, OperationType
+from tools.sys_log import json_formatter
+from tools.sys_log.json_formatter import StructuredFormatter
+from tools.sys_log.logger import SafeFormatter
+
+# 旧实现: logconfig 中拼接的 JSON 形式格式字符串
+LEGACY_FORMAT = (
+    "{"
+    '"timestamp": "%(asctime)s", '
+    '"level": "%(levelname)s", '
+    '"message": "%(message)s", '
+    '"logmodule": "%(logmodule)s", '
+    '"operation": "%(operation)s", '
+    '"status": "%(status)s", '
+    '"duration_ms": %(duration_ms)d, '
+    '"logmodule_operation": "%(logmodule_operation)s", '
+    '"description": %(description)s, '
+    "}"
+)
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            "bench", logging.WARNING, __file__, 1, f'查询用户 "admin{i}" 列表', None, None
+        )
+        record.logmodule = LogModule.USER
+        record.operation = OperationType.QUERY
+        record.status = "成功"
+        record.duration_ms = i % 50
+        record.description = {"函数名": "get_all", "行号": i % 1000, "ip": "127.0.0.1"}
+        records.append(record)
+    return records
+
+
+def run(formatter: logging.Formatter, records, handlers: int) -> tuple[float, bool]:
+    """返回 (微秒/条, 输出是否为合法 JSON)"""
+    start = time.perf_counter()
+    for record in records:
+        for _ in range(handlers):
+            text = formatter.format(record)
+    elapsed = (time.perf_counter() - start) * 1e6 / len(records)
+    try:
+        json.loads(text)
+        valid = True
+    except ValueError:
+        valid = False
+    return elapsed, valid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志格式化开销基准测试")
+    parser.add_argument("--records", type=int, default=20000, help="日志条数")
+    parser.add_argument("--handlers", type=int, default=3, help="共用格式化器的处理器数量")
+    args = parser.parse_args()
+
+    cases = [("SafeFormatter(格式字符串)", SafeFormatter(LEGACY_FORMAT), None)]
+    if json_formatter.orjson is not None:
+        cases.append(("StructuredFormatter(orjson)", StructuredFormatter(), json_formatter._dumps_orjson))
+    cases.append(("StructuredFormatter(json)", StructuredFormatter(), json_formatter._dumps_json))
+
+    print(f"日志条数: {args.records}, 处理器数量: {args.handlers}")
+    print(f"{'格式化器':<32}{'us/条':>10}{'合法JSON':>10}")
+    for label, formatter, dumps in cases:
+        if dumps is not None:
+            json_formatter.dumps = dumps
+        elapsed, valid = run(formatter, make_records(args.records), args.handlers)
+        print(f"{label:<32}{elapsed:>10.2f}{str(valid):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+DashLogger 单次调用开销基准测试
+
+对比以下几种调用路径在调用线程上的平均耗时(微秒/次)：
+- 旧实现: inspect.stack() 获取调用方 + 同步格式化输出
+- 同步: sys._getframe 获取调用方 + 同步格式化输出
+- 异步: sys._getframe 获取调用方，入队后返回，格式化输出在后台线程
+- 级别未启用: 日志级别低于 logger 级别，直接返回
+
+处理器为写入内存的 StreamHandler，使用与 logconfig 相同的 StructuredFormatter，
+异步模式另外统计后台线程输出完全部日志的总耗时。
+
+用法:
+    python -m benchmarks.logger_bench
+    python -m benchmarks.logger_bench --calls 20000 --depth 20
+"""
+
+import argparse
+import inspect
+import io
+import logging
+import time
+
+from tools.sys_log.json_formatter import StructuredFormatter
+from tools.sys_log.logger import DashLogger
+
+
+class LegacyStackLogger(DashLogger):
+    """旧实现: 每次调用通过 inspect.stack() 获取调用方信息"""
+
+    def _capture_caller(self):
+        stack = inspect.stack()
+        safe_index = min(self.CALLER_DEPTH, len(stack) - 1)
+        frame_info = stack[safe_index]
+        return (
+            frame_info.frame.f_globals.get("__name__", "unknown"),
+            frame_info.filename,
+            frame_info.function,
+            frame_info.lineno,
+        )
+
+
+def build_logger(name: str, level: int) -> logging.Logger:
+    logger = logging.Logger(name, level=level)
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(StructuredFormatter())
+    logger.addHandler(handler)
+    return logger
+
+
+def call_at_depth(depth: int, func, *args):
+    """在指定调用栈深度上执行，模拟 Dash 回调 -> 服务层 的真实栈深"""
+    if depth <= 0:
+        return func(*args)
+    return call_at_depth(depth - 1, func, *args)
+
+
+def run(dash_logger: DashLogger, calls: int) -> float:
+    """返回调用线程上的平均耗时(微秒/次)"""
+    info = dash_logger.info
+    logmodule = dash_logger.logmodule.BASE_SERVICE
+    operation = dash_logger.operation.QUERY
+    start = time.perf_counter()
+    for i in range(calls):
+        info(f"查询数据{i}", logmodule, operation, extra={"duration_ms": 1})
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DashLogger 单次调用开销基准测试")
+    parser.add_argument("--calls", type=int, default=5000, help="每种模式的调用次数")
+    parser.add_argument("--depth", type=int, default=30, help="调用栈额外深度")
+    args = parser.parse_args()
+
+    cases = [
+        ("旧实现(inspect.stack)", LegacyStackLogger, False, logging.INFO),
+        ("同步(_getframe)", DashLogger, False, logging.INFO),
+        ("异步(_getframe)", DashLogger, True, logging.INFO),
+        ("级别未启用", DashLogger, True, logging.WARNING),
+    ]
+    print(f"调用次数: {args.calls}, 额外栈深度: {args.depth}")
+    print(f"{'模式':<24}{'调用线程(us/次)':>16}{'全部输出完成(ms)':>18}")
+    for label, logger_cls, async_mode, level in cases:
+        dash_logger = logger_cls()
+        dash_logger.init_app(build_logger(label, level), async_mode=async_mode)
+        start = time.perf_counter()
+        per_call = call_at_depth(args.depth, run, dash_logger, args.calls)
+        dash_logger.flush(timeout=None)
+        total_ms = (time.perf_counter() - start) * 1000
+        dash_logger.close()
+        print(f"{label:<24}{per_call:>16.2f}{total_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
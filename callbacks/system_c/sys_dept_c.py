@@ -315,11 +315,11 @@ def delete_dept(okCounts, recent_row):
     try:
         with get_db() as db:
             dept_service = DeptService(db, current_user.id)
-            result = dept_service.delete(
-                obj_id=recent_row["id"],
-            )
-            if result:
-                global_message("success", f"{result.name}部门删除成功")
+            result = dept_service.bulk_delete([recent_row["id"]])[int(recent_row["id"])]
+        if result["status"] == "success":
+            global_message("success", f"{result['name']}部门删除成功")
+        else:
+            global_message("error", f"删除部门失败{result['message']}")
     except PermissionError as e:
         global_message("error", f"删除部门失败，权限不足:{e}")
 
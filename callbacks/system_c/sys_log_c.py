@@ -1,4 +1,5 @@
 # 第三方包
+import json
 import dash
 from dash import Input, Output, State
 
@@ -13,6 +14,8 @@ def render_log_list_table(
     total_count: int | None,
     page_num: int = 1,
     page_size: int = 30,
+    total_capped: bool = False,
+    has_next: bool = False,
 ) -> tuple[list[dict], dict]:
     pagination = {
         "current": page_num,
@@ -22,11 +25,17 @@ def render_log_list_table(
         "showSizeChanger": True,
         "pageSizeOptions": [30, 50, 100],
     }
+    if total_capped:
+        # 总数超出统计上限，显示为 "N+"；还有下一页时保证总数大于已翻过的行数，可以继续向后翻页
+        if has_next:
+            pagination["total"] = max(total_count, page_num * page_size + 1)
+        pagination["showTotalPrefix"] = "共 "
+        pagination["showTotalSuffix"] = "+ 条"
     if logs is None:
         return [], pagination
     logs_data = [
         {
-            "key": str(log.id),
+            "key": f"{log.partition}-{log.id}",
             "timestamp": log.timestamp.strftime("%Y-%m-%d %H:%M:%S")
             if log.timestamp
             else "无",
@@ -45,6 +54,13 @@ def render_log_list_table(
     return logs_data, pagination
 
 
+def cursor_query_key(values: dict, page_size: int) -> str:
+    """续页令牌对应的查询条件，查询条件或每页数量变化后之前的令牌作废"""
+    # 空条件不参与过滤(见 LogService._field_conditions)，与未填写等价
+    values = {k: v for k, v in values.items() if v is not None and v != ""}
+    return json.dumps([values, page_size], sort_keys=True, default=str)
+
+
 @app.callback(
     Output("log-search-form", "values"),
     Input("log-reset", "nClicks"),
@@ -57,6 +73,8 @@ def reset_search_form(reset_click):
     [
         Output("log-list-table", "data"),
         Output("log-list-table", "pagination"),
+        # 输出：第2页的续页令牌，首次翻页即可使用游标分页
+        Output("log-page-cursor-store", "data"),
     ],
     Input("core-url", "pathname"),
 )
@@ -66,13 +84,21 @@ def update_log_list_table(pathname):
         try:
             with get_db() as db:
                 log_service = LogService(db_session=db)
-                logs_data, total_count = log_service.get_all_by_fields(
-                    page=1, page_size=30
+                logs_data, total_count, next_cursor, total_capped = log_service.get_page_by_cursor(
+                    page_size=30
                 )
                 logs_table_data, pagination = render_log_list_table(
-                    logs_data, total_count
+                    logs_data,
+                    total_count,
+                    total_capped=total_capped,
+                    has_next=next_cursor is not None,
                 )
-            return logs_table_data, pagination
+            cursors = {"2": next_cursor} if next_cursor else {}
+            return (
+                logs_table_data,
+                pagination,
+                {"query_key": cursor_query_key({}, 30), "cursors": cursors},
+            )
         except Exception as e:
             global_message("error", f"日志列表加载失败:{e}")
     return dash.no_update
@@ -83,6 +109,8 @@ def update_log_list_table(pathname):
     [
         Output("log-list-table", "data", allow_duplicate=True),
         Output("log-list-table", "pagination", allow_duplicate=True),
+        # 输出：日志列表游标分页的续页令牌
+        Output("log-page-cursor-store", "data", allow_duplicate=True),
     ],
     [
         Input("log-search", "nClicks"),
@@ -91,10 +119,12 @@ def update_log_list_table(pathname):
     ],
     [
         State("log-search-form", "values"),
+        # 状态：日志列表游标分页的续页令牌
+        State("log-page-cursor-store", "data"),
     ],
     prevent_initial_call=True,
 )
-def log_list_select_data(search_nClicks, reset_click, pagination, values):
+def log_list_select_data(search_nClicks, reset_click, pagination, values, cursor_state):
     values = values or {}
     page_num = pagination.get("current", 1)
     page_size = pagination.get("pageSize", 30)
@@ -103,15 +133,56 @@ def log_list_select_data(search_nClicks, reset_click, pagination, values):
             values = values or {}
             if dash.ctx.triggered_id == "log-reset":
                 values = {}
-            if values.get("create_time_range", None):
-                values["create_time_start"] = values["create_time_range"][0]
-                values["create_time_end"] = values["create_time_range"][1]
+            create_time_range = values.pop("create_time_range", None)
+            keyword = (values.pop("keyword", None) or "").strip()
             log_service = LogService(db_session=db)
-            print(values)
-            logs_data, total_count = log_service.get_all_by_fields(
-                page=page_num, page_size=page_size, **values
+            # 关键字搜索按相关度排序，按页码分页
+            if keyword:
+                logs_data, total_count, total_capped = log_service.search(
+                    keyword,
+                    time_range=create_time_range,
+                    page=page_num,
+                    page_size=page_size,
+                    **values,
+                )
+                logs_table_data, new_pagination = render_log_list_table(
+                    logs_data,
+                    total_count,
+                    page_num,
+                    page_size,
+                    total_capped=total_capped,
+                    has_next=len(logs_data) == page_size,
+                )
+                return logs_table_data, new_pagination, None
+            if create_time_range:
+                values["create_time_start"] = create_time_range[0]
+                values["create_time_end"] = create_time_range[1]
+            # 游标分页: 查询条件或每页数量变化后，之前记录的续页令牌作废
+            cursor_state = cursor_state or {}
+            query_key = cursor_query_key(values, page_size)
+            cursors = (
+                cursor_state.get("cursors", {})
+                if cursor_state.get("query_key") == query_key
+                else {}
+            )
+            # 顺序翻页使用上一页返回的续页令牌，跳页时回退为按页码查询
+            logs_data, total_count, next_cursor, total_capped = log_service.get_page_by_cursor(
+                page_size=page_size,
+                cursor=cursors.get(str(page_num)),
+                page=page_num,
+                **values,
             )
-        return render_log_list_table(logs_data, total_count, page_num, page_size)
+        if next_cursor:
+            cursors[str(page_num + 1)] = next_cursor
+        logs_table_data, new_pagination = render_log_list_table(
+            logs_data,
+            total_count,
+            page_num,
+            page_size,
+            total_capped=total_capped,
+            has_next=next_cursor is not None,
+        )
+        return logs_table_data, new_pagination, {"query_key": query_key, "cursors": cursors}
     except Exception as e:
         global_message("error", f"查询失败:{e}")
     return dash.no_update
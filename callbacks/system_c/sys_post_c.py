@@ -64,7 +64,9 @@ def update_post_list_table(pathname):
         try:
             with get_db() as db:
                 post_service = PostService(db, current_user_id=current_user.id)
-                post_data, total_count = post_service.get_all(page=1, page_size=30)
+                post_data, total_count = post_service.get_all(
+                    page=1, page_size=30, plan="post_table_row"
+                )
                 post_table_data, pagination = render_post_list_table(post_data, total_count)
                 dept_options = DeptService(
                     db=db, current_user_id=current_user.id
@@ -117,7 +119,9 @@ def post_list_select_data(
                 values["dept_id"] = dept_ids
             post_data, total_count = PostService(
                 db=db, current_user_id=current_user.id
-            ).get_all_by_fields(page_num, page_size, **values)
+            ).get_all_by_fields(
+                page_num, page_size, plan="post_table_row", **values
+            )
         return render_post_list_table(post_data, total_count, page_num, page_size)
     except Exception as e:
         global_message("error", f"岗位查询失败:{e}")
@@ -312,13 +316,15 @@ def delete_post(okCounts, delete_ids):
     try:
         with get_db() as db:
             post_service = PostService(db, current_user.id)
-
-            for post_id in delete_ids:
-                # 调用删除方法
-                result = post_service.delete(obj_id=post_id)
-                if result:
-                    global_message("success", f"{result.name}岗位删除成功")
-            # 重新加载岗位列表数据
+            # 调用批量删除方法
+            results = post_service.bulk_delete(delete_ids)
+        for post_id, result in results.items():
+            if result["status"] == "success":
+                global_message("success", f"{result['name']}岗位删除成功")
+            else:
+                global_message(
+                    "error", f"{result['name'] or post_id}岗位删除失败:{result['message']}"
+                )
     except Exception as e:
         global_message("error", f"删除岗位信息失败{e}")
 
@@ -264,7 +264,9 @@ def handle_post_operations(
             else:
                 role_id = recent_row["id"]
             with get_db() as db:
-                role = RoleService(db, current_user.id).get(role_id)
+                role = RoleService(db, current_user.id).get(
+                    role_id, plan="role_edit_modal"
+                )
                 return (
                     True,
                     "修改角色",
@@ -397,10 +399,15 @@ def delete_role(okCounts, delete_ids):
     try:
         with get_db() as db:
             role_service = RoleService(db=db, current_user_id=current_user.id)
-            for role_id in delete_ids:
-                # 调用删除方法
-                result = role_service.delete(obj_id=role_id)
-                global_message("success", f"{result.name}角色删除成功")
+            # 调用批量删除方法
+            results = role_service.bulk_delete(delete_ids)
+        for role_id, result in results.items():
+            if result["status"] == "success":
+                global_message("success", f"{result['name']}角色删除成功")
+            else:
+                global_message(
+                    "error", f"{result['name'] or role_id}角色删除失败:{result['message']}"
+                )
     except Exception as e:
         global_message("error", f"删除角色信息失败{e}")
 
@@ -500,7 +507,7 @@ def update_role_permissions(checked, row, custom):
             dept_service = DeptService(db, current_user.id)
 
             role_id = int(custom["key"])  # 当前编辑角色 ＩＤ
-            role = role_service.get(role_id)
+            role = role_service.get(role_id, plan="role_permission_modal")
 
             dept_tree = (
                 dept_service.get_dept_tree()
@@ -1,6 +1,7 @@
 # 系统包，
 import copy  # 用于深拷贝对象
 import datetime
+import json
 import re
 
 # 第三方包，Dash是一个用于构建Web应用的Python框架
@@ -188,6 +189,8 @@ app.clientside_callback(
         Output("user-list-table", "data", allow_duplicate=True),
         # 输出：用户列表表格的分页信息，允许重复更新
         Output("user-list-table", "pagination", allow_duplicate=True),
+        # 输出：用户列表游标分页的续页令牌
+        Output("user-page-cursor-store", "data"),
     ],
     [
         # 输入：部门树组件中被选中的节点ID列表
@@ -206,6 +209,8 @@ app.clientside_callback(
     [
         # 状态：用户搜索表单容器的隐藏状态
         State("user-search-form", "values"),
+        # 状态：用户列表游标分页的续页令牌
+        State("user-page-cursor-store", "data"),
     ],
     prevent_initial_call=True,
 )
@@ -217,6 +222,7 @@ def update_user_table(
     refresh_clicks,
     user_modal_clicks,
     values,
+    cursor_state,
 ):
     """
     表格数据回调函数，负责表格数据更新显示
@@ -229,9 +235,10 @@ def update_user_table(
         refresh_clicks (int): 刷新按钮的点击次数
         user_modal_clicks (int): 用户模态框的确认次数
         values (dict): 搜索表单值
+        cursor_state (dict): 游标分页状态，记录查询条件和各页的续页令牌
 
     返回:
-        tuple: 包含用户列表表格数据和分页信息的元组
+        tuple: 包含用户列表表格数据、分页信息和游标分页状态的元组
     """
     values = values or {}
     # 分页参数处理，获取当前页码，默认为第1页
@@ -279,17 +286,31 @@ def update_user_table(
         }
     # 使用字典推导式过滤空值
         query_params = {k: v for k, v in query_params.items() if v is not None}
+    # 游标分页: 查询条件或每页数量变化后，之前记录的续页令牌作废
+    cursor_state = cursor_state or {}
+    query_key = json.dumps([query_params, page_size], sort_keys=True, default=str)
+    cursors = (
+        cursor_state.get("cursors", {})
+        if cursor_state.get("query_key") == query_key
+        else {}
+    )
     # 获取数据
     try:
         with get_db() as db:
         # 从数据库中获取符合条件的用户数据和总记录数
-            users_data, total = UserService(
+        # 顺序翻页使用上一页返回的续页令牌，跳页时回退为按页码查询
+            users_data, total, next_cursor = UserService(
                 db, current_user_id=current_user.id
-            ).get_all_by_fields(
-                page=page_num,
+            ).get_page_by_cursor(
                 page_size=page_size,
+                cursor=cursors.get(str(page_num)),
+                page=page_num,
+                plan="user_table_row",
                 **query_params,
             )
+        if next_cursor:
+            cursors[str(page_num + 1)] = next_cursor
+        new_cursor_state = {"query_key": query_key, "cursors": cursors}
         # 构造分页参数
         new_pagination = {
             # 当前页码
@@ -306,7 +327,7 @@ def update_user_table(
             "showQuickJumper": True,
         }
         if not users_data:
-            return [], pagination
+            return [], pagination, new_cursor_state
         # 构造返回数据
         table_data = [
             {
@@ -345,7 +366,7 @@ def update_user_table(
             for user in users_data
         ]
 
-        return table_data, new_pagination
+        return table_data, new_pagination, new_cursor_state
     except Exception as e:
             global_message("error",f"查询用户列表失败:{e}")
             users_data, total = [], 0
@@ -478,7 +499,9 @@ def show_add_modal(
             
             try:
                 with get_db() as db:
-                    user = UserService(db=db, current_user_id=current_user.id).get(user_id)
+                    user = UserService(db=db, current_user_id=current_user.id).get(
+                        user_id, plan="user_edit_modal"
+                    )
                     # 设置用户表单的默认值
                     default_values = {
                         "name": user.name ,
@@ -736,12 +759,17 @@ def user_delete_confirm(delete_confirm, user_ids_data):
         
         try:
             with get_db() as db:
-                for user_id in user_ids_data:
-                    result = UserService(db=db, current_user_id=current_user.id).delete(
-                        user_id
+                results = UserService(
+                    db=db, current_user_id=current_user.id
+                ).bulk_delete(user_ids_data)
+            for user_id, result in results.items():
+                if result["status"] == "success":
+                    global_message("success", f"用户{result['name']}删除成功")
+                else:
+                    global_message(
+                        "error",
+                        f"用户{result['name'] or user_id}删除失败:{result['message']}",
                     )
-                    if result:
-                        global_message("success", f"用户{result.name}删除成功")
         except PermissionError as e:
             global_message("error", f"删除用户失败，权限不足:{e}")
             return None
@@ -66,6 +66,7 @@ class BaseConfig:
     ENABLE_LOGGING = False  # 全局日志开关，设置为 True 表示开启日志功能
     LOG_LEVEL = "WARNING"  # 全局日志级别，当前设置为 INFO 级别
     LOG_SENSITIVE_FIELDS = ['password', 'token']  # 需要脱敏的敏感字段
+    LOG_ASYNC = True  # 是否异步输出日志，开启后上下文组装、脱敏和处理器输出在后台线程执行，不占用请求线程
 
 
     # 控制台日志配置
@@ -76,22 +77,99 @@ class BaseConfig:
     LOG_TO_FILE = True  # 是否将日志输出到文件，设置为 True 表示开启文件日志
     LOG_FILE_PATH = "logs/app.log"  # 日志文件的存储路径
     LOG_FILE_LEVEL = "INFO"  # 文件日志级别，当前设置为 INFO 级别
-    LOG_FILE_BACKUP_COUNT = 30  # 日志文件的备份数量
+    LOG_FILE_BACKUP_COUNT = 30  # 日志文件的备份数量(所有进程的历史文件合计)
     LOG_ROTATE_WHEN = "midnight"  # 日志文件轮转的时间点，设置为午夜
     LOG_ROTATE_INTERVAL = 1  # 日志文件轮转的间隔，单位根据 LOG_ROTATE_WHEN 确定
     LOG_FILE_ENCODING = "utf-8"  # 日志文件的编码格式
-    LOG_FILE_MAX_BYTES = 10485760  # 单个日志文件最大大小(10MB)
-    LOG_FILE_COMPRESS = True  # 是否压缩历史日志
+    LOG_FILE_MAX_BYTES = 10485760  # 单个日志文件最大大小(10MB)，超过时立即轮转，0 表示只按时间轮转
+    LOG_FILE_COMPRESS = True  # 是否压缩历史日志(后台线程 gzip)
+    # 多进程(多个 gunicorn worker)写日志文件方式：False 所有进程追加写同一个文件，轮转时加文件锁；
+    # True 每个进程写各自的文件 app.<pid>.log
+    LOG_FILE_PER_PROCESS = False
 
     # 数据库日志配置
     LOG_TO_DB = True  # 是否将日志输出到数据库，设置为 True 表示开启数据库日志
     LOG_DB_LEVEL = "WARNING"  # 数据库日志级别，当前设置为 WARNING 级别
     LOG_DB_BATCH_SIZE = 500  # 数据库日志批量写入的数量 
-    LOG_DB_FLUSH_INTERVAL = 10.0  # 数据库日志刷新的间隔时间，单位为秒
-    LOG_QUEUE_MAX_SIZE = 8000  # 日志队列最大长度，防止内存溢出
+    LOG_DB_FLUSH_INTERVAL = 10.0  # 数据库日志最长刷新间隔(秒)，缓冲区达到批量数量时立即写入
+    LOG_DB_CLOSE_TIMEOUT = 10.0  # 关闭时等待剩余日志写入的最长时间(秒)
+    LOG_QUEUE_MAX_SIZE = 8000  # 日志队列最大长度(DashLogger 异步队列和数据库日志队列)，防止内存溢出
+    # 日志队列背压策略，队列写入永不阻塞请求线程，可选:
+    # 'drop_oldest'（满时丢弃最早日志）、'drop_below_level'（超过高水位后丢弃低于 LOG_BACKPRESSURE_MIN_LEVEL 的日志）、
+    # 'sample'（超过高水位后按 LOG_BACKPRESSURE_SAMPLE_RATE 抽样保留）、'spill'（满时暂存到 LOG_SPILL_PATH，空闲后读回）
+    LOG_BACKPRESSURE_POLICY = "drop_oldest"
+    LOG_BACKPRESSURE_HIGH_WATER = 0.8  # 高水位比例(队列长度/最大长度)
+    LOG_BACKPRESSURE_MIN_LEVEL = "WARNING"  # drop_below_level 策略下高水位后保留的最低级别
+    LOG_BACKPRESSURE_SAMPLE_RATE = 10  # sample 策略下高水位后每N条保留1条
+    LOG_SPILL_PATH = "logs/spill"  # spill 策略的暂存目录
     LOG_DB_RETRY_MAX = 3  # 数据库写入最大重试次数
     LOG_DB_RETRY_DELAY = 1.0  # 重试间隔(秒)
     LOG_EMERGENCY_PATH = "logs/emergency"  # 应急日志文件存储路径
+
+    # 请求链路追踪配置
+    # 开启后每个请求生成 trace_id(写入日志 description 和响应头 X-Trace-Id)，
+    # 记录请求内操作(log_operation)、SQL、页面渲染的耗时
+    LOG_TRACE_ENABLED = False
+    # trace 导出方式，可选 'file'（按天写入 LOG_TRACE_PATH 下的 JSON Lines 文件）、'log'（作为 WARNING 日志写入日志库）
+    LOG_TRACE_EXPORTER: Literal["file", "log"] = "file"
+    LOG_TRACE_PATH = "logs/trace"  # trace 文件目录
+    LOG_TRACE_MIN_DURATION_MS = 200  # 只导出总耗时不低于该值(毫秒)的请求，0 表示全部导出
+    LOG_TRACE_MAX_SPANS = 500  # 单个请求最多记录的 span 数，超出部分只计数
+
+    # SQL 查询监控配置
+    # 开启后统计每个请求(Dash 回调)的 SQL 条数、数据库总耗时和重复语句，超过阈值时记录 WARNING 日志
+    LOG_QUERY_MONITOR_ENABLED = False
+    LOG_QUERY_MAX_COUNT = 30  # 单个请求 SQL 条数阈值，0 表示不检查
+    LOG_QUERY_MAX_DURATION_MS = 500  # 单个请求数据库总耗时阈值(毫秒)，0 表示不检查
+    LOG_QUERY_DUPLICATE_THRESHOLD = 5  # 同一语句(只有参数不同)在一个请求内的执行次数阈值，达到时视为疑似 N+1，0 表示不检查
+
+    # 日志汇聚进程配置(多进程部署)
+    # 开启后 worker 不再各自写日志文件和数据库，日志经本地套接字发送给汇聚进程统一写入，
+    # 需先启动 python -m tools.sys_log.aggregator；控制台日志仍由各 worker 输出
+    LOG_AGGREGATOR_ENABLED = False
+    LOG_AGGREGATOR_ADDRESS = "logs/aggregator.sock"  # 汇聚进程监听地址: Unix 套接字路径，或 host:port(TCP，只应监听本机)
+    # 数据库日志分区，可选 'none'（全部写入 sys_logs）、'day'（按天分表 sys_logs_YYYYMMDD）、'month'（按月分表 sys_logs_YYYYMM）
+    # 分区表按需自动创建，查询只访问与时间范围有交集的分区，sys_logs 保留为历史表一并查询
+    LOG_PARTITION_UNIT: Literal["none", "day", "month"] = "month"
+    LOG_RETENTION_DAYS = 180  # 数据库日志保留天数，通过 python -m tools.sys_log.log_retention 定时清理
+    # 过期日志处理方式，可选 'archive'（压缩归档到 LOG_ARCHIVE_PATH 后删除）、'drop'（直接删除）
+    LOG_RETENTION_MODE: Literal["archive", "drop"] = "archive"
+    LOG_ARCHIVE_PATH = "logs/archive"  # 过期日志归档目录(gzip 压缩的 JSON Lines)
+    # 日志全文搜索后端，可选 'auto'（按数据库类型选择）、'fts5'（SQLite FTS5 索引表，写入日志时同步索引）、
+    # 'mysql_fulltext'（MySQL FULLTEXT ngram 索引）、'like'（LIKE 逐表扫描，不建索引）
+    LOG_SEARCH_BACKEND: Literal["auto", "fts5", "mysql_fulltext", "like"] = "auto"
+    LOG_METRICS_ENABLED = True  # 数据库日志写入时按 (分钟, 模块, 操作) 累加指标汇总(次数、错误数、耗时直方图)
+    LOG_METRICS_RETENTION_DAYS = 400  # 指标汇总保留天数，由日志保留任务清理
+    #----------------------------------------------------------全局 缓存配置--------------------------------------------------------------------
+    # 登录用户主体缓存(flask-login user_loader),按 (用户ID, session_token) 缓存
+    PRINCIPAL_CACHE_ENABLED = True  # 是否启用登录用户主体缓存
+    PRINCIPAL_CACHE_TTL = 300  # 缓存有效期(秒)，到期后重新从数据库加载
+    PRINCIPAL_CACHE_MAX_SIZE = 2048  # 缓存最大条目数，超出后按LRU淘汰
+    # 角色权限位掩码缓存,按角色缓存编译后的权限位掩码
+    ROLE_PERMISSION_CACHE_TTL = 600  # 角色权限位掩码缓存有效期(秒)，角色权限变更时会主动失效，过期作为兜底
+    # 数据范围部门集合缓存,按用户有效角色组合缓存可访问的部门ID集合
+    DATA_SCOPE_CACHE_ENABLED = True  # 是否启用数据范围缓存
+    DATA_SCOPE_CACHE_TTL = 600  # 缓存有效期(秒)，部门/角色变更时会主动失效
+    DATA_SCOPE_CACHE_MAX_SIZE = 1024  # 缓存最大条目数(角色组合数)，超出后按LRU淘汰
+    # 跨 worker 缓存失效,各进程轮询 sys_cache_version 表的版本号和 sys_cache_change 表的条目变更
+    CACHE_VERSION_BACKEND = "sql"  # 版本后端，可选 'sql'（数据库表，多进程）、'local'（进程内，单进程）
+    CACHE_VERSION_POLL_INTERVAL = 2.0  # 版本号轮询间隔(秒)，即其他进程缓存失效的最大延迟
+    CACHE_CHANGE_RETENTION = 3600  # 按条目失效的变更记录(sys_cache_change)保留时间(秒)，进程超过该时间未轮询时整体失效
+    CACHE_CHANGE_OVERLAP = 30  # 轮询变更记录时回看的时间窗口(秒)，补读晚于后续记录提交的变更
+    # 分页总数统计方式，可选 'exact'（每次精确统计）、'cached_exact'（按查询条件缓存精确总数，写入相关表时失效）、
+    # 'estimated'（最多统计到 COUNT_ESTIMATE_CAP 条，超出时总数显示为上限值）
+    COUNT_STRATEGY: Literal["exact", "cached_exact", "estimated"] = "cached_exact"
+    COUNT_CACHE_TTL = 30  # 总数缓存有效期(秒)，即其他进程写入后总数的最大滞后时间
+    COUNT_CACHE_MAX_SIZE = 1024  # 缓存最大条目数(查询条件组合数)，超出后按LRU淘汰
+    COUNT_ESTIMATE_CAP = 10000  # estimated 方式下的最大统计条数
+    LOG_COUNT_STRATEGY: Literal["exact", "cached_exact", "estimated"] = "estimated"  # 日志列表总数统计方式，日志持续写入，默认上限统计
+    LOG_COUNT_CAP = 10000  # 日志列表 estimated 方式的总数统计上限，超出时按上限显示
+    #----------------------------------------------------------全局 数据权限配置--------------------------------------------------------------------
+    # 子部门查询方式，可选 'path'（dept_path 索引前缀范围扫描）、'cte'（递归CTE逐层遍历）
+    DEPT_SUBTREE_MODE: Literal["path", "cte"] = "path"
+    # 数据范围过滤方式，可选 'in_list'（计算部门ID集合后生成 IN 列表，可命中数据范围缓存）、
+    # 'exists'（关联 角色部门+部门路径 的 EXISTS 子查询，参数个数固定，适合数据范围很大的场景）
+    DATA_SCOPE_FILTER_MODE: Literal["in_list", "exists"] = "in_list"
     #----------------------------------------------------------全局 浏览器限制配置--------------------------------------------------------------------
     # 浏览器最低版本限制规则
     min_browser_versions: List[dict] = [
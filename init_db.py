@@ -25,11 +25,10 @@ def init_base_data(db: Session):
         db.flush()  # 立即生成ID
         # ====================== 初始化岗位 ======================
         post1 = PostModel(
-            name="未分配", post_code="none", create_by=1, dept_id=root_dept.id
+            name="未分配", post_code="none", create_by=1, dept=root_dept
         )
         db.add(post1)
         db.flush()
-        post1.dept = root_dept
         # ====================== 初始化角色 ======================
         admin_role = RoleModel(
             name="超级管理员",
@@ -49,10 +48,10 @@ def init_base_data(db: Session):
             name="系统管理员",
             password_hash=password_security.generate_hash( "Admin123+admin123"),
             create_by=1,
+            roles=[admin_role],
         )
         db.add(admin_user)
         db.flush()
-        admin_user.roles.append(admin_role)
         db.commit()
         print("\033[92m基础数据初始化成功！\033[0m")
 
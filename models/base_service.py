@@ -1,19 +1,24 @@
-from typing import TypeVar, Generic, List, Optional, Type, Any, Dict, Set
+import json
+import base64
+from typing import TypeVar, Generic, List, Optional, Type, Any, Dict, Set, Iterable
 from datetime import datetime
 
 # 第三方包
-from sqlalchemy.orm import Session, selectinload, aliased
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select, func, exists
+from sqlalchemy import select, update, exists, and_, or_, false
 
 # 自定义包
 from models.base import Base
+from config.base_config import BaseConfig
 from tools.sys_log.logger import dash_logger
 from .system import (
     UserModel,
     RoleModel,
     DeptModel,
     role_to_dept,
+    role_to_user,
     PostModel,
     PermissionsModel,
     role_to_permission,
@@ -27,6 +32,11 @@ from .dele_model_config import (
 from .dele_column_manager import (
     DeleColumnManager,
 )  # 导入数据表敏感字段配置文件,用于数据脱敏
+from .load_plan_manager import (
+    LoadPlanManager,
+)  # 导入关联关系加载计划配置
+from tools.cache import role_permission_cache, data_scope_cache  # 角色权限位掩码缓存、数据范围缓存
+from tools.cache import count_cache  # 分页总数缓存
 
 T = TypeVar("T", bound=Base)
 
@@ -56,6 +66,9 @@ class BaseService(Generic[T]):
         T: 数据模型类型，需继承自 `models.base.Base`
     """
 
+    # 分页总数统计方式，None 表示使用全局配置 BaseConfig.COUNT_STRATEGY
+    count_strategy: str | None = None
+
     def __init__(self, model: Type[T], db: Session, current_user_id: int):
         if not issubclass(model, Base):
             raise TypeError("传入的不是有效数据模型")
@@ -84,13 +97,7 @@ class BaseService(Generic[T]):
             try:
                 user = self.db.scalar(
                     select(UserModel)
-                    .options(
-                        selectinload(
-                            UserModel.roles.and_(
-                                RoleModel.status == 1, RoleModel.del_flag == 0
-                            )
-                        ).selectinload(RoleModel.depts)
-                    )
+                    .options(*LoadPlanManager.get_options("login_principal"))
                     .where(UserModel.id == self.current_user_id)
                     .where(UserModel.status == 1)
                     .where(UserModel.del_flag == 0)
@@ -188,11 +195,10 @@ class BaseService(Generic[T]):
                 permission_tag if permission_tag else self._get_permission_tag(action)
             )
 
-            # 权限校验核心逻辑
-            allowed_permissions = {
-                perm.key for role in roles for perm in (role.permissions or [])
-            }
-            has_permission = final_tag in allowed_permissions
+            # 权限校验核心逻辑: 角色权限预编译为位掩码，校验只需一次按位与
+            has_permission = role_permission_cache.has_permission(
+                self.db, (role.id for role in roles), final_tag
+            )
             if not has_permission and raise_exception:
                 self.logger.warning(
                     f"权限校验失败: {final_tag},缺少权限",
@@ -230,6 +236,8 @@ class BaseService(Generic[T]):
             2. 如果当前用户是管理员，则直接返回原查询语句
             3. 对于 RoleModel 和 DeptModel 模型有特殊的处理逻辑
             4. 其他普通模型通过 dept_id 字段进行数据范围过滤
+            5. 过滤方式由 BaseConfig.DATA_SCOPE_FILTER_MODE 决定:
+               in_list 先计算部门 ID 集合再生成 IN 列表；exists 生成关联子查询
         """
         # 判断模型是否有部门id字段，若没有且模型不是 DeptModel 或 RoleModel，则无需进行数据范围过滤，直接返回原查询语句
         if not hasattr(self.model, "dept_id") and self.model.__name__ not in [
@@ -244,6 +252,20 @@ class BaseService(Generic[T]):
         if is_admin:
             return stmt
 
+        # exists 模式: 数据范围整体下推为关联子查询，参数个数固定
+        if BaseConfig.DATA_SCOPE_FILTER_MODE == "exists":
+            if self.model.__name__ == "RoleModel":
+                # 角色关联的任一部门在数据范围内
+                scope_role_dept = role_to_dept.alias("scope_role_dept_target")
+                return stmt.where(
+                    exists()
+                    .where(scope_role_dept.c.role_id == self.model.id)
+                    .where(self._build_data_scope_exists(scope_role_dept.c.dept_id))
+                )
+            elif self.model.__name__ == "DeptModel":
+                return stmt.where(self._build_data_scope_exists(self.model.id))
+            return stmt.where(self._build_data_scope_exists(self.model.dept_id))
+
         # 构建当前用户可访问的部门 ID 集合
         dept_ids = self._build_data_scope_condition(roles)
 
@@ -262,6 +284,52 @@ class BaseService(Generic[T]):
         # 返回普通表查询条件，通过 dept_id 字段进行数据范围过滤
         return stmt.where(self.model.dept_id.in_(dept_ids))
 
+    def _build_data_scope_exists(self, dept_id_column):
+        """
+        构建"部门在当前用户数据范围内"的 EXISTS 关联子查询
+
+        直接在数据库中关联 用户角色(sys_role_to_sys_user) → 角色部门(sys_role_to_sys_dept)
+        → 部门路径(sys_dept.dept_path)，不在 Python 中展开部门 ID 列表:
+            - DEPT: 目标部门即角色关联部门
+            - DEPT_WITH_CHILD: 目标部门路径以角色关联部门路径为前缀(仅正常、未删除部门)
+
+        Args:
+            dept_id_column: 外层查询中表示部门 ID 的列，如 UserModel.dept_id
+
+        Returns:
+            Exists: 可直接用于 where 的条件，绑定参数个数与数据范围大小无关
+        """
+        target = aliased(DeptModel, name="scope_dept")
+        root = aliased(DeptModel, name="scope_root_dept")
+        role = aliased(RoleModel, name="scope_role")
+        user_role = role_to_user.alias("scope_user_role")
+        role_dept = role_to_dept.alias("scope_role_dept")
+        return (
+            select(1)
+            .select_from(user_role)
+            .join(role, role.id == user_role.c.role_id)
+            .join(role_dept, role_dept.c.role_id == role.id)
+            .join(root, root.id == role_dept.c.dept_id)
+            .where(user_role.c.user_id == self.current_user_id)
+            .where(role.status == 1, role.del_flag == 0)
+            .where(target.id == dept_id_column)
+            .where(
+                or_(
+                    and_(
+                        role.data_scope_type == DataScopeType.DEPT,
+                        target.id == root.id,
+                    ),
+                    and_(
+                        role.data_scope_type == DataScopeType.DEPT_WITH_CHILD,
+                        target.dept_path.startswith(root.dept_path),
+                        target.status == 1,
+                        target.del_flag == 0,
+                    ),
+                )
+            )
+            .exists()
+        )
+
     def _get_roles_by_depts(self, dept_ids: set[int]) -> select:
         """
         通过给定的部门 ID 集合，构建一个 SQLAlchemy 查询语句，用于获取与这些部门关联的角色 ID。
@@ -381,7 +449,17 @@ class BaseService(Generic[T]):
 
         Raises:
             Exception: 当处理过程中出现异常时，会将异常原样抛出
+
+        Notes:
+            结果按角色组合缓存在 data_scope_cache 中，部门或角色部门变更时失效
         """
+        return data_scope_cache.get_or_load(
+            data_scope_cache.make_key(roles),
+            lambda: self._resolve_data_scope_dept_ids(roles),
+        )
+
+    def _resolve_data_scope_dept_ids(self, roles) -> Set[int]:
+        """根据角色关联部门和数据范围类型计算部门 ID 集合(不使用缓存)"""
         dept_ids: Set[int] = set()
         recursive_dept_ids: Set[int] = set()
         try:
@@ -395,7 +473,6 @@ class BaseService(Generic[T]):
             # 单次递归查询获取所有子部门
             if recursive_dept_ids:
                 dept_ids.update(self.get_descendant_dept_ids(recursive_dept_ids))
-            print(dept_ids)
             return dept_ids
         except Exception as e:
             self.logger.error(
@@ -461,11 +538,93 @@ class BaseService(Generic[T]):
 
         return root_nodes
 
+    @staticmethod
+    def build_descendant_cte_query(dept_ids: Set[int]) -> select:
+        """
+        构建递归CTE子部门查询(仅向下遍历部门树结构)
+
+        Args:
+            dept_ids (Set[int]): 初始部门ID集合
+
+        Returns:
+            Select: 查询初始部门及所有下级部门ID的语句(仅正常、未删除部门)
+        """
+        # 构建递归CTE查询
+        dept_cte = (
+            select(DeptModel.id, DeptModel.parent_id)
+            .where(DeptModel.id.in_(dept_ids))
+            .cte(recursive=True, name="descendant_dept")
+        )
+
+        parent_alias = aliased(dept_cte, name="p")
+        child_alias = aliased(DeptModel, name="c")
+
+        # 仅向下递归查询子部门
+        dept_cte = dept_cte.union_all(
+            select(child_alias.id, child_alias.parent_id).join(
+                parent_alias, child_alias.parent_id == parent_alias.c.id
+            )
+        )
+
+        return (
+            select(dept_cte.c.id)
+            .join(DeptModel, DeptModel.id == dept_cte.c.id)
+            .where(DeptModel.status == 1)
+            .where(DeptModel.del_flag == 0)
+        )
+
+    @staticmethod
+    def build_dept_path_condition(dept_paths: Iterable[str], column=None):
+        """
+        构建部门路径前缀条件(子树条件)
+
+        路径只包含数字和 '.'，前缀为 '.1.3.' 的路径都落在区间 ['.1.3.', '.1.3/') 内，
+        用范围比较代替 LIKE '.1.3.%'，在各数据库上都能走 dept_path 索引。
+        互相包含的路径只保留最短的祖先路径。
+
+        Args:
+            dept_paths: 子树根部门的 dept_path 集合
+            column: 比较的路径列，默认 DeptModel.dept_path
+
+        Returns:
+            ColumnElement: OR 连接的范围条件；路径为空时返回 false()
+        """
+        column = DeptModel.dept_path if column is None else column
+        roots: list[str] = []
+        for path in sorted(set(p for p in dept_paths if p)):
+            if not roots or not path.startswith(roots[-1]):
+                roots.append(path)
+        if not roots:
+            return false()
+        return or_(
+            *(and_(column >= path, column < f"{path[:-1]}/") for path in roots)
+        )
+
+    @staticmethod
+    def build_descendant_path_query(dept_paths: Iterable[str]) -> select:
+        """
+        构建基于部门路径前缀的子部门查询
+
+        Args:
+            dept_paths: 子树根部门的 dept_path 集合
+
+        Returns:
+            Select: 查询子树内所有部门ID的语句(仅正常、未删除部门)
+        """
+        return (
+            select(DeptModel.id)
+            .where(BaseService.build_dept_path_condition(dept_paths))
+            .where(DeptModel.status == 1)
+            .where(DeptModel.del_flag == 0)
+        )
+
     def get_descendant_dept_ids(self, dept_ids: Set[int]) -> Set[int]:
         """
         获取指定部门及其所有子部门ID集合
 
-        通过单向递归CTE查询，仅向下遍历部门树结构
+        查询方式由 BaseConfig.DEPT_SUBTREE_MODE 决定:
+            - path: 先取根部门 dept_path，再用索引范围扫描一次取出子树(默认)
+            - cte: 单向递归CTE查询，逐层向下遍历部门树
 
         Args:
             dept_ids (Set[int]): 初始部门ID集合
@@ -481,31 +640,16 @@ class BaseService(Generic[T]):
         if not dept_ids:
             return set()
         try:
-            # 构建递归CTE查询
-            dept_cte = (
-                select(DeptModel.id, DeptModel.parent_id)
-                .where(DeptModel.id.in_(dept_ids))
-                .cte(recursive=True, name="descendant_dept")
-            )
-
-            parent_alias = aliased(dept_cte, name="p")
-            child_alias = aliased(DeptModel, name="c")
-
-            # 仅向下递归查询子部门
-            dept_cte = dept_cte.union_all(
-                select(child_alias.id, child_alias.parent_id).join(
-                    parent_alias, child_alias.parent_id == parent_alias.c.id
-                )
-            )
-
+            if BaseConfig.DEPT_SUBTREE_MODE == "cte":
+                stmt = self.build_descendant_cte_query(dept_ids)
+            else:
+                # 根部门路径(主键查询)，与CTE一致，停用/删除部门只在最终结果中过滤
+                dept_paths = self.db.scalars(
+                    select(DeptModel.dept_path).where(DeptModel.id.in_(dept_ids))
+                ).all()
+                stmt = self.build_descendant_path_query(dept_paths)
             # 单次查询获取所有子部门ID
-            all_ids = self.db.scalars(
-                select(dept_cte.c.id)
-                .join(DeptModel, DeptModel.id == dept_cte.c.id)
-                .where(DeptModel.status == 1)
-                .where(DeptModel.del_flag == 0)
-            ).all()
-            return set(all_ids)
+            return set(self.db.scalars(stmt).all())
         except SQLAlchemyError as e:
             self.logger.error(
                 f"部门ID递归查询异常: {str(e)}",
@@ -527,7 +671,7 @@ class BaseService(Generic[T]):
             return False
         return dept_ids.issubset(user_depts)
 
-    def get(self, obj_id: int) -> Optional[T]:
+    def get(self, obj_id: int, plan: str | None = None) -> Optional[T]:
         """
         根据对象 ID 获取单条数据记录，并进行权限校验和数据范围过滤。
 
@@ -536,6 +680,7 @@ class BaseService(Generic[T]):
 
         Args:
             obj_id (int): 需要获取的数据对象的 ID。
+            plan (str | None): 关联关系加载计划名称，见 LoadPlanManager。
 
         Returns:
             Optional[T]: 获取到的数据对象，若查询失败、无权限或数据不存在则返回 None。
@@ -556,6 +701,8 @@ class BaseService(Generic[T]):
             stmt = self._build_base_query().where(self.model.id == obj_id)
             # 数据范围过滤
             stmt = self._apply_data_scope(stmt)
+            # 按加载计划加载关联关系
+            stmt = stmt.options(*LoadPlanManager.get_options(plan))
             # 返回查询结果
             return self.db.scalar(stmt)
         except PermissionError:
@@ -634,6 +781,7 @@ class BaseService(Generic[T]):
             obj = self.model(**kwargs)
             self.db.add(obj)
             self.db.flush()
+            self._init_empty_collections(obj)
             return obj
 
         except SQLAlchemyError as e:
@@ -653,12 +801,23 @@ class BaseService(Generic[T]):
             )
             raise
 
+    def _init_empty_collections(self, obj: T):
+        """
+        将新建对象未加载的集合关联标记为已加载的空集合
+
+        新插入的数据不可能存在关联记录，标记后可以直接赋值关联(如 role.depts = depts)，
+        不会因 lazy="raise_on_sql" 报错
+        """
+        for relationship in self.model.__mapper__.relationships:
+            if relationship.uselist and relationship.key not in obj.__dict__:
+                set_committed_value(obj, relationship.key, [])
+
     @dash_logger.log_operation(
         "更新数据{obj_id}",
         logmodule=dash_logger.logmodule.BASE_SERVICE,
         operation=dash_logger.operation.UPDATE,
     )
-    def update(self, obj_id: int, **kwargs) -> T:
+    def update(self, obj_id: int, plan: str | None = None, **kwargs) -> T:
         """
         更新指定 ID 的数据记录，并进行权限校验。
 
@@ -668,6 +827,8 @@ class BaseService(Generic[T]):
 
         Args:
             obj_id (int): 需要更新的数据记录的 ID。
+            plan (str | None): 关联关系加载计划名称，见 LoadPlanManager。
+                调用方需要在返回的对象上替换关联集合时传入。
             **kwargs: 需要更新的字段及对应的值。
 
         Returns:
@@ -681,7 +842,7 @@ class BaseService(Generic[T]):
         try:
             if not self.check_permission(action=OperationType.UPDATE.code):
                 raise PermissionError("无权限修改数据")
-            obj = self.get(obj_id)
+            obj = self.get(obj_id, plan=plan)
             if not obj:
                 raise PermissionError(f"无权限或目标id:{obj_id}不存在")
             if "dept_id" in kwargs:
@@ -801,6 +962,117 @@ class BaseService(Generic[T]):
             )
             raise
 
+    @dash_logger.log_operation(
+        "批量删除数据{obj_ids}",
+        logmodule=dash_logger.logmodule.BASE_SERVICE,
+        operation=dash_logger.operation.DELETE,
+    )
+    def bulk_delete(self, obj_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """
+        批量软删除数据（带权限校验和关联检查）
+
+        与逐条调用 delete 相比，只做一次权限校验、一次数据范围内的查询、
+        每个关联关系一次分组统计，最后以一条 UPDATE ... WHERE id IN 完成软删除。
+        存在关联数据或不在数据范围内的记录跳过，不影响其他记录。
+
+        Args:
+            obj_ids (Iterable[int]): 需要软删除的数据ID集合
+
+        Returns:
+            dict[int, dict]: 每个ID的处理结果，包含以下字段：
+                - status (str): 操作状态，"success" 或 "error"
+                - message (str): 操作结果描述信息
+                - name (str | None): 数据名称，数据不存在时为 None
+
+        Raises:
+            PermissionError: 无权限时抛出
+            SQLAlchemyError: 数据库操作失败时抛出
+        """
+        obj_ids = {int(obj_id) for obj_id in obj_ids}
+        try:
+            # 1. 权限校验
+            if not self.check_permission(action=OperationType.DELETE.code):
+                self.logger.warning(
+                    f"无权限删除数据,当前用户:{self.current_user_id},目标id:{obj_ids},删除数据表:{self.model.__name__}",
+                    logmodule=self.logger.logmodule.BASE_SERVICE,
+                    operation=self.logger.operation.PERMISSION_CHECK,
+                )
+                raise PermissionError("无权限执行删除操作")
+            if not obj_ids:
+                return {}
+
+            # 2. 数据范围内一次查询待删除数据
+            stmt = self._apply_data_scope(
+                self._build_base_query().where(self.model.id.in_(obj_ids))
+            ).with_only_columns(self.model.id, self.model.name)
+            names = dict(self.db.execute(stmt).all())
+
+            # 3. 分组统计关联数据
+            associations = DeleConfigManager.check_associations_bulk(
+                db=self.db, model=self.model, obj_ids=names.keys()
+            )
+
+            results = {}
+            deletable = []
+            for obj_id in obj_ids:
+                if obj_id not in names:
+                    results[obj_id] = {
+                        "status": "error",
+                        "message": "数据不存在或已被删除",
+                        "name": None,
+                    }
+                elif associations[obj_id]["has_relation"]:
+                    results[obj_id] = {
+                        "status": "error",
+                        "message": associations[obj_id]["message"],
+                        "name": names[obj_id],
+                    }
+                else:
+                    deletable.append(obj_id)
+                    results[obj_id] = {
+                        "status": "success",
+                        "message": "删除成功",
+                        "name": names[obj_id],
+                    }
+
+            # 4. 一条语句执行软删除
+            if deletable:
+                self.db.execute(
+                    update(self.model)
+                    .where(self.model.id.in_(deletable))
+                    .values(
+                        del_flag=True,
+                        update_by=self.current_user_id,
+                        update_time=datetime.now(),
+                    )
+                )
+                self._after_bulk_delete(deletable)
+                self.db.commit()
+            return results
+        except PermissionError:
+            raise
+        except SQLAlchemyError as e:
+            self.logger.error(
+                f"当前用户:{self.current_user_id},数据表:{self.model.__name__},目标id:{obj_ids},批量删除数据失败,数据库错误: {str(e)}",
+                logmodule=self.logger.logmodule.BASE_SERVICE,
+                operation=self.logger.operation.DELETE,
+            )
+            raise
+        except Exception as e:
+            self.logger.error(
+                f"当前用户:{self.current_user_id},数据表:{self.model.__name__},目标id:{obj_ids},批量删除操作异常: {str(e)}",
+                logmodule=dash_logger.logmodule.BASE_SERVICE,
+                operation=dash_logger.operation.DELETE,
+            )
+            raise
+
+    def _after_bulk_delete(self, obj_ids: list[int]):
+        """
+        批量软删除后的钩子，在提交前调用
+
+        批量 UPDATE 不会触发 mapper 事件，需要失效缓存的子类重写此方法
+        """
+
     @dash_logger.log_operation(
         "获取下拉列表",
         logmodule=dash_logger.logmodule.BASE_SERVICE,
@@ -854,7 +1126,10 @@ class BaseService(Generic[T]):
         operation=dash_logger.operation.QUERY,
     )
     def get_all(
-        self, page: int | None = None, page_size: int | None = None
+        self,
+        page: int | None = None,
+        page_size: int | None = None,
+        plan: str | None = None,
     ) -> tuple[List[Type[T]] | None, int | None]:
         """
         带分页和数据范围的列表查询
@@ -864,6 +1139,7 @@ class BaseService(Generic[T]):
             current_user_id: 当前用户ID
             page: 页码（从1开始）
             page_size: 每页数量
+            plan: 关联关系加载计划名称，见 LoadPlanManager
 
         返回:
             tuple[结果列表, 总记录数]
@@ -881,19 +1157,19 @@ class BaseService(Generic[T]):
             # 应用数据范围 过滤
             strm = self._apply_data_scope(strm)
 
-            # 总数查询
-            count_query = select(func.count()).select_from(strm.subquery())
+            # 按加载计划加载关联关系
+            paginated_query = strm.options(*LoadPlanManager.get_options(plan))
             # 分页查询
             # 判断是否分页,如果没有就返回所有数据
             if page is not None and page_size is not None:
                 # 分页查询
-                paginated_query = strm.offset((page - 1) * page_size).limit(page_size)
+                paginated_query = paginated_query.offset((page - 1) * page_size).limit(page_size)
                 results = self.db.scalars(paginated_query).unique().all()
-                return list(results), self.db.scalar(count_query)
+                return list(results), self._count(strm)
             else:
-                # 不分页查询
-                results = self.db.scalars(strm).unique().all()
-                return list(results), self.db.scalar(count_query)
+                # 不分页查询，结果条数即总数，无需再统计
+                results = self.db.scalars(paginated_query).unique().all()
+                return list(results), len(results)
         except PermissionError:
             raise
         except SQLAlchemyError as e:
@@ -911,6 +1187,45 @@ class BaseService(Generic[T]):
             )
             raise
 
+    def _count(self, stmt: select) -> int:
+        """
+        统计过滤后查询语句的总数
+
+        按 count_strategy(未设置时使用 BaseConfig.COUNT_STRATEGY) 选择统计方式:
+        exact 精确统计、cached_exact 缓存精确总数、estimated 上限统计，见 CountStrategy
+        """
+        return count_cache.count(
+            self.db, stmt, self.count_strategy or BaseConfig.COUNT_STRATEGY
+        )
+
+    def _build_fields_query(self, **kwargs: Any) -> select:
+        """
+        构建字段条件查询，并应用数据范围过滤
+
+        get_all_by_fields 和 get_page_by_cursor 共用，
+        子类需要追加特殊过滤条件(如按部门筛选角色)时重写此方法。
+
+        参数:
+            **kwargs: 字段条件字典（如name='张三', dept_id=1）
+
+        返回:
+            select: 查询语句
+        """
+        # 构建查询条件 存储
+        conditions = []
+
+        # 动态添加字段条件
+        for field_name, field_value in kwargs.items():
+            con = self._build_field_condition(
+                cls=self.model, field_name=field_name, field_value=field_value
+            )
+            if con is not None:
+                conditions.append(con)
+        # 构建基础查询
+        stmt = self._build_base_query().where(*conditions)
+        # 应用数据范围权限
+        return self._apply_data_scope(stmt)
+
     @dash_logger.log_operation(
         "根据多个字段条件获取所有匹配的数据",
         logmodule=dash_logger.logmodule.BASE_SERVICE,
@@ -920,6 +1235,7 @@ class BaseService(Generic[T]):
         self,
         page: int | None = None,
         page_size: int | None = None,
+        plan: str | None = None,
         **kwargs: Any,
     ) -> tuple[list[dict] | None, int | None]:
         """
@@ -928,6 +1244,7 @@ class BaseService(Generic[T]):
         参数:
             page: 页码
             page_size: 每页数量
+            plan: 关联关系加载计划名称，见 LoadPlanManager
             **fields: 字段条件字典（如name='张三', dept_id=1）
 
         返回:
@@ -942,35 +1259,22 @@ class BaseService(Generic[T]):
                     operation=self.logger.operation.QUERY,
                 )
                 raise PermissionError("无权限查看数据")
-            # 构建查询条件 存储
-            conditions = []
-
-            # 动态添加字段条件
-            for field_name, field_value in kwargs.items():
-                con = self._build_field_condition(
-                    cls=self.model, field_name=field_name, field_value=field_value
-                )
-                if con is not None:
-                    conditions.append(con)
-            # 构建基础查询
-            stmt = self._build_base_query().where(*conditions)
-            # 应用数据范围权限
-            stmt = self._apply_data_scope(stmt)
-            # 总数查询
-            count_query = select(func.count()).select_from(stmt.subquery())
+            # 构建字段条件查询(含数据范围)
+            stmt = self._build_fields_query(**kwargs)
+            # 按加载计划加载关联关系
+            paginated_query = stmt.options(*LoadPlanManager.get_options(plan))
 
             if page is not None and page_size is not None:
                 # 分页查询
-                paginated_query = stmt.offset((page - 1) * page_size).limit(page_size)
+                paginated_query = paginated_query.offset((page - 1) * page_size).limit(page_size)
                 # 执行查询
                 results = self.db.scalars(paginated_query).unique().all()
-                total_count = self.db.scalar(count_query)
+                total_count = self._count(stmt)
                 return results, total_count
             else:
-                # 不分页查询
-                results = self.db.scalars(stmt).unique().all()
-                total_count = self.db.scalar(count_query)
-                return results, total_count
+                # 不分页查询，结果条数即总数，无需再统计
+                results = self.db.scalars(paginated_query).unique().all()
+                return results, len(results)
         except SQLAlchemyError as e:
             self.logger.error(
                 f"当前用户:{self.current_user_id},动态字段查询所有数据失败,查询数据表:{self.model.__name__} ,查询字段:{kwargs},错误信息: {str(e)}",
@@ -988,6 +1292,153 @@ class BaseService(Generic[T]):
             )
             raise
 
+    @staticmethod
+    def encode_cursor(order_by: str, desc: bool, value: Any, obj_id: int) -> str:
+        """
+        生成游标分页的续页令牌
+
+        令牌为 base64 编码的 JSON，包含排序字段、排序方向、最后一行的排序值和ID，
+        前端只需原样回传，不需要解析。
+        """
+        if isinstance(value, datetime):
+            value = {"dt": value.isoformat()}
+        payload = {"o": order_by, "d": desc, "v": value, "id": obj_id}
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, order_by: str, desc: bool) -> tuple[Any, int]:
+        """
+        解析续页令牌
+
+        Returns:
+            tuple[最后一行排序值, 最后一行ID]
+
+        Raises:
+            ValueError: 令牌格式错误，或与当前排序方式不一致
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            value, obj_id = payload["v"], int(payload["id"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"分页游标无效: {e}")
+        if payload.get("o") != order_by or payload.get("d") != desc:
+            raise ValueError("分页游标与当前排序方式不一致")
+        if isinstance(value, dict) and "dt" in value:
+            value = datetime.fromisoformat(value["dt"])
+        return value, obj_id
+
+    @dash_logger.log_operation(
+        "游标分页查询数据",
+        logmodule=dash_logger.logmodule.BASE_SERVICE,
+        operation=dash_logger.operation.QUERY,
+    )
+    def get_page_by_cursor(
+        self,
+        page_size: int,
+        cursor: str | None = None,
+        page: int = 1,
+        plan: str | None = None,
+        order_by: str = "id",
+        desc: bool = False,
+        **kwargs: Any,
+    ) -> tuple[list[T], int | None, str | None]:
+        """
+        游标(keyset)分页查询，按 (排序字段, id) 排序
+
+        传入上一页返回的 cursor 时，以 WHERE (排序字段, id) > (上一页最后一行) 定位，
+        不再使用 OFFSET，翻页耗时与页码深度无关。
+        未传 cursor 时按 page 查询(第1页，或跳页时回退为 OFFSET)，同样返回续页令牌。
+
+        参数:
+            page_size: 每页数量
+            cursor: 上一页返回的续页令牌
+            page: 页码，仅在未传 cursor 时使用
+            plan: 关联关系加载计划名称，见 LoadPlanManager
+            order_by: 排序字段，需为非空字段，默认 id
+            desc: 是否倒序
+            **kwargs: 字段条件字典（如name='张三', dept_id=1）
+
+        返回:
+            tuple[结果列表, 总记录数, 下一页续页令牌(没有下一页时为None)]
+        """
+        try:
+            if not self.check_permission(action=OperationType.QUERY.code):
+                self.logger.warning(
+                    f"当前用户:{self.current_user_id}无权限查看数据表:{self.model.__name__},查询字段:{kwargs}",
+                    logmodule=self.logger.logmodule.BASE_SERVICE,
+                    operation=self.logger.operation.QUERY,
+                )
+                raise PermissionError("无权限查看数据")
+            if not hasattr(self.model, order_by):
+                raise ValueError(f"模型[{self.model.__name__}]无排序字段: {order_by}")
+            sort_column = getattr(self.model, order_by)
+            id_column = self.model.id
+
+            # 构建字段条件查询(含数据范围)
+            stmt = count_stmt = self._build_fields_query(**kwargs)
+
+            if cursor:
+                # 定位到上一页最后一行之后
+                value, last_id = self.decode_cursor(cursor, order_by, desc)
+                if order_by == "id":
+                    stmt = stmt.where(id_column < last_id if desc else id_column > last_id)
+                elif desc:
+                    stmt = stmt.where(
+                        or_(
+                            sort_column < value,
+                            and_(sort_column == value, id_column < last_id),
+                        )
+                    )
+                else:
+                    stmt = stmt.where(
+                        or_(
+                            sort_column > value,
+                            and_(sort_column == value, id_column > last_id),
+                        )
+                    )
+            elif page > 1:
+                # 没有续页令牌(如快速跳页)，回退为 OFFSET
+                stmt = stmt.offset((page - 1) * page_size)
+
+            if order_by == "id":
+                order = (id_column.desc(),) if desc else (id_column,)
+            elif desc:
+                order = (sort_column.desc(), id_column.desc())
+            else:
+                order = (sort_column, id_column)
+            stmt = (
+                stmt.order_by(*order)
+                .limit(page_size)
+                .options(*LoadPlanManager.get_options(plan))
+            )
+
+            results = list(self.db.scalars(stmt).unique().all())
+            next_cursor = None
+            if len(results) == page_size:
+                last = results[-1]
+                next_cursor = self.encode_cursor(
+                    order_by, desc, getattr(last, order_by), last.id
+                )
+            return results, self._count(count_stmt), next_cursor
+        except PermissionError:
+            raise
+        except SQLAlchemyError as e:
+            self.logger.error(
+                f"当前用户:{self.current_user_id},游标分页查询数据失败,查询数据表:{self.model.__name__} ,查询字段:{kwargs},错误信息: {str(e)}",
+                logmodule=self.logger.logmodule.BASE_SERVICE,
+                operation=self.logger.operation.QUERY,
+            )
+            raise
+        except Exception as e:
+            self.logger.error(
+                f"当前用户:{self.current_user_id},游标分页查询数据异常,查询数据表:{self.model.__name__} ,查询字段:{kwargs},错误信息: {str(e)}",
+                logmodule=self.logger.logmodule.BASE_SERVICE,
+                operation=self.logger.operation.QUERY,
+            )
+            raise
+
     @dash_logger.log_operation(
         "根据多个字段条件获取单条匹配的数据",
         logmodule=dash_logger.logmodule.BASE_SERVICE,
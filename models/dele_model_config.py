@@ -1,6 +1,6 @@
-from typing import Type, List, Tuple, Dict, Any
-from sqlalchemy import select, func
-from sqlalchemy.orm import Session
+from typing import Type, List, Tuple, Dict, Any, Iterable
+from sqlalchemy import select, func, exists, or_, literal, union_all
+from sqlalchemy.orm import Session, aliased
 from models.base import Base
 from .system import (
     DeptModel,
@@ -50,7 +50,6 @@ class DeleConfigManager:
                     "remote_id": "role_id",
                 },
             ),
-            (PostModel, "user_id", "用户关联岗位", None),
         ],
         PostModel: [
             (UserModel, "post_id", "岗位关联用户", None),
@@ -110,6 +109,62 @@ class DeleConfigManager:
             if counts.get(f"{rel_model.__name__}.{field}", 0) > 0
         ]
 
+    @classmethod
+    def _relation_columns(cls, config: list) -> List[Tuple[str, Any]]:
+        """
+        将关联配置解析为 (统计键, 引用记录ID的列)
+
+        多对多关系取关联表中的本端ID列，普通外键取关联模型(别名)的外键字段
+        """
+        columns = []
+        for rel_model, field, display_name, assoc_config in config:
+            if assoc_config and "association_table" in assoc_config:
+                column = getattr(
+                    assoc_config["association_table"].c, assoc_config["local_id"]
+                )
+            else:
+                # 使用别名，避免自关联(如部门子部门)在 EXISTS 中与外层表混淆
+                column = getattr(aliased(rel_model), field)
+            columns.append((f"{rel_model.__name__}.{field}", column))
+        return columns
+
+    @classmethod
+    def has_associations(cls, db: Session, model: Type[Base], obj_id: int) -> bool:
+        """
+        判断记录是否存在任意关联数据
+
+        所有关联关系合并为一条 EXISTS 查询，命中第一条关联数据即返回，
+        不统计数量，适用于只需要 是/否 的场景
+        :param db: 数据库会话
+        :param model: 模型类
+        :param obj_id: 记录ID
+        :return: 是否存在关联数据
+        """
+        return bool(cls.filter_associated(db, model, [obj_id]))
+
+    @classmethod
+    def filter_associated(
+        cls, db: Session, model: Type[Base], obj_ids: Iterable[int]
+    ) -> set[int]:
+        """
+        批量筛选存在关联数据的记录ID
+
+        每个关联关系一个 EXISTS 子查询，合并为一条语句
+        :param db: 数据库会话
+        :param model: 模型类
+        :param obj_ids: 记录ID集合
+        :return: 存在关联数据的记录ID集合
+        """
+        obj_ids = set(obj_ids)
+        columns = cls._relation_columns(cls.get_relation_config(model))
+        if not obj_ids or not columns:
+            return set()
+        stmt = select(model.id).where(
+            model.id.in_(obj_ids),
+            or_(*[exists().where(column == model.id) for _, column in columns]),
+        )
+        return set(db.scalars(stmt).all())
+
     @classmethod
     def check_associations(
         cls, db: Session, model: Type[Base], obj_id: int
@@ -121,44 +176,66 @@ class DeleConfigManager:
         :param obj_id: 记录ID
         :return: {has_relation: bool, relations: dict, message: str}
         """
-        # 1. 获取关联配置
-        config = cls.get_relation_config(model)
-        if not config:
-            return {"has_relation": False, "relations": {}, "message": ""}
+        return cls.check_associations_bulk(db, model, [obj_id])[obj_id]
 
-        # 2. 查询关联数据
-        counts = cls._query_associations(db, model, obj_id, config)
+    @classmethod
+    def check_associations_bulk(
+        cls, db: Session, model: Type[Base], obj_ids: Iterable[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        批量检查模型关联数据
 
-        # 3. 格式化结果
-        formatted = cls.format_relation_output(model, counts)
-        has_relation = len(formatted) > 0
+        先用一条 EXISTS 查询筛选出存在关联的记录，只对这些记录统计各关联数量
+        (所有关联关系合并为一条 UNION ALL + GROUP BY 查询)，
+        查询次数与记录数、关联关系数无关
+        :param db: 数据库会话
+        :param model: 模型类
+        :param obj_ids: 记录ID集合
+        :return: {记录ID: {has_relation: bool, relations: dict, message: str}}
+        """
+        obj_ids = set(obj_ids)
+        config = cls.get_relation_config(model)
+        # 1. 筛选存在关联的记录，无关联的记录无需统计
+        associated = cls.filter_associated(db, model, obj_ids) if config else set()
+        # 2. 统计关联数量
+        counts_by_id = cls._query_associations(db, associated, config) if associated else {}
 
-        return {
-            "has_relation": has_relation,
-            "relations": counts,
-            "message": f"存在关联数据，禁止删除: {', '.join(formatted)}"
-            if has_relation
-            else "",
-        }
+        # 3. 格式化结果
+        results = {}
+        for obj_id in obj_ids:
+            counts = counts_by_id.get(obj_id, {})
+            formatted = cls.format_relation_output(model, counts)
+            has_relation = len(formatted) > 0
+            results[obj_id] = {
+                "has_relation": has_relation,
+                "relations": counts,
+                "message": f"存在关联数据，禁止删除: {', '.join(formatted)}"
+                if has_relation
+                else "",
+            }
+        return results
 
     @classmethod
-    def _query_associations(
-        cls, db: Session, model: Type[Base], obj_id: int, config: list
-    ):
-        """内部查询方法（封装SQL逻辑）"""
-        counts = {}
-        for rel_model, field, display_name, assoc_config in config:
-            if assoc_config and "association_table" in assoc_config:
-                # 多对多查询
-                table = assoc_config["association_table"]
-                local_id = assoc_config["local_id"]
-                count = db.scalar(
-                    select(func.count()).where(getattr(table.c, local_id) == obj_id)
-                )
-            else:
-                # 普通外键查询
-                count = db.scalar(
-                    select(func.count()).where(getattr(rel_model, field) == obj_id)
+    def _query_associations(cls, db: Session, obj_ids: set[int], config: list):
+        """
+        内部查询方法（封装SQL逻辑）
+
+        每个关联关系按记录ID分组统计，UNION ALL 合并为一条语句
+        :return: {记录ID: {'模型类名.字段名': 数量}}
+        """
+        counts_by_id = {obj_id: {} for obj_id in obj_ids}
+        stmt = union_all(
+            *[
+                select(
+                    literal(key).label("relation"),
+                    column.label("obj_id"),
+                    func.count().label("total"),
                 )
-            counts[f"{rel_model.__name__}.{field}"] = count
-        return counts
+                .where(column.in_(obj_ids))
+                .group_by(column)
+                for key, column in cls._relation_columns(config)
+            ]
+        )
+        for relation, obj_id, total in db.execute(stmt).all():
+            counts_by_id[obj_id][relation] = total
+        return counts_by_id
@@ -0,0 +1,80 @@
+from typing import Any
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from .system import UserModel, RoleModel, DeptModel, PostModel
+
+
+class LoadPlanManager:
+    """
+    关联关系加载计划配置管理器
+
+    模型关联关系默认 lazy="raise_on_sql"，访问未加载的关联会直接报错，
+    不再隐式级联加载整个组织关系图。
+    查询时通过计划名称指定需要加载的关联和字段，按页面实际渲染内容加载。
+
+    配置说明：
+    - key为计划名称
+    - value为 SQLAlchemy 加载选项元组
+
+    用法:
+        service.get(user_id, plan="user_edit_modal")
+        service.get_all_by_fields(page, page_size, plan="user_table_row", **fields)
+    """
+
+    _plans: dict[str, tuple[Any, ...]] = {
+        # 登录用户主体: 有效角色及角色部门(数据范围)、用户部门、岗位
+        "login_principal": (
+            selectinload(
+                UserModel.roles.and_(RoleModel.status == 1, RoleModel.del_flag == 0)
+            ).selectinload(RoleModel.depts),
+            joinedload(UserModel.dept),
+            joinedload(UserModel.post),
+        ),
+        # 用户列表行: 部门名称、岗位名称、角色名称
+        "user_table_row": (
+            joinedload(UserModel.dept).load_only(DeptModel.id, DeptModel.name),
+            joinedload(UserModel.post).load_only(PostModel.id, PostModel.name),
+            selectinload(UserModel.roles).load_only(RoleModel.id, RoleModel.name),
+        ),
+        # 用户编辑弹窗: 已分配角色
+        "user_edit_modal": (
+            selectinload(UserModel.roles).load_only(RoleModel.id),
+        ),
+        # 角色编辑弹窗: 关联部门
+        "role_edit_modal": (
+            selectinload(RoleModel.depts),
+        ),
+        # 角色权限弹窗: 操作权限、页面权限、数据范围部门
+        "role_permission_modal": (
+            selectinload(RoleModel.permissions),
+            selectinload(RoleModel.pages),
+            selectinload(RoleModel.depts),
+        ),
+        # 岗位列表行: 部门名称
+        "post_table_row": (
+            joinedload(PostModel.dept).load_only(DeptModel.id, DeptModel.name),
+        ),
+    }
+
+    @classmethod
+    def register(cls, name: str, *options: Any):
+        """注册或覆盖加载计划"""
+        cls._plans[name] = tuple(options)
+
+    @classmethod
+    def get_options(cls, name: str | None) -> tuple[Any, ...]:
+        """
+        获取加载计划对应的加载选项
+
+        Args:
+            name: 计划名称，None 表示不加载任何关联
+
+        Raises:
+            ValueError: 计划名称不存在
+        """
+        if name is None:
+            return ()
+        if name not in cls._plans:
+            raise ValueError(f"加载计划不存在: {name}")
+        return cls._plans[name]
@@ -1,19 +1,23 @@
-from .syslog import LogModel
+from .syslog import LogModel, LogMetricMinuteModel
 from .user import UserModel
 from .dept import DeptModel
 from .post import PostModel
 from .role import RoleModel,role_to_dept,role_to_permission,role_to_user,role_to_page
 from .page import PageModel
 from .permissions import PermissionsModel
+from .cache import CacheVersionModel, CacheChangeModel
 
 __all__ = [
     'LogModel',
+    'LogMetricMinuteModel',
     'UserModel',
     'DeptModel',
     'PageModel',
     'PostModel',
     'RoleModel',
     'PermissionsModel',
+    'CacheVersionModel',
+    'CacheChangeModel',
     'role_to_dept',
     'role_to_permission',
     'role_to_user',
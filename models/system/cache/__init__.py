@@ -0,0 +1,7 @@
+from .cache_version_model import CacheVersionModel
+from .cache_change_model import CacheChangeModel
+
+__all__ = [
+    'CacheVersionModel',
+    'CacheChangeModel'
+]
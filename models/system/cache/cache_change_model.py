@@ -0,0 +1,38 @@
+# 第三方包
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+# 自定义包
+from models.base import Base
+
+
+class CacheChangeModel(Base):
+    """
+    缓存变更日志表
+
+    只影响少数条目的变更(如某个用户登出、修改资料)记录为一行，
+    其他 worker 轮询新增行后只失效对应条目，不清空整个命名空间。
+
+    属性:
+        id: 自增主键，轮询按主键递增读取
+        namespace: 缓存命名空间，如 principal
+        item_key: 条目键，如用户ID
+        create_time: 记录时间，用于过期清理
+    """
+
+    __tablename__ = "sys_cache_change"
+    __table_args__ = {"comment": "缓存变更日志表"}
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, comment="主键"
+    )
+    namespace: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="缓存命名空间"
+    )
+    item_key: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="条目键"
+    )
+    create_time: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False, index=True, comment="记录时间"
+    )
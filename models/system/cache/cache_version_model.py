@@ -0,0 +1,34 @@
+# 第三方包
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+# 自定义包
+from models.base import Base
+
+
+class CacheVersionModel(Base):
+    """
+    缓存版本表
+
+    多个 worker 进程通过轮询本表的版本号感知其他进程的数据变更，
+    版本号变化时丢弃对应命名空间下的进程内缓存。
+
+    属性:
+        namespace: 缓存命名空间，如 principal / permission / data_scope
+        version: 版本号，每次变更 +1
+        update_time: 最后一次变更时间
+    """
+
+    __tablename__ = "sys_cache_version"
+    __table_args__ = {"comment": "缓存版本表"}
+
+    namespace: Mapped[str] = mapped_column(
+        String(50), primary_key=True, comment="缓存命名空间"
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False, comment="版本号"
+    )
+    update_time: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False, comment="最后变更时间"
+    )
@@ -69,7 +69,7 @@ class DeptModel(Base, BaseMixin):
     # 父部门对象
     parent: Mapped["DeptModel"] = relationship(
         remote_side=[id],
-        lazy="selectin",
+        lazy="raise_on_sql",
         back_populates="children",
         foreign_keys="DeptModel.parent_id",
     )
@@ -77,7 +77,7 @@ class DeptModel(Base, BaseMixin):
     # 子部门列表
     children: Mapped[list["DeptModel"]] = relationship(
         back_populates="parent",
-        lazy="selectin",  # 添加明确的加载策略
+        lazy="raise_on_sql",  # 添加明确的加载策略
         cascade="all, delete-orphan",  # 添加级联删除
         foreign_keys="DeptModel.parent_id",
     )
@@ -86,24 +86,24 @@ class DeptModel(Base, BaseMixin):
     leader: Mapped["UserModel"] = relationship(
         back_populates="led_depts",
         foreign_keys="DeptModel.leader_user_id",
-        lazy="selectin",  # 添加明确的加载策略
+        lazy="raise_on_sql",  # 添加明确的加载策略
     )
     # 部门 成员列表
     users: Mapped[list["UserModel"]] = relationship(
         back_populates="dept",
-        lazy="selectin",
+        lazy="raise_on_sql",
         foreign_keys="UserModel.dept_id",
         cascade="all, delete-orphan",
     )
     # 部门下的岗位列表
     posts: Mapped[list["PostModel"]] = relationship(
-        foreign_keys="PostModel.dept_id", back_populates="dept", lazy="selectin"
+        foreign_keys="PostModel.dept_id", back_populates="dept", lazy="raise_on_sql"
     )
     # 部门下的角色列表
     roles: Mapped[list["RoleModel"]] = relationship(
         secondary="sys_role_to_sys_dept",
         back_populates="depts",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
 
@@ -1,11 +1,16 @@
 from models.base_service import BaseService, DeptModel, OperationType
 from sqlalchemy.orm import Session
+from tools.cache import invalidation_bus, CacheNamespace
 
 
 class DeptService(BaseService[DeptModel]):
     def __init__(self, db: Session, current_user_id: int):
         super().__init__(db=db, model=DeptModel, current_user_id=current_user_id)
 
+    def _after_bulk_delete(self, obj_ids: list[int]):
+        """批量删除部门不会触发 mapper 事件，手动失效数据范围缓存"""
+        invalidation_bus.bump(self.db, CacheNamespace.DATA_SCOPE)
+
     def get_dept_tree(self) -> list[dict] | None:
         """
         获取当前用户权限范围内的部门树结构
@@ -61,11 +61,11 @@ class PageModel(Base, BaseCrud):
     # 审计字段--继承
 
     # 父菜单
-    parent: Mapped["PageModel"] = relationship(remote_side=[id], lazy="selectin")
+    parent: Mapped["PageModel"] = relationship(remote_side=[id], lazy="raise_on_sql")
     # 子菜单列表
     children: Mapped[list["PageModel"]] = relationship(
         back_populates="parent",
-        lazy="selectin",
+        lazy="raise_on_sql",
         order_by="PageModel.sort",
         cascade="all, delete-orphan",
     )
@@ -74,5 +74,5 @@ class PageModel(Base, BaseCrud):
         "RoleModel",
         secondary="sys_role_to_sys_page",
         back_populates="pages",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
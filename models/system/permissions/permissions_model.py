@@ -44,5 +44,5 @@ class PermissionsModel(Base, BaseCrud):
     roles: Mapped[list["RoleModel"]] = relationship(
         secondary="sys_role_to_permission",
         back_populates="permissions",
-        lazy="selectin",  # 添加明确的加载策略
+        lazy="raise_on_sql",  # 添加明确的加载策略
     )
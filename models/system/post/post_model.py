@@ -32,11 +32,11 @@ class PostModel(Base, BaseCrud):
         'UserModel',
         back_populates='post',
         foreign_keys='[UserModel.post_id]',  # 明确指定外键字段
-        lazy='selectin'
+        lazy="raise_on_sql"
     )
     # 岗位与部门的关联关系
     dept: Mapped['DeptModel'] = relationship(
         'DeptModel',
         back_populates='posts',
-        lazy='selectin'
+        lazy="raise_on_sql"
     )
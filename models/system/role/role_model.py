@@ -131,28 +131,28 @@ class RoleModel(Base, BaseMixin):
 
     # 当前角色关联的权限
     permissions: Mapped[list["PermissionsModel"]] = relationship(
-        secondary=role_to_permission, back_populates="roles", lazy="selectin"
+        secondary=role_to_permission, back_populates="roles", lazy="raise_on_sql"
     )
 
     # 当前角色关联的用户
     users: Mapped[list["UserModel"]] = relationship(
-        secondary=role_to_user, back_populates="roles", lazy="selectin"
+        secondary=role_to_user, back_populates="roles", lazy="raise_on_sql"
     )
     # 角色继承关系（自引用）
     parent: Mapped["RoleModel"] = relationship(
         remote_side=[id],
-        backref=backref("children", lazy="selectin"),
-        lazy="joined",
+        backref=backref("children", lazy="raise_on_sql"),
+        lazy="raise_on_sql",
     )
     # 当前角色关联部门
     depts: Mapped[list["DeptModel"]] = relationship(
         secondary=role_to_dept,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     # 当前角色关联的页面
     pages: Mapped[list["PageModel"]] = relationship(
         secondary=role_to_page,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
\ No newline at end of file
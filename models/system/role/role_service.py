@@ -4,9 +4,7 @@ from models.base_service import (
     BaseService,
     exists,
     select,
-    SQLAlchemyError,
     OperationType,
-    func,
 )
 from models.system.dept.dept_model import DeptModel
 from models.system.dept.dept_service import DeptService
@@ -15,87 +13,28 @@ from models.system.page.page_service import PageService
 
 from . import RoleModel
 from tools.public.enum import DataScopeType
+from tools.cache import invalidation_bus, CacheNamespace
 
 class RoleService(BaseService[RoleModel]):
     def __init__(self, db: Session, current_user_id: int):
         super().__init__(model=RoleModel, db=db, current_user_id=current_user_id)
 
-    def get_all_by_fields(
-        self, page: int | None = None, page_size: int | None = None, **kwargs: Any
-    ) -> tuple[list[dict] | None, int | None]:
+    def _build_fields_query(self, **kwargs: Any) -> select:
         """
-        根据多个字段条件获取所有匹配的数据（带权限校验）
+        构建字段条件查询，并应用数据范围过滤
 
-        参数:
-            page: 页码
-            page_size: 每页数量
-            **fields: 字段条件字典（如name='张三', dept_id=1）
-
-        返回:
-            数据对象列表 或 空列表（无权限或无匹配时）,
-            总记录数
+        在基类基础上支持按部门筛选角色: dept_id 为列表时，
+        筛选关联了这些部门的角色
         """
-
-        try:
-            if not self.check_permission(action=OperationType.QUERY.code):
-                self.logger.warning(
-                    f"当前用户:{self.current_user_id}无权限查看数据表:{self.model.__name__},查询字段:{kwargs}",
-                    logmodule=self.logger.logmodule.BASE_SERVICE,
-                    operation=self.logger.operation.QUERY,
-                )
-                raise PermissionError("无权限查看数据")
-            # 构建查询条件 存储
-            conditions = []
-
-            # 动态添加字段条件
-            for field_name, field_value in kwargs.items():
-                con = self._build_field_condition(
-                    cls=self.model, field_name=field_name, field_value=field_value
-                )
-                if con is not None:
-                    conditions.append(con)
-            # 构建基础查询
-            stmt = self._build_base_query().where(*conditions)
-            # 过滤部门查询
-            if "dept_id" in kwargs and isinstance(kwargs["dept_id"], list):
-                dept_id = set(kwargs.get("dept_id", []))
-                role_ids_subquery = self._get_roles_by_depts(dept_id)
-                stmt = stmt.where(
-                    exists().where(self.model.id == role_ids_subquery.c.role_id)
-                )
-            # 应用数据范围权限
-            stmt = self._apply_data_scope(stmt)
-            # 总数查询
-            count_query = select(func.count()).select_from(stmt.subquery())
-
-            if page is not None and page_size is not None:
-                # 分页查询
-                paginated_query = stmt.offset((page - 1) * page_size).limit(page_size)
-                # 执行查询
-                results = self.db.scalars(paginated_query).unique().all()
-                total_count = self.db.scalar(count_query)
-                return results, total_count
-            else:
-                # 不分页查询
-                results = self.db.scalars(stmt).unique().all()
-                total_count = self.db.scalar(count_query)
-                return results, total_count
-        except SQLAlchemyError as e:
-            self.logger.error(
-                f"当前用户:{self.current_user_id},动态字段查询所有数据失败,查询数据表:{self.model.__name__} ,查询字段:{kwargs},错误信息: {str(e)}",
-                logmodule=self.logger.logmodule.BASE_SERVICE,
-                operation=self.logger.operation.QUERY,
-            )
-            raise
-        except PermissionError:
-            raise
-        except Exception as e:
-            self.logger.error(
-                f"当前用户:{self.current_user_id},动态字段查询所有数据异常,查询数据表:{self.model.__name__} ,查询字段:{kwargs},,错误信息: {str(e)}",
-                logmodule=self.logger.logmodule.BASE_SERVICE,
-                operation=self.logger.operation.QUERY,
+        stmt = super()._build_fields_query(**kwargs)
+        # 过滤部门查询
+        if "dept_id" in kwargs and isinstance(kwargs["dept_id"], list):
+            dept_id = set(kwargs.get("dept_id", []))
+            role_ids_subquery = self._get_roles_by_depts(dept_id)
+            stmt = stmt.where(
+                exists().where(self.model.id == role_ids_subquery.c.role_id)
             )
-            raise
+        return stmt
 
     def get_role_dept_tree(self, role_id: int) -> list[dict] | None:
         """
@@ -122,7 +61,7 @@ class RoleService(BaseService[RoleModel]):
             角色部门ID列表:list[int]
 
         """
-        role = self.get(role_id)
+        role = self.get(role_id, plan="role_edit_modal")
         if not role:
             return []
         role_dept_ids = self._build_data_scope_condition([role])
@@ -209,8 +148,13 @@ class RoleService(BaseService[RoleModel]):
             raise ValueError("部门不存在")
 
         kwargs.pop("dept_id")
-        role = super().update(obj_id=obj_id, **kwargs)
+        # 同时加载角色关联部门，随后直接替换
+        role = super().update(obj_id=obj_id, plan="role_edit_modal", **kwargs)
         role.depts = depts
+        # 角色状态、部门变更会影响关联用户的页面权限和数据范围
+        invalidation_bus.bump(
+            self.db, CacheNamespace.PERMISSION, CacheNamespace.DATA_SCOPE
+        )
         return role
 
     def configure_permissions(
@@ -239,8 +183,8 @@ class RoleService(BaseService[RoleModel]):
             raise PermissionError("无权限配置角色权限")
         if not data_scope_type or not role_id or not permission_keys or not dept_ids:
             raise ValueError("数据范围类型、角色ID、权限标识列表、部门ID列表不能为空")
-        # 获取角色
-        role = self.get(role_id)
+        # 获取角色(加载待替换的权限、部门、页面关联)
+        role = self.get(role_id, plan="role_permission_modal")
         if not role:
             raise ValueError(f"角色ID不存在: {role_id}")
 
@@ -268,5 +212,9 @@ class RoleService(BaseService[RoleModel]):
         role.permissions = per_objs
         role.depts = dept_objs
         role.pages = page_objs
+        # 角色权限变更影响所有关联用户的 role_urls / data_scope_type，通知所有进程失效缓存(含登录主体)
+        invalidation_bus.bump(
+            self.db, CacheNamespace.PERMISSION, CacheNamespace.DATA_SCOPE
+        )
 
         return per_total, dept_total,page_total
@@ -5,6 +5,7 @@ from .post.post_service import PostService
 from .page.page_service import PageService
 from .permissions.permissons_service import PermissionsService
 from .syslog.logs_server import LogService
+from .syslog.metrics_server import LogMetricsService
 
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
     'PostService',
     'PageService',
     'PermissionsService',
-    'LogService'
+    'LogService',
+    'LogMetricsService',
 ]
@@ -1 +1,2 @@
-from .logs_model import LogModel
\ No newline at end of file
+from .logs_model import LogModel
+from .metrics_model import LogMetricMinuteModel
\ No newline at end of file
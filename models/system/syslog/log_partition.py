@@ -0,0 +1,289 @@
+# models/system/syslog/log_partition.py
+import re
+import gzip
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from sqlalchemy import Index, MetaData, Table, delete, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from config.base_config import BaseConfig
+from .logs_model import LogModel
+from .metrics_model import LogMetricMinuteModel
+
+if TYPE_CHECKING:
+    from .log_search import LogSearchBackend
+
+log = logging.getLogger(__name__)
+
+# 分区表不注册到 Base.metadata，alembic 自动迁移和 create_all 不会处理分区表
+partition_metadata = MetaData()
+
+
+class PartitionUnit:
+    """日志分区粒度"""
+
+    NONE = "none"  # 不分区，全部写入 sys_logs
+    DAY = "day"  # 按天分区: sys_logs_YYYYMMDD
+    MONTH = "month"  # 按月分区: sys_logs_YYYYMM
+
+    ALL = (NONE, DAY, MONTH)
+
+
+class LogPartitionRouter:
+    """
+    日志分区路由
+
+    分区表与 sys_logs 结构相同，表名为 sys_logs_YYYYMM(按月) 或 sys_logs_YYYYMMDD(按天)，
+    写入时按日志时间路由到对应分区，分区表不存在时自动创建；
+    查询时只访问与时间范围有交集的分区。
+    sys_logs 作为历史表继续参与查询，由保留策略逐步清理。
+    """
+
+    TABLE_PREFIX = LogModel.__tablename__
+    # 已存在分区列表的缓存时间(秒)，其他进程新建的分区最多延迟该时间后可查询
+    EXISTING_CACHE_TTL = 60.0
+
+    _PATTERN = re.compile(rf"^{TABLE_PREFIX}_(\d{{8}}|\d{{6}})$")
+
+    def __init__(self, unit: str = PartitionUnit.MONTH):
+        if unit not in PartitionUnit.ALL:
+            raise ValueError(f"未知的日志分区粒度: {unit}")
+        self.unit = unit
+        self._created: set[str] = set()
+        self._existing: tuple[float, list[str]] | None = None
+        self._create_hooks: list[Callable[[Engine, Table], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.unit != PartitionUnit.NONE
+
+    def partition_name(self, timestamp: datetime) -> str:
+        """日志时间对应的分区表名"""
+        if self.unit == PartitionUnit.DAY:
+            return f"{self.TABLE_PREFIX}_{timestamp:%Y%m%d}"
+        if self.unit == PartitionUnit.MONTH:
+            return f"{self.TABLE_PREFIX}_{timestamp:%Y%m}"
+        return self.TABLE_PREFIX
+
+    @classmethod
+    def partition_range(cls, name: str) -> tuple[datetime, datetime] | None:
+        """分区表覆盖的时间范围 [开始, 结束)，不是分区表时返回 None"""
+        match = cls._PATTERN.match(name)
+        if match is None:
+            return None
+        suffix = match.group(1)
+        if len(suffix) == 8:
+            start = datetime.strptime(suffix, "%Y%m%d")
+            return start, start + timedelta(days=1)
+        start = datetime.strptime(suffix, "%Y%m")
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        return start, end
+
+    @staticmethod
+    def table(name: str) -> Table:
+        """获取分区表对象，结构复制自 sys_logs，索引名按表名生成"""
+        if name == LogModel.__tablename__:
+            return LogModel.__table__
+        if name in partition_metadata.tables:
+            return partition_metadata.tables[name]
+        source = LogModel.__table__
+        return Table(
+            name,
+            partition_metadata,
+            *(column._copy() for column in source.columns),
+            # 单列索引随字段复制自动按表名命名，组合索引按分区表名重命名
+            *(
+                Index(
+                    index.name.replace(source.name, name, 1),
+                    *(column.name for column in index.columns),
+                )
+                for index in source.indexes
+                if index.name.startswith(f"idx_{source.name}_")
+            ),
+        )
+
+    def on_create(self, hook: Callable[[Engine, Table], None]):
+        """注册分区表创建后的回调(如建立全文索引)"""
+        self._create_hooks.append(hook)
+
+    def ensure_partition(self, bind: Engine, name: str) -> Table:
+        """确保分区表已创建"""
+        table = self.table(name)
+        if name not in self._created:
+            with self._lock:
+                if name not in self._created:
+                    table.create(bind, checkfirst=True)
+                    for hook in self._create_hooks:
+                        hook(bind, table)
+                    self._created.add(name)
+                    self._existing = None
+        return table
+
+    def route(self, logs: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """按日志时间把日志分组到分区表名，缺少时间的日志按当前时间路由"""
+        groups: dict[str, list[dict[str, Any]]] = {}
+        now = datetime.now()
+        for entry in logs:
+            name = self.partition_name(entry.get("timestamp") or now)
+            groups.setdefault(name, []).append(entry)
+        return groups
+
+    def existing_partitions(self, bind: Engine | Connection) -> list[str]:
+        """数据库中已存在的分区表名(按时间升序)"""
+        cached = self._existing
+        if cached is not None and cached[0] >= time.monotonic():
+            return cached[1]
+        names = sorted(
+            name for name in inspect(bind).get_table_names() if self._PATTERN.match(name)
+        )
+        self._existing = (time.monotonic() + self.EXISTING_CACHE_TTL, names)
+        return names
+
+    def partitions_for_range(
+        self,
+        bind: Engine | Connection,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[str]:
+        """与时间范围 [start, end] 有交集的分区表名，未指定的一端不限制"""
+        names = []
+        for name in self.existing_partitions(bind):
+            part_start, part_end = self.partition_range(name)
+            if start is not None and part_end <= start:
+                continue
+            if end is not None and part_start > end:
+                continue
+            names.append(name)
+        return names
+
+    def forget(self, name: str):
+        """分区表被删除后清理本地缓存"""
+        with self._lock:
+            self._created.discard(name)
+            self._existing = None
+            table = partition_metadata.tables.get(name)
+            if table is not None:
+                partition_metadata.remove(table)
+
+
+# 创建全局日志分区路由实例
+log_partition_router = LogPartitionRouter(BaseConfig.LOG_PARTITION_UNIT)
+
+
+class LogRetention:
+    """
+    日志保留策略
+
+    - 分区表: 整个分区早于保留期限时，归档(可选)后直接删除整张表
+    - sys_logs 历史表: 早于保留期限的行归档(可选)后按时间删除
+    - 日志指标分钟汇总表: 按 LOG_METRICS_RETENTION_DAYS 删除
+
+    归档文件为 gzip 压缩的 JSON Lines，每个分区一个文件。
+    没有内置定时任务，可通过 cron 等定时执行:
+        python -m tools.sys_log.log_retention
+    """
+
+    MODES = ("archive", "drop")
+    # 归档时每次读取的行数
+    CHUNK_SIZE = 5000
+
+    def __init__(
+        self,
+        bind: Engine,
+        router: LogPartitionRouter = log_partition_router,
+        retention_days: int = BaseConfig.LOG_RETENTION_DAYS,
+        mode: str = BaseConfig.LOG_RETENTION_MODE,
+        archive_path: str = BaseConfig.LOG_ARCHIVE_PATH,
+        search_backend: "LogSearchBackend | None" = None,
+        metrics_retention_days: int = BaseConfig.LOG_METRICS_RETENTION_DAYS,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"未知的日志保留方式: {mode}")
+        self.bind = bind
+        self.router = router
+        self.retention_days = retention_days
+        self.mode = mode
+        self.archive_dir = Path(archive_path)
+        # 日志全文搜索后端，清理日志时同步清理索引
+        self.search_backend = search_backend
+        self.metrics_retention_days = metrics_retention_days
+
+    def cutoff(self, now: datetime | None = None) -> datetime:
+        """保留期限，早于该时间的日志会被清理"""
+        return (now or datetime.now()) - timedelta(days=self.retention_days)
+
+    def expired_partitions(self, now: datetime | None = None) -> list[str]:
+        """整个分区早于保留期限的分区表名"""
+        cutoff = self.cutoff(now)
+        self.router._existing = None
+        return [
+            name
+            for name in self.router.existing_partitions(self.bind)
+            if self.router.partition_range(name)[1] <= cutoff
+        ]
+
+    def _archive(self, conn: Connection, stmt, file_name: str) -> int:
+        """把查询结果写入压缩归档文件，返回行数"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{file_name}.jsonl.gz"
+        # 已存在同名归档时追加，gzip 支持多段拼接
+        count = 0
+        result = conn.execution_options(yield_per=self.CHUNK_SIZE).execute(stmt)
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            for row in result.mappings():
+                f.write(json.dumps(dict(row), ensure_ascii=False, default=str) + "\n")
+                count += 1
+        return count
+
+    def run(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        执行保留策略
+
+        Returns:
+            dict[str, int]: 表名 -> 清理的行数
+        """
+        cutoff = self.cutoff(now)
+        report: dict[str, int] = {}
+        for name in self.expired_partitions(now):
+            table = self.router.table(name)
+            with self.bind.begin() as conn:
+                if self.mode == "archive":
+                    report[name] = self._archive(conn, select(table), name)
+                else:
+                    report[name] = conn.scalar(select(func.count()).select_from(table))
+                table.drop(conn, checkfirst=True)
+                if self.search_backend is not None:
+                    self.search_backend.purge(conn, name)
+            self.router.forget(name)
+            log.info("日志分区 %s 已%s", name, "归档并删除" if self.mode == "archive" else "删除")
+
+        legacy = LogModel.__table__
+        with self.bind.begin() as conn:
+            if inspect(conn).has_table(legacy.name):
+                expired = legacy.c.timestamp < cutoff
+                if self.mode == "archive":
+                    self._archive(
+                        conn,
+                        select(legacy).where(expired).order_by(legacy.c.id),
+                        f"{legacy.name}_before_{cutoff:%Y%m%d}",
+                    )
+                report[legacy.name] = conn.execute(delete(legacy).where(expired)).rowcount
+                if self.search_backend is not None:
+                    self.search_backend.purge(conn, legacy.name, before=cutoff)
+
+        # 指标汇总行数据量小，单独按 LOG_METRICS_RETENTION_DAYS 保留
+        metrics = LogMetricMinuteModel.__table__
+        metrics_cutoff = (now or datetime.now()) - timedelta(days=self.metrics_retention_days)
+        with self.bind.begin() as conn:
+            if inspect(conn).has_table(metrics.name):
+                report[metrics.name] = conn.execute(
+                    delete(metrics).where(metrics.c.bucket < metrics_cutoff)
+                ).rowcount
+        return report
@@ -0,0 +1,375 @@
+# models/system/syslog/log_search.py
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    and_,
+    delete,
+    func,
+    inspect,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.orm import Session
+
+from config.base_config import BaseConfig, DB_Config
+from .logs_model import LogModel
+from .log_partition import log_partition_router
+
+log = logging.getLogger(__name__)
+
+# 单个日志表的过滤条件构造函数: 表 -> 条件列表
+ConditionBuilder = Callable[[Table], list]
+# 搜索结果: [(所在表名, 日志ID)], 总数
+SearchResult = tuple[list[tuple[str, int]], int]
+
+
+def split_terms(keyword: str) -> list[str]:
+    """按空白拆分搜索关键字，多个关键字之间为 且 的关系"""
+    return [term for term in keyword.split() if term]
+
+
+class LogSearchBackend(ABC):
+    """
+    日志全文搜索后端接口
+
+    - index: 数据库日志写入器写入日志后，在同一事务中同步索引(需要日志ID)
+    - search: 按关键字搜索，返回按相关度排序的 (表名, 日志ID)
+    - purge: 保留任务清理日志后同步清理索引
+    """
+
+    name = ""
+    # 是否需要写入器在写入日志后调用 index 同步索引
+    indexes_rows = False
+
+    def setup(self, bind: Engine):
+        """初始化后端(建索引表、补建索引等)，默认无操作"""
+
+    def setup_table(self, bind: Engine, table: Table):
+        """新建日志分区表后调用，默认无操作"""
+
+    def index(self, db: Session, table_name: str, rows: Iterable[tuple[int, dict[str, Any]]]):
+        """同步索引新写入的日志，rows 为 (日志ID, 日志字典)"""
+
+    def purge(self, conn: Connection, table_name: str, before: datetime | None = None):
+        """清理日志表的索引，before 为 None 时清理整张表"""
+
+    @abstractmethod
+    def search(
+        self,
+        db: Session,
+        keyword: str,
+        tables: list[Table],
+        conditions: ConditionBuilder,
+        limit: int,
+        offset: int,
+        count_cap: int,
+    ) -> SearchResult:
+        """
+        按关键字搜索日志
+
+        Args:
+            db: 数据库会话
+            keyword: 搜索关键字，空白分隔多个关键字
+            tables: 与时间范围有交集的日志表
+            conditions: 单个日志表的时间范围和字段过滤条件
+            limit: 返回数量
+            offset: 跳过数量
+            count_cap: 总数统计上限
+        """
+
+
+class LikeSearchBackend(LogSearchBackend):
+    """
+    通用后端: message LIKE '%关键字%'，逐表扫描，按时间倒序
+
+    不需要额外索引，适用于没有全文索引能力的数据库，数据量大时较慢
+    """
+
+    name = "like"
+
+    def search(self, db, keyword, tables, conditions, limit, offset, count_cap):
+        selects = []
+        for table in tables:
+            where = conditions(table) + [
+                table.c.message.contains(term, autoescape=True) for term in split_terms(keyword)
+            ]
+            selects.append(
+                select(
+                    literal(table.name).label("log_table"),
+                    table.c.id,
+                    table.c.timestamp,
+                ).where(*where)
+            )
+        matched = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+        total = db.scalar(select(func.count()).select_from(select(matched).limit(count_cap).subquery()))
+        rows = db.execute(
+            select(matched.c.log_table, matched.c.id)
+            .order_by(matched.c.timestamp.desc(), matched.c.id.desc())
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        return [tuple(row) for row in rows], total
+
+
+class MySQLFulltextBackend(LogSearchBackend):
+    """
+    MySQL 后端: 每个日志表的 message 字段建立 FULLTEXT(ngram 分词)索引，
+    按 MATCH ... AGAINST 布尔模式的相关度排序
+
+    - 每个关键字作为必须包含的短语(+"关键字")，多个关键字之间为 且 的关系，
+      与其他后端一致
+    - 短于 ngram 分词长度的关键字无法命中全文索引，改用 LIKE 过滤
+    - description 为 JSON 字段，MySQL 不支持建立全文索引，只搜索 message
+    """
+
+    name = "mysql_fulltext"
+    # ngram 分词长度(MySQL ngram_token_size 默认值)
+    NGRAM_TOKEN_SIZE = 2
+
+    def __init__(self):
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def index_name(table_name: str) -> str:
+        return f"ft_{table_name}_message"
+
+    def setup(self, bind):
+        # 写入和搜索路径每次都会调用，只在进程内首次调用时检查已有表，
+        # 之后新建的分区表由 setup_table 建立索引
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            for name in [LogModel.__tablename__] + log_partition_router.existing_partitions(bind):
+                self.setup_table(bind, log_partition_router.table(name))
+            self._ready = True
+
+    def setup_table(self, bind, table):
+        index_name = self.index_name(table.name)
+        if index_name in {index["name"] for index in inspect(bind).get_indexes(table.name)}:
+            return
+        with bind.begin() as conn:
+            conn.execute(
+                text(f"ALTER TABLE {table.name} ADD FULLTEXT INDEX {index_name} (message) WITH PARSER ngram")
+            )
+
+    @classmethod
+    def boolean_query(cls, terms: list[str]) -> str:
+        """将关键字组装为布尔模式查询，每个关键字为必须包含的短语"""
+        # 布尔模式的短语内不支持转义双引号，直接去掉
+        return " ".join(f'+"{term}"' for term in terms)
+
+    def search(self, db, keyword, tables, conditions, limit, offset, count_cap):
+        from sqlalchemy.dialects.mysql import match
+
+        terms = [term.replace('"', "") for term in split_terms(keyword)]
+        terms = [term for term in terms if term]
+        indexed = [term for term in terms if len(term) >= self.NGRAM_TOKEN_SIZE]
+        short = [term for term in terms if len(term) < self.NGRAM_TOKEN_SIZE]
+        selects = []
+        for table in tables:
+            where = conditions(table) + [
+                table.c.message.contains(term, autoescape=True) for term in short
+            ]
+            if indexed:
+                score = match(
+                    table.c.message, against=self.boolean_query(indexed)
+                ).in_boolean_mode()
+                where.append(score > 0)
+            else:
+                score = literal(0)
+            selects.append(
+                select(
+                    literal(table.name).label("log_table"),
+                    table.c.id,
+                    table.c.timestamp,
+                    score.label("score"),
+                ).where(*where)
+            )
+        matched = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+        total = db.scalar(select(func.count()).select_from(select(matched).limit(count_cap).subquery()))
+        rows = db.execute(
+            select(matched.c.log_table, matched.c.id)
+            .order_by(matched.c.score.desc(), matched.c.timestamp.desc())
+            .offset(offset)
+            .limit(limit)
+        ).all()
+        return [tuple(row) for row in rows], total
+
+
+class SQLiteFTS5Backend(LogSearchBackend):
+    """
+    SQLite 后端: FTS5 虚拟表 sys_logs_fts(trigram 分词，支持中文子串)
+
+    - 索引 message 和 description(JSON 文本)，过滤字段作为 UNINDEXED 列一并保存，
+      搜索时不需要回表过滤
+    - 数据库日志写入器写入日志后在同一事务中写入索引
+    - 首次创建索引表时为已有日志补建索引
+    - 关键字均不少于 3 个字符时使用 MATCH 并按 bm25 相关度排序；
+      存在更短的关键字时 trigram 无法命中，回退为扫描索引表并按时间倒序
+    """
+
+    name = "fts5"
+    indexes_rows = True
+    # 补建索引时每次读取的行数
+    CHUNK_SIZE = 5000
+    # 过滤字段，与日志表同名
+    FILTER_COLUMNS = ("log_level", "logmodule", "operation", "user_id", "ip", "status")
+
+    def __init__(self):
+        self.table = Table(
+            f"{LogModel.__tablename__}_fts",
+            MetaData(),
+            Column("rowid", Integer, primary_key=True),
+            Column("message", Text),
+            Column("description", Text),
+            Column("log_table", String(50)),
+            Column("log_id", Integer),
+            Column("timestamp", DateTime),
+            *(Column(name, String(100)) for name in self.FILTER_COLUMNS),
+        )
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def setup(self, bind):
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            if not inspect(bind).has_table(self.table.name):
+                unindexed = ", ".join(
+                    f"{name} UNINDEXED"
+                    for name in ("log_table", "log_id", "timestamp") + self.FILTER_COLUMNS
+                )
+                with bind.begin() as conn:
+                    conn.execute(
+                        text(
+                            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table.name} USING fts5("
+                            f"message, description, {unindexed}, tokenize='trigram')"
+                        )
+                    )
+                self._rebuild(bind)
+            self._ready = True
+
+    def _rebuild(self, bind: Engine):
+        """为已有日志补建索引"""
+        names = [LogModel.__tablename__] + log_partition_router.existing_partitions(bind)
+        for name in names:
+            source = log_partition_router.table(name)
+            if not inspect(bind).has_table(name):
+                continue
+            last_id = 0
+            while True:
+                with bind.begin() as conn:
+                    rows = conn.execute(
+                        select(source)
+                        .where(source.c.id > last_id)
+                        .order_by(source.c.id)
+                        .limit(self.CHUNK_SIZE)
+                    ).mappings().all()
+                    if not rows:
+                        break
+                    conn.execute(insert(self.table), [self._entry(name, row["id"], row) for row in rows])
+                    last_id = rows[-1]["id"]
+            log.info("日志全文索引已补建: %s", name)
+
+    def _entry(self, table_name: str, log_id: int, row) -> dict[str, Any]:
+        """日志 -> 索引行"""
+        description = row.get("description")
+        return {
+            "message": row.get("message"),
+            "description": json.dumps(description, ensure_ascii=False, default=str)
+            if description
+            else "",
+            "log_table": table_name,
+            "log_id": log_id,
+            "timestamp": row.get("timestamp"),
+            **{name: row.get(name) for name in self.FILTER_COLUMNS},
+        }
+
+    def index(self, db, table_name, rows):
+        entries = [self._entry(table_name, log_id, row) for log_id, row in rows]
+        if entries:
+            db.execute(insert(self.table), entries)
+
+    def purge(self, conn, table_name, before=None):
+        if not inspect(conn).has_table(self.table.name):
+            return
+        conditions = [self.table.c.log_table == table_name]
+        if before is not None:
+            conditions.append(self.table.c.timestamp < before)
+        conn.execute(delete(self.table).where(*conditions))
+
+    def search(self, db, keyword, tables, conditions, limit, offset, count_cap):
+        fts = self.table
+        terms = split_terms(keyword)
+        where = conditions(fts) + [fts.c.log_table.in_([table.name for table in tables])]
+        if all(len(term) >= 3 for term in terms):
+            # 每个关键字按短语匹配，双引号转义
+            query = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+            where.append(literal_column(fts.name).op("MATCH")(query))
+            order_by = (literal_column(f"bm25({fts.name})"), fts.c.timestamp.desc())
+        else:
+            where.extend(
+                or_(func.instr(fts.c.message, term) > 0, func.instr(fts.c.description, term) > 0)
+                for term in terms
+            )
+            order_by = (fts.c.timestamp.desc(),)
+        matched = select(fts.c.log_table, fts.c.log_id).where(and_(*where))
+        total = db.scalar(select(func.count()).select_from(matched.limit(count_cap).subquery()))
+        rows = db.execute(matched.order_by(*order_by).offset(offset).limit(limit)).all()
+        return [tuple(row) for row in rows], total
+
+
+# 可用的日志全文搜索后端
+LOG_SEARCH_BACKENDS: dict[str, type[LogSearchBackend]] = {
+    LikeSearchBackend.name: LikeSearchBackend,
+    MySQLFulltextBackend.name: MySQLFulltextBackend,
+    SQLiteFTS5Backend.name: SQLiteFTS5Backend,
+}
+
+
+def create_search_backend(name: str, dialect: str) -> LogSearchBackend:
+    """
+    根据配置创建日志全文搜索后端
+
+    Args:
+        name: 后端名称，auto 表示按数据库类型选择
+        dialect: 数据库方言名称
+    """
+    if name == "auto":
+        name = {
+            "sqlite": SQLiteFTS5Backend.name,
+            "mysql": MySQLFulltextBackend.name,
+        }.get(dialect, LikeSearchBackend.name)
+    if name not in LOG_SEARCH_BACKENDS:
+        raise ValueError(f"未知的日志全文搜索后端: {name}")
+    return LOG_SEARCH_BACKENDS[name]()
+
+
+# 创建全局日志全文搜索后端实例
+log_search_backend = create_search_backend(
+    BaseConfig.LOG_SEARCH_BACKEND, make_url(DB_Config.URL).get_backend_name()
+)
+log_partition_router.on_create(log_search_backend.setup_table)
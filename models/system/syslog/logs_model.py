@@ -1,5 +1,5 @@
 # models/system/syslog/logs_model.py
-from sqlalchemy import DateTime, func, Text, String, Integer, JSON
+from sqlalchemy import DateTime, func, Index, Text, String, Integer, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from models.base import Base
@@ -12,12 +12,20 @@ class LogModel(Base):
     """
 
     __tablename__ = 'sys_logs'
+    # 日志列表均按 (timestamp desc, id desc) 排序分页，组合索引以 timestamp 结尾，
+    # 等值条件命中前缀后可直接按索引顺序扫描，不需要额外排序
+    # 索引名以表名开头，日志分区表复制索引时替换为分区表名
+    __table_args__ = (
+        Index("idx_sys_logs_timestamp_level", "timestamp", "log_level"),
+        Index("idx_sys_logs_user_timestamp", "user_id", "timestamp"),
+        Index("idx_sys_logs_module_operation_timestamp", "logmodule", "operation", "timestamp"),
+    )
 
     # 日志主键 ID，自增主键
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
-    # 日志创建时间，默认为当前时间
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.now())
+    # 日志创建时间，默认为写入时的当前时间(数据库日志处理器会传入日志产生时间)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
 
     # 日志等级（INFO/WARNING/ERROR等），用于分类日志严重程度
     log_level: Mapped[str] = mapped_column(String(10), nullable=False)
@@ -26,7 +34,7 @@ class LogModel(Base):
     message: Mapped[str] = mapped_column(Text, nullable=False)
 
     # 模块名称（如 system/user）
-    logmodule: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
+    logmodule: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # 操作标识符（如 system.role.update）
     operation: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
@@ -35,7 +43,7 @@ class LogModel(Base):
     logmodule_operation: Mapped[str] = mapped_column(String(20), nullable=False)
 
     # 用户ID（支持 anonymous 表示未登录用户）
-    user_id: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
+    user_id: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # 客户端IP地址
     ip: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -47,4 +55,4 @@ class LogModel(Base):
     duration_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # 扩展描述字段，可用于记录请求参数、响应数据等（JSON字符串）
-    description: Mapped[dict] = mapped_column(JSON, default={})
+    description: Mapped[dict] = mapped_column(JSON, default=dict)
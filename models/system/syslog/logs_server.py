@@ -1,7 +1,16 @@
 # models/system/syslog/logs_server.py
+import json
+import base64
+from datetime import datetime
 from typing import Any
+from sqlalchemy import Table, and_, insert, literal, or_, select, union_all
 from sqlalchemy.orm import Session
+from config.base_config import BaseConfig
+from tools.cache import count_cache, CountStrategy
 from .logs_model import LogModel
+from .log_partition import log_partition_router
+from .log_search import log_search_backend
+from .metrics_server import LogMetricsService
 
 
 class LogService:
@@ -10,59 +19,288 @@ class LogService:
         self.db_session = db_session
         self.model = LogModel
 
-    def create_log(
-        self,
-        user_id: str,
-        log_level: str,
-        ip: str,
-        action: str,
-        category_type: str,
-        category: str,
-        message: str,
-        status: str,
-        duration_ms: int,
-        description:dict
-    ):
-        """
-        创建一个新的日志条目并保存到数据库
-        """
-        new_log = LogModel(
-            user_id=user_id,
-            log_level=log_level,
-            ip=ip,
-            action=action,
-            category_type=category_type,
-            category=category,
-            message=message,
-            status=status,
-            duration_ms=duration_ms,
-            description=description
-        )
-        self.db_session.add(new_log)
-        self.db_session.commit()
-        return new_log
     def batch_create_logs(self, logs: list[dict[str, Any]]):
-        """批量创建日志记录"""
-        db_logs = [LogModel(**log) for log in logs]
-        self.db_session.bulk_save_objects(db_logs)
+        """
+        批量创建日志记录
+
+        日志字典直接作为参数执行 Core insert(executemany)，不构造 ORM 对象；
+        支持 insertmanyvalues 的方言会合并为多行 VALUES 语句写入。
+        同一批次的日志字典需包含相同的字段。
+        开启日志分区时按日志时间分组写入对应分区表；
+        全文搜索后端需要同步索引时，取回日志ID后在同一事务中写入索引；
+        开启 LOG_METRICS_ENABLED 时同时累加分钟指标汇总
+        """
+        if not logs:
+            return
+        # 分区表、索引表在独立连接上创建，需在本会话开始写入前全部建好(SQLite 写锁)
+        bind = self.db_session.get_bind()
+        log_search_backend.setup(bind)
+        if log_partition_router.enabled:
+            groups = log_partition_router.route(logs)
+            tables = {name: log_partition_router.ensure_partition(bind, name) for name in groups}
+        else:
+            groups = {LogModel.__tablename__: logs}
+            tables = {LogModel.__tablename__: LogModel.__table__}
+        for name, group in groups.items():
+            table = tables[name]
+            if not log_search_backend.indexes_rows:
+                self.db_session.execute(insert(table), group)
+                continue
+            log_ids = self.db_session.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True), group
+            ).scalars().all()
+            log_search_backend.index(self.db_session, name, zip(log_ids, group))
+        # 同一事务内累加分钟指标汇总，日志写入失败重试时不会重复计数
+        if BaseConfig.LOG_METRICS_ENABLED:
+            LogMetricsService(self.db_session).record_batch(logs)
+
     def get_logs_by_user(self, user_id: str):
         """
-        根据用户ID查询所有相关日志
+        根据用户ID查询所有相关日志(所有日志分区 + sys_logs 历史表)，按时间倒序
+
+        返回的日志行与 get_page_by_cursor 相同，带有 partition 字段
+        """
+        selects = [
+            select(*table.c, literal(table.name).label("partition")).where(
+                table.c.user_id == user_id
+            )
+            for table in self._log_tables(None, None)
+        ]
+        logs_query = (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+        return self.db_session.execute(
+            select(logs_query).order_by(
+                logs_query.c.timestamp.desc(),
+                logs_query.c.id.desc(),
+                logs_query.c.partition.desc(),
+            )
+        ).all()
+
+    @staticmethod
+    def _parse_time(value: Any) -> datetime | None:
+        """解析查询条件中的时间，支持 datetime 和 ISO 格式字符串"""
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value))
+
+    def _log_tables(self, start: datetime | None, end: datetime | None) -> list[Table]:
+        """与时间范围有交集的日志表: 分区表 + sys_logs 历史表"""
+        tables = []
+        if log_partition_router.enabled:
+            bind = self.db_session.get_bind()
+            tables = [
+                log_partition_router.table(name)
+                for name in log_partition_router.partitions_for_range(bind, start, end)
+            ]
+        tables.append(LogModel.__table__)
+        return tables
+
+    @staticmethod
+    def encode_cursor(log) -> str:
         """
-        return self.db_session.query(LogModel).filter(LogModel.user_id == user_id).all()
+        生成日志列表的续页令牌
+
+        令牌为 base64 编码的 JSON，包含最后一行的时间、ID 和所在表名
+        """
+        payload = {"t": log.timestamp.isoformat(), "id": log.id, "p": log.partition}
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        ).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int, str]:
+        """
+        解析续页令牌
+
+        Returns:
+            tuple[最后一行时间, 最后一行ID, 最后一行所在表名]
+
+        Raises:
+            ValueError: 令牌格式错误
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(payload["t"]), int(payload["id"]), str(payload["p"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"分页游标无效: {e}")
+
+    @staticmethod
+    def _seek_condition(table: Table, after: tuple[datetime, int, str]):
+        """
+        排在续页令牌之后的日志条件
+
+        排序为 (timestamp desc, id desc, 表名 desc)，表名在单表查询中是常量，
+        因此只需按当前表名与令牌表名的大小决定 id 比较是否包含等号
+        """
+        timestamp, log_id, partition = after
+        id_condition = table.c.id <= log_id if table.name < partition else table.c.id < log_id
+        return or_(
+            table.c.timestamp < timestamp,
+            and_(table.c.timestamp == timestamp, id_condition),
+        )
+
+    def _field_conditions(
+        self, table: Table, start: datetime | None, end: datetime | None, fields: dict
+    ) -> list:
+        """单个日志表的时间范围和字段等值条件"""
+        conditions = []
+        if start is not None:
+            conditions.append(table.c.timestamp >= start)
+        if end is not None:
+            conditions.append(table.c.timestamp <= end)
+        for key, value in fields.items():
+            if value is None or value == "":
+                continue
+            if key not in table.c:
+                raise ValueError(f"日志字段不存在: {key}")
+            conditions.append(table.c[key] == value)
+        return conditions
+
+    def get_page_by_cursor(
+        self,
+        page_size: int = 30,
+        cursor: str | None = None,
+        page: int = 1,
+        **kwargs: Any,
+    ) -> tuple[list, int, str | None, bool]:
+        """
+        日志列表游标(keyset)分页查询，按 (timestamp desc, id desc) 排序
+
+        - 只查询与 create_time_start/create_time_end 有交集的日志分区，
+          传入 cursor 时结束时间收紧到令牌时间，越往后翻访问的分区越少
+        - 每个日志表单独按索引顺序取前 N 行后再合并排序，N 为本页所需行数，
+          传入 cursor 时不使用 OFFSET，翻页耗时与页码深度无关
+        - 未传 cursor 时按 page 查询(第1页，或跳页时回退为 OFFSET)
+        - 总数按 LOG_COUNT_STRATEGY 统计，estimated 方式最多统计 LOG_COUNT_CAP 条，
+          超出时返回上限值并标记为已截断，续页令牌不受上限影响
+
+        返回的日志行带有 partition 字段(所在表名)，不同分区的日志 id 可能重复
+
+        Returns:
+            tuple[日志行列表, 总数, 下一页续页令牌(没有下一页时为 None), 总数是否被上限截断]
+        """
+        start = self._parse_time(kwargs.pop("create_time_start", None))
+        end = self._parse_time(kwargs.pop("create_time_end", None))
+        after = self.decode_cursor(cursor) if cursor else None
+        offset = 0 if after else (page - 1) * page_size
+        strategy = BaseConfig.LOG_COUNT_STRATEGY
+        cap = BaseConfig.LOG_COUNT_CAP
+
+        # 总数: 不受续页令牌影响，estimated 方式下每个表最多统计 cap + 1 行(多出的一行用于判断是否截断)
+        count_selects = []
+        for table in self._log_tables(start, end):
+            count_select = select(table.c.id).where(
+                *self._field_conditions(table, start, end, kwargs)
+            )
+            if strategy == CountStrategy.ESTIMATED:
+                count_select = select(count_select.limit(cap + 1).subquery())
+            count_selects.append(count_select)
+        total, total_capped = count_cache.count_capped(
+            self.db_session,
+            union_all(*count_selects) if len(count_selects) > 1 else count_selects[0],
+            strategy,
+            cap=cap,
+        )
+
+        # 当前页: 每个表按 (timestamp desc, id desc) 取前 offset + page_size 行
+        page_end = end if after is None or (end is not None and end < after[0]) else after[0]
+        page_selects = []
+        for table in self._log_tables(start, page_end):
+            conditions = self._field_conditions(table, start, end, kwargs)
+            if after is not None:
+                conditions.append(self._seek_condition(table, after))
+            page_selects.append(
+                select(
+                    select(*table.c, literal(table.name).label("partition"))
+                    .where(*conditions)
+                    .order_by(table.c.timestamp.desc(), table.c.id.desc())
+                    .limit(offset + page_size)
+                    .subquery()
+                )
+            )
+        logs_query = (
+            union_all(*page_selects) if len(page_selects) > 1 else page_selects[0]
+        ).subquery()
+        logs = self.db_session.execute(
+            select(logs_query)
+            .order_by(
+                logs_query.c.timestamp.desc(),
+                logs_query.c.id.desc(),
+                logs_query.c.partition.desc(),
+            )
+            .offset(offset)
+            .limit(page_size)
+        ).all()
+        next_cursor = self.encode_cursor(logs[-1]) if len(logs) == page_size else None
+        return logs, total, next_cursor, total_capped
 
     # 根据动态字段查询所有日志
     def get_all_by_fields(self, page: int = 1, page_size: int = 30, **kwargs):
         """
-        根据任意字段查询所有日志
-        """
-        query = self.db_session.query(LogModel)
-        if 'create_time_start' in kwargs and kwargs['create_time_start']:
-            query = query.filter(LogModel.create_time >= kwargs.pop('create_time_start'))
-        if 'create_time_end' in kwargs and kwargs['create_time_end']:
-            query = query.filter(LogModel.create_time <= kwargs.pop('create_time_end'))
-        count_query = query.filter_by(**kwargs)
-        total = count_query.count()
-        offset = (page - 1) * page_size
-        logs = count_query.offset(offset).limit(page_size).all()
-        return logs, total
+        根据任意字段查询所有日志，按页码分页，见 get_page_by_cursor
+
+        Returns:
+            tuple[日志行列表, 总数, 总数是否被上限截断]
+        """
+        logs, total, _, total_capped = self.get_page_by_cursor(
+            page_size=page_size, page=page, **kwargs
+        )
+        return logs, total, total_capped
+
+    def search(
+        self,
+        keyword: str,
+        time_range: tuple[Any, Any] | None = None,
+        page: int = 1,
+        page_size: int = 30,
+        **kwargs: Any,
+    ) -> tuple[list, int, bool]:
+        """
+        按关键字全文搜索日志内容(message/description)，按相关度排序
+
+        搜索方式见 LOG_SEARCH_BACKEND，只搜索与时间范围有交集的日志分区，
+        总数最多统计 LOG_COUNT_CAP 条，超出时标记为已截断
+
+        参数:
+            keyword: 搜索关键字，空白分隔多个关键字(需同时包含)
+            time_range: (开始时间, 结束时间)，任一端可为 None
+            page: 页码
+            page_size: 每页数量
+            **kwargs: 字段等值过滤条件，如 log_level、logmodule、operation
+
+        Returns:
+            tuple[日志行列表, 总数, 总数是否被上限截断]，日志行与 get_page_by_cursor 相同
+        """
+        start, end = time_range or (None, None)
+        start, end = self._parse_time(start), self._parse_time(end)
+        log_search_backend.setup(self.db_session.get_bind())
+        tables = self._log_tables(start, end)
+        cap = BaseConfig.LOG_COUNT_CAP
+        matched, total = log_search_backend.search(
+            self.db_session,
+            keyword,
+            tables,
+            lambda table: self._field_conditions(table, start, end, kwargs),
+            limit=page_size,
+            offset=(page - 1) * page_size,
+            count_cap=cap + 1,
+        )
+        total_capped = total > cap
+        total = min(total, cap)
+        # 回表查询完整日志，按搜索结果顺序返回
+        ids_by_table: dict[str, list[int]] = {}
+        for table_name, log_id in matched:
+            ids_by_table.setdefault(table_name, []).append(log_id)
+        rows = {}
+        for table in tables:
+            if table.name not in ids_by_table:
+                continue
+            for row in self.db_session.execute(
+                select(*table.c, literal(table.name).label("partition")).where(
+                    table.c.id.in_(ids_by_table[table.name])
+                )
+            ):
+                rows[(table.name, row.id)] = row
+        logs = [rows[key] for key in matched if key in rows]
+        return logs, total, total_capped
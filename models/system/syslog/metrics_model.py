@@ -0,0 +1,53 @@
+# models/system/syslog/metrics_model.py
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from models.base import Base
+
+
+class LogMetricMinuteModel(Base):
+    """
+    日志指标分钟汇总表
+
+    数据库日志写入器每次批量写入日志时，按 (分钟, 模块, 操作) 增量累加，
+    趋势图、错误率、耗时分位数等统计只查询本表，不扫描原始日志。
+
+    耗时直方图按固定上界分桶(与 OperationStats.BUCKETS_MS 一致)，每个桶一个计数字段，
+    多个进程并发写入同一分钟时可直接在数据库中累加。
+
+    属性:
+        bucket: 分钟时间(秒和微秒为 0)
+        logmodule: 日志模块
+        operation: 操作标识
+        count: 日志条数
+        error_count: 失败条数(状态非成功或级别为 ERROR/CRITICAL)
+        duration_sum/duration_min/duration_max: 耗时合计/最小/最大(毫秒)
+        le_1 ... le_5000: 耗时 <= 上界(且大于上一个上界)的条数
+        gt_5000: 耗时 > 5000ms 的条数
+    """
+
+    __tablename__ = "sys_log_metrics_minute"
+    __table_args__ = (
+        UniqueConstraint("bucket", "logmodule", "operation", name="uq_log_metrics_minute"),
+        {"comment": "日志指标分钟汇总表"},
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, comment="主键")
+    bucket: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True, comment="分钟时间")
+    logmodule: Mapped[str] = mapped_column(String(50), nullable=False, comment="日志模块")
+    operation: Mapped[str] = mapped_column(String(100), nullable=False, comment="操作标识")
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="日志条数")
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="失败条数")
+    duration_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False, comment="耗时合计(毫秒)")
+    duration_min: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="最小耗时(毫秒)")
+    duration_max: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="最大耗时(毫秒)")
+    # 耗时直方图
+    le_1: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=1ms")
+    le_5: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=5ms")
+    le_10: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=10ms")
+    le_50: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=50ms")
+    le_100: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=100ms")
+    le_500: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=500ms")
+    le_1000: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=1000ms")
+    le_5000: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时<=5000ms")
+    gt_5000: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="耗时>5000ms")
@@ -0,0 +1,254 @@
+# models/system/syslog/metrics_server.py
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from tools.sys_log.logger import OperationStats
+from .metrics_model import LogMetricMinuteModel
+
+# 耗时直方图上界(毫秒)与汇总表字段
+LATENCY_BUCKETS_MS = OperationStats.BUCKETS_MS
+HISTOGRAM_COLUMNS = tuple(f"le_{bound}" for bound in LATENCY_BUCKETS_MS) + (
+    f"gt_{LATENCY_BUCKETS_MS[-1]}",
+)
+# 视为成功的日志状态
+SUCCESS_STATUSES = ("成功", "success")
+# 视为失败的日志级别
+ERROR_LEVELS = ("ERROR", "CRITICAL")
+
+# 累加字段
+_SUM_COLUMNS = ("count", "error_count", "duration_sum") + HISTOGRAM_COLUMNS
+
+
+def estimate_percentile(histogram: list[int], count: int, q: float, max_ms: int) -> float:
+    """
+    按直方图估算耗时分位数(毫秒)，在所在桶的上下界之间线性插值，不超过最大耗时
+
+    Args:
+        histogram: 各桶计数，顺序与 HISTOGRAM_COLUMNS 一致
+        count: 总条数
+        q: 分位(0~1)
+        max_ms: 最大耗时
+    """
+    if not count:
+        return 0
+    target = q * count
+    cumulative = 0
+    lower = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS_MS + (max_ms,), histogram):
+        upper = max(lower, min(bound, max_ms))
+        if bucket_count and cumulative + bucket_count >= target:
+            return round(lower + (upper - lower) * (target - cumulative) / bucket_count, 2)
+        cumulative += bucket_count
+        lower = upper
+    return max_ms
+
+
+class LogMetricsService:
+    """
+    日志指标汇总服务
+
+    - record_batch: 数据库日志写入器批量写入日志时调用，按分钟增量累加汇总行
+    - get_trend / get_summary: 趋势图和排行查询，只访问汇总表
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.model = LogMetricMinuteModel
+
+    @staticmethod
+    def aggregate(logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """把一批日志按 (分钟, 模块, 操作) 汇总为汇总行"""
+        rows: dict[tuple, dict[str, Any]] = {}
+        now = datetime.now()
+        for entry in logs:
+            bucket = (entry.get("timestamp") or now).replace(second=0, microsecond=0)
+            key = (bucket, entry.get("logmodule"), entry.get("operation"))
+            duration = int(entry.get("duration_ms") or 0)
+            failed = (
+                entry.get("status", "success") not in SUCCESS_STATUSES
+                or entry.get("log_level") in ERROR_LEVELS
+            )
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "bucket": key[0],
+                    "logmodule": key[1],
+                    "operation": key[2],
+                    "duration_min": duration,
+                    "duration_max": duration,
+                    **{name: 0 for name in _SUM_COLUMNS},
+                }
+            row["count"] += 1
+            row["error_count"] += int(failed)
+            row["duration_sum"] += duration
+            row["duration_min"] = min(row["duration_min"], duration)
+            row["duration_max"] = max(row["duration_max"], duration)
+            row[HISTOGRAM_COLUMNS[bisect_left(LATENCY_BUCKETS_MS, duration)]] += 1
+        return list(rows.values())
+
+    def record_batch(self, logs: list[dict[str, Any]]):
+        """
+        按日志批次累加分钟汇总行
+
+        使用数据库的 upsert(SQLite/PostgreSQL: ON CONFLICT，MySQL: ON DUPLICATE KEY)
+        在数据库中原子累加，多个进程同时写入同一分钟不会丢失计数
+        """
+        rows = self.aggregate(logs)
+        if not rows:
+            return
+        table = self.model.__table__
+        dialect = self.db_session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as upsert
+                least, greatest = func.min, func.max
+            else:
+                from sqlalchemy.dialects.postgresql import insert as upsert
+                least, greatest = func.least, func.greatest
+            stmt = upsert(table)
+            incoming = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["bucket", "logmodule", "operation"],
+                set_=self._merge_values(table, incoming, least, greatest),
+            )
+        elif dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as upsert
+
+            stmt = upsert(table)
+            stmt = stmt.on_duplicate_key_update(
+                self._merge_values(table, stmt.inserted, func.least, func.greatest)
+            )
+        else:
+            self._record_rows(rows)
+            return
+        self.db_session.execute(stmt, rows)
+
+    @staticmethod
+    def _merge_values(table, incoming, least, greatest) -> dict:
+        """汇总行冲突时的累加表达式"""
+        values = {name: table.c[name] + incoming[name] for name in _SUM_COLUMNS}
+        values["duration_min"] = least(table.c.duration_min, incoming.duration_min)
+        values["duration_max"] = greatest(table.c.duration_max, incoming.duration_max)
+        return values
+
+    def _record_rows(self, rows: list[dict[str, Any]]):
+        """不支持 upsert 的数据库: 逐行查询后累加(依赖唯一约束，冲突时整批重试)"""
+        for row in rows:
+            metric = self.db_session.scalar(
+                select(self.model).where(
+                    self.model.bucket == row["bucket"],
+                    self.model.logmodule == row["logmodule"],
+                    self.model.operation == row["operation"],
+                ).with_for_update()
+            )
+            if metric is None:
+                self.db_session.add(self.model(**row))
+                continue
+            for name in _SUM_COLUMNS:
+                setattr(metric, name, getattr(metric, name) + row[name])
+            metric.duration_min = min(metric.duration_min, row["duration_min"])
+            metric.duration_max = max(metric.duration_max, row["duration_max"])
+        self.db_session.flush()
+
+    def _aggregate_query(self, start: datetime, end: datetime, group_by: tuple, **filters):
+        """按 group_by 字段汇总 [start, end) 内的分钟汇总行"""
+        model = self.model
+        group_columns = [getattr(model, name) for name in group_by]
+        stmt = (
+            select(
+                *group_columns,
+                *(func.sum(model.__table__.c[name]).label(name) for name in _SUM_COLUMNS),
+                func.min(model.duration_min).label("duration_min"),
+                func.max(model.duration_max).label("duration_max"),
+            )
+            .where(model.bucket >= start, model.bucket < end)
+            .group_by(*group_columns)
+        )
+        for name, value in filters.items():
+            if value:
+                stmt = stmt.where(getattr(model, name) == value)
+        return self.db_session.execute(stmt).mappings().all()
+
+    @staticmethod
+    def _metrics(row: dict[str, Any]) -> dict[str, Any]:
+        """汇总行 -> 指标: 次数、错误率、平均/最小/最大耗时、P50/P95/P99"""
+        count = int(row["count"] or 0)
+        histogram = [int(row[name] or 0) for name in HISTOGRAM_COLUMNS]
+        max_ms = int(row["duration_max"] or 0)
+        return {
+            "count": count,
+            "error_count": int(row["error_count"] or 0),
+            "error_rate": round(row["error_count"] / count, 4) if count else 0,
+            "avg_ms": round(row["duration_sum"] / count, 2) if count else 0,
+            "min_ms": int(row["duration_min"] or 0),
+            "max_ms": max_ms,
+            "p50_ms": estimate_percentile(histogram, count, 0.50, max_ms),
+            "p95_ms": estimate_percentile(histogram, count, 0.95, max_ms),
+            "p99_ms": estimate_percentile(histogram, count, 0.99, max_ms),
+            "histogram": dict(zip(HISTOGRAM_COLUMNS, histogram)),
+        }
+
+    def get_trend(
+        self,
+        start: datetime,
+        end: datetime,
+        interval_minutes: int = 1,
+        logmodule: str | None = None,
+        operation: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        指标趋势，按 interval_minutes 分钟为一个点
+
+        参数:
+            start: 开始时间(含)
+            end: 结束时间(不含)
+            interval_minutes: 每个点覆盖的分钟数
+            logmodule/operation: 只统计指定模块/操作，None 表示全部
+
+        返回:
+            按时间升序的指标列表，每项含 time 和 _metrics 中的指标，没有日志的时间点不返回
+        """
+        rows = self._aggregate_query(
+            start, end, ("bucket",), logmodule=logmodule, operation=operation
+        )
+        interval = timedelta(minutes=max(1, interval_minutes))
+        points: dict[datetime, dict[str, Any]] = {}
+        for row in rows:
+            bucket = row["bucket"]
+            point_time = start + (bucket - start) // interval * interval
+            point = points.get(point_time)
+            if point is None:
+                points[point_time] = dict(row)
+                continue
+            for name in _SUM_COLUMNS:
+                point[name] += row[name]
+            point["duration_min"] = min(point["duration_min"], row["duration_min"])
+            point["duration_max"] = max(point["duration_max"], row["duration_max"])
+        return [
+            {"time": point_time, **self._metrics(points[point_time])}
+            for point_time in sorted(points)
+        ]
+
+    def get_summary(
+        self,
+        start: datetime,
+        end: datetime,
+        logmodule: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        按 (模块, 操作) 汇总 [start, end) 内的指标，按次数倒序
+
+        返回:
+            每项含 logmodule、operation 和 _metrics 中的指标
+        """
+        rows = self._aggregate_query(
+            start, end, ("logmodule", "operation"), logmodule=logmodule
+        )
+        summary = [
+            {"logmodule": row["logmodule"], "operation": row["operation"], **self._metrics(row)}
+            for row in rows
+        ]
+        summary.sort(key=lambda item: item["count"], reverse=True)
+        return summary
@@ -93,31 +93,31 @@ class UserModel(Base, BaseCrud, UserMixin):
     # 部门对象
     dept: Mapped["DeptModel"] = relationship(
         back_populates="users",
-        lazy="selectin",
+        lazy="raise_on_sql",
         foreign_keys="UserModel.dept_id",  # 明确指定使用的外键
     )
     # 岗位对象
     post: Mapped["PostModel"] = relationship(
-        back_populates="users", foreign_keys="UserModel.post_id", lazy="selectin"
+        back_populates="users", foreign_keys="UserModel.post_id", lazy="raise_on_sql"
     )
     # 管理的部门 对象,是哪些部门的管理者
     led_depts: Mapped[list["DeptModel"]] = relationship(
         back_populates="leader",
         foreign_keys="DeptModel.leader_user_id",
-        lazy="selectin",  # 添加明确的加载策略
+        lazy="raise_on_sql",  # 添加明确的加载策略
     )
     # 上级领导对象
     leader: Mapped["UserModel"] = relationship(
         foreign_keys=[leader_id],
         remote_side=[id],
         back_populates="led_users",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     # 管理的用户对象列表,是哪些用户的上级领导
     led_users: Mapped[list["UserModel"]] = relationship(
         back_populates="leader",
-        lazy="selectin",
+        lazy="raise_on_sql",
         foreign_keys="UserModel.leader_id",
         cascade="all, delete-orphan",
     )
@@ -126,7 +126,7 @@ class UserModel(Base, BaseCrud, UserMixin):
     roles: Mapped[list["RoleModel"]] = relationship(
         secondary="sys_role_to_sys_user",
         back_populates="users",
-        lazy="selectin",
+        lazy="raise_on_sql",
         order_by="RoleModel.id",
     )
 
@@ -4,12 +4,33 @@ from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select
 from tools.security.password_service import password_security
+from tools.cache import invalidation_bus, CacheNamespace
 # 自定义包
 from models.base_service import BaseService,UserModel,RoleModel
 class UserService(BaseService[UserModel]):
     def __init__(self, db: Session, current_user_id:int):
         super().__init__(model=UserModel, db=db, current_user_id=current_user_id)
 
+    def _after_bulk_delete(self, obj_ids: list[int]):
+        """已删除用户的登录主体缓存失效，其他进程轮询变更记录后失效"""
+        invalidation_bus.bump_keys(self.db, CacheNamespace.PRINCIPAL, *obj_ids)
+
+    def update(self, obj_id: int, **kwargs) -> UserModel:
+        """
+        更新用户信息，并失效该用户的登录主体缓存
+
+        参数:
+            obj_id: 用户ID
+            **kwargs: 更新字段
+
+        返回:
+            更新后的用户对象
+        """
+        # 同时加载用户角色，调用方可直接替换 user.roles
+        user = super().update(obj_id, plan="user_edit_modal", **kwargs)
+        invalidation_bus.bump_keys(self.db, CacheNamespace.PRINCIPAL, obj_id)
+        return user
+
     @classmethod
     def get_user(cls, db: Session, user_id: int) -> Optional['UserModel']:
         """
@@ -98,6 +119,7 @@ class UserService(BaseService[UserModel]):
             user.login_ip = ip
             user.login_date = datetime.now()
             user.session_token = token
+            invalidation_bus.bump_keys(db, CacheNamespace.PRINCIPAL, user.id)
             return user
         except Exception as e:
             raise e
@@ -112,6 +134,7 @@ class UserService(BaseService[UserModel]):
         user = cls.get_user(db, user_id)
         try:
             user.session_token = None
+            invalidation_bus.bump_keys(db, CacheNamespace.PRINCIPAL, user_id)
             return user
         except Exception as e:
             raise e
@@ -15,8 +15,11 @@ from config.permission_config import permissionConfig
 from tools.sys import LoginUser, route_menu, page_permissions_db
 from tools.sys_log.logconfig import setup_logging
 from tools.sys_log import dash_logger
+from tools.sys_log.tracing import tracer
+from tools.sys_log.query_monitor import query_monitor
 from tools.global_message import global_message
-from models.base import get_db
+from tools.cache import principal_cache, invalidation_bus
+from models.base import get_db, engine
 
 app = dash.Dash(
     __name__,
@@ -46,6 +49,13 @@ dash_logger.warning(
     operation=dash_logger.operation.SYSTEM_START,
 )
 
+# 初始化请求链路追踪(LOG_TRACE_ENABLED 开启时生效)
+tracer.init_app(server)
+tracer.instrument_engine(engine)
+# 初始化 SQL 查询监控(LOG_QUERY_MONITOR_ENABLED 开启时检查每个请求的 SQL 条数、耗时和重复语句)
+query_monitor.init_app(server)
+query_monitor.instrument_engine(engine)
+
 # 为当前应用添加flask-login用户登录管理
 login_manager = LoginManager()
 login_manager.init_app(app.server)
@@ -63,6 +73,8 @@ route_menu.load_config(RouterConfig.core_side_menu)
 # 初始化路由信息,权限配置 到数据库
 with get_db() as db:
     page_permissions_db.init_routes(db, RouterConfig.core_side_menu, permissionConfig.permissions)
+# 初始化跨进程缓存失效总线(建表、预置命名空间、记录版本基线)
+invalidation_bus.setup()
 
 
 @login_manager.user_loader
@@ -78,9 +90,20 @@ def user_loader(user_id):
     ):
         return AnonymousUserMixin()
 
-    # 根据当前要加载的用户id，从数据库中获取匹配用户信息
-    with get_db() as db:
-        match_user = LoginUser.load(db, int(user_id))
+    # 检查其他进程的数据变更(限频)，版本变化时丢弃本进程缓存
+    invalidation_bus.poll()
+
+    def load_user():
+        # 根据当前要加载的用户id，从数据库中获取匹配用户信息
+        with get_db() as db:
+            return LoginUser.load(db, int(user_id))
+
+    # 按 (用户id, 会话token) 读取进程内缓存，未命中时才查询数据库
+    match_user = principal_cache.get_or_load(
+        int(user_id),
+        request.cookies.get(BaseConfig.session_token_cookie_name),
+        load_user,
+    )
     # 处理未匹配到有效用户的情况
     if not match_user:
         return AnonymousUserMixin()
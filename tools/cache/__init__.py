@@ -0,0 +1,57 @@
+from .principal_cache import (
+    PrincipalCache,
+    principal_cache,
+)
+from .permission_bitmap import (
+    PermissionIndex,
+    RolePermissionCache,
+    permission_index,
+    role_permission_cache,
+)
+from .data_scope_cache import (
+    DataScopeCache,
+    data_scope_cache,
+)
+from .count_cache import (
+    CountStrategy,
+    CountCache,
+    count_cache,
+)
+from .invalidation import (
+    CacheNamespace,
+    CacheVersionBackend,
+    LocalCacheVersionBackend,
+    SqlCacheVersionBackend,
+    InvalidationBus,
+    invalidation_bus,
+)
+
+# 登录用户主体依赖用户信息(按用户失效)和角色权限(整体失效)
+invalidation_bus.subscribe_keys(
+    CacheNamespace.PRINCIPAL, principal_cache.invalidate_user, principal_cache.clear
+)
+invalidation_bus.subscribe(CacheNamespace.PERMISSION, principal_cache.clear)
+# 角色权限位掩码依赖 role_to_permission
+invalidation_bus.subscribe(CacheNamespace.PERMISSION, role_permission_cache.clear)
+# 数据范围依赖部门树和 role_to_dept
+invalidation_bus.subscribe(CacheNamespace.DATA_SCOPE, data_scope_cache.clear)
+
+__all__ = (
+    "PrincipalCache",
+    "principal_cache",
+    "PermissionIndex",
+    "RolePermissionCache",
+    "permission_index",
+    "role_permission_cache",
+    "DataScopeCache",
+    "data_scope_cache",
+    "CountStrategy",
+    "CountCache",
+    "count_cache",
+    "CacheNamespace",
+    "CacheVersionBackend",
+    "LocalCacheVersionBackend",
+    "SqlCacheVersionBackend",
+    "InvalidationBus",
+    "invalidation_bus",
+)
@@ -0,0 +1,200 @@
+import time
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import event, select, func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.util import find_tables
+
+from config.base_config import BaseConfig
+
+
+class CountStrategy:
+    """分页总数统计方式"""
+
+    EXACT = "exact"  # 每次精确统计
+    CACHED_EXACT = "cached_exact"  # 按查询条件缓存精确总数，相关表写入时失效
+    ESTIMATED = "estimated"  # 最多统计 estimate_cap 条，超出时返回上限值并标记为已截断
+
+    ALL = (EXACT, CACHED_EXACT, ESTIMATED)
+
+
+class CountCache:
+    """
+    分页总数缓存
+
+    缓存键: 过滤后查询语句的 SQL 文本 + 绑定参数(已包含字段条件和数据范围条件)
+    缓存值: 精确总数
+
+    当前进程内任意会话 flush 或执行 ORM 批量增删改时，按涉及的表失效相关条目；
+    其他进程的写入依赖 TTL 过期，总数最多滞后 ttl 秒。
+    """
+
+    def __init__(self, max_size: int, ttl: float, estimate_cap: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.estimate_cap = estimate_cap
+        self._entries: OrderedDict[tuple, tuple[float, frozenset[str], int]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(stmt: Select) -> tuple[str, tuple]:
+        """根据查询语句生成缓存键"""
+        compiled = stmt.compile()
+        params = tuple((name, repr(value)) for name, value in sorted(compiled.params.items()))
+        return str(compiled), params
+
+    @staticmethod
+    def tables_of(stmt: Select) -> frozenset[str]:
+        """查询语句涉及的所有表名(含子查询、别名)"""
+        return frozenset(table.name for table in find_tables(stmt))
+
+    def count(
+        self,
+        db: Session,
+        stmt: Select,
+        strategy: str = CountStrategy.EXACT,
+        cap: int | None = None,
+    ) -> int:
+        """
+        统计查询语句的结果总数
+
+        Args:
+            db: 数据库会话
+            stmt: 过滤后的查询语句(未分页)
+            strategy: 统计方式，见 CountStrategy
+            cap: estimated 方式的统计上限，默认 estimate_cap
+
+        Returns:
+            int: 总数，estimated 方式下最大为统计上限(是否截断见 count_capped)
+        """
+        return self.count_capped(db, stmt, strategy, cap)[0]
+
+    def count_capped(
+        self,
+        db: Session,
+        stmt: Select,
+        strategy: str = CountStrategy.EXACT,
+        cap: int | None = None,
+    ) -> tuple[int, bool]:
+        """
+        统计查询语句的结果总数，并返回总数是否被统计上限截断
+
+        estimated 方式最多统计 cap + 1 行，超过 cap 时返回 (cap, True)，
+        调用方应显示为 "cap+" 而不是精确总数。
+        调用方自行限制子查询行数时，每个子查询应限制为 cap + 1 行。
+
+        Returns:
+            tuple[总数, 是否截断]
+        """
+        if strategy == CountStrategy.ESTIMATED:
+            cap = self.estimate_cap if cap is None else cap
+            capped = stmt.order_by(None).limit(cap + 1)
+            total = db.scalar(select(func.count()).select_from(capped.subquery()))
+            return min(total, cap), total > cap
+        if strategy != CountStrategy.CACHED_EXACT:
+            return db.scalar(select(func.count()).select_from(stmt.subquery())), False
+
+        key = self.make_key(stmt)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2], False
+            self.misses += 1
+            generation = self._generation
+        total = db.scalar(select(func.count()).select_from(stmt.subquery()))
+        with self._lock:
+            # 统计期间相关数据发生变更，本次结果仅返回不缓存
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, self.tables_of(stmt), total)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return total, False
+
+    def invalidate_tables(self, tables: Iterable[str]):
+        """失效涉及指定表的缓存条目"""
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, v in self._entries.items() if v[1] & tables]:
+                del self._entries[key]
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "estimate_cap": self.estimate_cap,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 创建全局分页总数缓存实例
+count_cache = CountCache(
+    max_size=BaseConfig.COUNT_CACHE_MAX_SIZE,
+    ttl=BaseConfig.COUNT_CACHE_TTL,
+    estimate_cap=BaseConfig.COUNT_ESTIMATE_CAP,
+)
+
+_SESSION_TABLES_KEY = "count_cache_tables"
+
+
+def _remember_tables(session: Session, tables: set[str]):
+    """立即失效，并记录到会话中，提交或回滚后再失效一次"""
+    count_cache.invalidate_tables(tables)
+    session.info.setdefault(_SESSION_TABLES_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_count_on_flush(session, flush_context):
+    """flush 后按新增/修改/删除对象所在表(含多对多关联表)失效总数缓存"""
+    tables = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is None:
+            continue
+        tables.add(table.name)
+        for relationship in obj.__mapper__.relationships:
+            if relationship.secondary is not None:
+                tables.add(relationship.secondary.name)
+    if tables:
+        _remember_tables(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def invalidate_count_on_bulk(orm_execute_state):
+    """ORM 批量 insert/update/delete 语句执行时失效目标表"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _remember_tables(orm_execute_state.session, {table.name})
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def invalidate_count_after_transaction(session, *args):
+    """事务结束后再失效一次，避免事务期间其他请求回填旧的总数"""
+    tables = session.info.pop(_SESSION_TABLES_KEY, None)
+    if tables:
+        count_cache.invalidate_tables(tables)
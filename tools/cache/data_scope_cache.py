@@ -0,0 +1,113 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from config.base_config import BaseConfig
+from models.system import DeptModel
+from .invalidation import invalidation_bus, CacheNamespace
+
+
+class DataScopeCache:
+    """
+    数据范围部门集合缓存
+
+    缓存键: frozenset((角色ID, 数据范围类型), ...)，即用户有效角色组合
+    缓存值: 该角色组合可访问的部门ID集合(已展开子部门)
+
+    命中时数据范围过滤不再执行递归查询。
+    部门新增/修改/删除(mapper 事件)和角色部门变更(失效总线)时整体清空。
+    """
+
+    def __init__(self, max_size: int, ttl: float, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[frozenset, tuple[float, frozenset[int]]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(roles: Iterable) -> frozenset:
+        """根据角色列表生成缓存键"""
+        return frozenset((role.id, role.data_scope_type) for role in roles)
+
+    def get_or_load(
+        self, key: frozenset, loader: Callable[[], Iterable[int]]
+    ) -> frozenset[int]:
+        """
+        获取角色组合的部门ID集合，未命中时调用 loader 计算并写入缓存
+
+        Args:
+            key: make_key 生成的缓存键
+            loader: 无参加载函数，返回部门ID集合
+
+        Returns:
+            frozenset[int]: 部门ID集合
+        """
+        if not self.enabled:
+            return frozenset(loader())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        dept_ids = frozenset(loader())
+        with self._lock:
+            # 计算期间部门或角色发生变更，本次结果仅返回不缓存
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, dept_ids)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return dept_ids
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 创建全局数据范围缓存实例
+data_scope_cache = DataScopeCache(
+    max_size=BaseConfig.DATA_SCOPE_CACHE_MAX_SIZE,
+    ttl=BaseConfig.DATA_SCOPE_CACHE_TTL,
+    enabled=BaseConfig.DATA_SCOPE_CACHE_ENABLED,
+)
+
+
+@event.listens_for(DeptModel, "after_insert")
+@event.listens_for(DeptModel, "after_update")
+@event.listens_for(DeptModel, "after_delete")
+def invalidate_data_scope_on_dept_change(mapper, connection, target):
+    """
+    部门新增、修改(含停用、软删除、调整上级)、删除后失效数据范围缓存
+
+    版本号通过 flush 所用连接写入，随部门变更一起提交，其他进程轮询后失效
+    """
+    session = object_session(target)
+    if session is None:
+        data_scope_cache.clear()
+        return
+    invalidation_bus.bump(session, CacheNamespace.DATA_SCOPE, connection=connection)
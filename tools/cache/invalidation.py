@@ -0,0 +1,406 @@
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Callable, Iterable
+
+from sqlalchemy import event, select, update, insert, delete, func, or_
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.orm import Session
+
+from config.base_config import BaseConfig
+from models.base import engine as default_engine
+from models.system.cache import CacheVersionModel, CacheChangeModel
+
+log = logging.getLogger(__name__)
+
+
+class CacheNamespace:
+    """
+    缓存命名空间
+
+    PERMISSION / DATA_SCOPE 对应 sys_cache_version 表中的一行，变更时整体失效；
+    PRINCIPAL 按条目(用户ID)记录到 sys_cache_change 表，变更时只失效对应用户。
+    """
+
+    PRINCIPAL = "principal"  # 登录用户主体
+    PERMISSION = "permission"  # 角色操作权限
+    DATA_SCOPE = "data_scope"  # 数据范围(部门树、角色部门)
+
+    ALL = (PERMISSION, DATA_SCOPE)
+
+
+class CacheVersionBackend(ABC):
+    """
+    缓存版本后端接口
+
+    实现类需要提供的能力:
+    - bump: 在调用方的事务中递增命名空间版本号，随事务一起提交或回滚
+    - fetch_versions: 读取所有命名空间当前已提交的版本号
+    - record_changes / fetch_changes: 按条目记录和读取变更(可选，默认不记录)
+    """
+
+    def setup(self, namespaces: Iterable[str]):
+        """初始化后端(建表、预置命名空间等)，默认无操作"""
+
+    @abstractmethod
+    def bump(self, db: Session | Connection, namespaces: Iterable[str]):
+        """递增命名空间版本号"""
+
+    @abstractmethod
+    def fetch_versions(self) -> dict[str, int]:
+        """获取所有命名空间的版本号"""
+
+    def record_changes(
+        self, db: Session | Connection, namespace: str, keys: Iterable[str]
+    ):
+        """在调用方的事务中记录条目变更，默认无操作(单进程无需跨进程通知)"""
+
+    def latest_change_id(self) -> int:
+        """获取当前最大变更ID，作为轮询基线"""
+        return 0
+
+    def fetch_changes(
+        self, after_id: int, since: datetime | None = None
+    ) -> list[tuple[int, str, str]]:
+        """
+        读取变更记录 (id, namespace, item_key)
+
+        返回 id 大于 after_id 的记录，以及 since 之后写入的记录
+        (自增ID按分配顺序而非提交顺序可见，重叠窗口用于补读晚提交的记录)。
+        """
+        return []
+
+    def prune_changes(self, before: datetime):
+        """清理 before 之前的变更记录，默认无操作"""
+
+
+class LocalCacheVersionBackend(CacheVersionBackend):
+    """单进程后端，版本号只保存在内存中，适用于单 worker 部署"""
+
+    def __init__(self):
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, db: Session | Connection, namespaces: Iterable[str]):
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def fetch_versions(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+
+class SqlCacheVersionBackend(CacheVersionBackend):
+    """
+    基于现有业务数据库的版本后端
+
+    版本号保存在 sys_cache_version 表，每个命名空间一行，
+    轮询只读取几行数据，开销很小。
+    """
+
+    def __init__(self, bind: Engine = default_engine):
+        self.bind = bind
+        self.table = CacheVersionModel.__table__
+        self.change_table = CacheChangeModel.__table__
+
+    def setup(self, namespaces: Iterable[str]):
+        """创建版本表、变更日志表并预置命名空间行，之后 bump 只需要 UPDATE"""
+        self.table.create(self.bind, checkfirst=True)
+        self.change_table.create(self.bind, checkfirst=True)
+        with self.bind.begin() as conn:
+            exists = set(conn.scalars(select(self.table.c.namespace)).all())
+            missing = [ns for ns in namespaces if ns not in exists]
+            if missing:
+                conn.execute(
+                    insert(self.table),
+                    [
+                        {"namespace": ns, "version": 0, "update_time": datetime.now()}
+                        for ns in missing
+                    ],
+                )
+
+    def bump(self, db: Session | Connection, namespaces: Iterable[str]):
+        now = datetime.now()
+        for namespace in namespaces:
+            result = db.execute(
+                update(self.table)
+                .where(self.table.c.namespace == namespace)
+                .values(version=self.table.c.version + 1, update_time=now)
+            )
+            # 未预置的命名空间，首次变更时插入
+            if result.rowcount == 0:
+                db.execute(
+                    insert(self.table).values(
+                        namespace=namespace, version=1, update_time=now
+                    )
+                )
+
+    def fetch_versions(self) -> dict[str, int]:
+        with self.bind.connect() as conn:
+            rows = conn.execute(
+                select(self.table.c.namespace, self.table.c.version)
+            ).all()
+        return {namespace: version for namespace, version in rows}
+
+    def record_changes(
+        self, db: Session | Connection, namespace: str, keys: Iterable[str]
+    ):
+        now = datetime.now()
+        rows = [
+            {"namespace": namespace, "item_key": key, "create_time": now}
+            for key in keys
+        ]
+        if rows:
+            db.execute(insert(self.change_table), rows)
+
+    def latest_change_id(self) -> int:
+        with self.bind.connect() as conn:
+            return conn.scalar(select(func.max(self.change_table.c.id))) or 0
+
+    def fetch_changes(
+        self, after_id: int, since: datetime | None = None
+    ) -> list[tuple[int, str, str]]:
+        t = self.change_table
+        condition = t.c.id > after_id
+        if since is not None:
+            condition = or_(condition, t.c.create_time >= since)
+        with self.bind.connect() as conn:
+            rows = conn.execute(
+                select(t.c.id, t.c.namespace, t.c.item_key)
+                .where(condition)
+                .order_by(t.c.id)
+            ).all()
+        return [tuple(row) for row in rows]
+
+    def prune_changes(self, before: datetime):
+        with self.bind.begin() as conn:
+            conn.execute(
+                delete(self.change_table).where(
+                    self.change_table.c.create_time < before
+                )
+            )
+
+
+class InvalidationBus:
+    """
+    跨 worker 缓存失效总线
+
+    - 写操作调用 bump(db, 命名空间...)，版本号随业务事务一起提交；
+      当前进程在提交后立即执行订阅回调
+    - 只影响少数条目的写操作调用 bump_keys(db, 命名空间, 键...)，
+      变更记录随业务事务一起提交，各进程只失效对应条目
+    - 其他进程在 poll() 中按 poll_interval 限频读取版本号和新增变更记录，
+      发现变化后执行对应命名空间的订阅回调
+    - 缓存失效的最大延迟约为 poll_interval 秒
+
+    用法:
+        invalidation_bus.subscribe(CacheNamespace.PERMISSION, principal_cache.clear)
+        invalidation_bus.subscribe_keys(
+            CacheNamespace.PRINCIPAL, principal_cache.invalidate_user, principal_cache.clear
+        )
+        invalidation_bus.bump(db, CacheNamespace.PERMISSION)
+        invalidation_bus.bump_keys(db, CacheNamespace.PRINCIPAL, user_id)
+        invalidation_bus.poll()  # 请求入口处调用
+    """
+
+    def __init__(
+        self,
+        backend: CacheVersionBackend,
+        poll_interval: float,
+        change_retention: float,
+        change_overlap: float,
+    ):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.change_retention = change_retention
+        self.change_overlap = change_overlap
+        self._subscribers: dict[str, list[Callable[[], None]]] = {}
+        self._key_subscribers: dict[
+            str, list[tuple[Callable[..., None], Callable[[], None]]]
+        ] = {}
+        self._versions: dict[str, int] | None = None
+        self._change_id: int | None = None
+        self._last_change_poll = 0.0
+        self._next_poll = 0.0
+        self._next_prune = 0.0
+        self._poll_lock = threading.Lock()
+
+    def subscribe(self, namespace: str, callback: Callable[[], None]):
+        """订阅命名空间，版本变化时执行无参回调"""
+        self._subscribers.setdefault(namespace, []).append(callback)
+
+    def subscribe_keys(
+        self,
+        namespace: str,
+        callback: Callable[..., None],
+        reset: Callable[[], None],
+    ):
+        """
+        订阅命名空间的条目变更
+
+        Args:
+            namespace: 命名空间
+            callback: 条目变更时以变更的键为位置参数调用
+            reset: 变更记录可能已被清理(本进程长时间未轮询)时调用，整体失效
+        """
+        self._key_subscribers.setdefault(namespace, []).append((callback, reset))
+
+    def setup(self):
+        """初始化后端并记录当前版本基线，应用启动时调用一次"""
+        try:
+            self.backend.setup(CacheNamespace.ALL)
+            self._versions = self.backend.fetch_versions()
+            self._change_id = self.backend.latest_change_id()
+            self._last_change_poll = time.monotonic()
+        except Exception as e:
+            log.error(f"缓存失效总线初始化失败:{e}")
+
+    def _notify(self, namespaces: Iterable[str]):
+        for namespace in namespaces:
+            for callback in self._subscribers.get(namespace, ()):
+                try:
+                    callback()
+                except Exception as e:
+                    log.error(f"缓存失效回调执行失败,命名空间:{namespace},错误:{e}")
+
+    def _notify_keys(self, namespace: str, keys: Iterable[str]):
+        keys = tuple(keys)
+        for callback, _ in self._key_subscribers.get(namespace, ()):
+            try:
+                callback(*keys)
+            except Exception as e:
+                log.error(f"缓存失效回调执行失败,命名空间:{namespace},错误:{e}")
+
+    def _reset_keys(self):
+        for namespace, subscribers in self._key_subscribers.items():
+            for _, reset in subscribers:
+                try:
+                    reset()
+                except Exception as e:
+                    log.error(f"缓存失效回调执行失败,命名空间:{namespace},错误:{e}")
+
+    def bump(self, db: Session, *namespaces: str, connection: Connection | None = None):
+        """
+        递增命名空间版本号
+
+        版本号写入调用方的数据库会话，随业务数据一起提交。
+        当前进程立即失效一次，并在提交后再失效一次，
+        避免提交前被其他请求用旧数据回填缓存。
+
+        在 mapper 事件(flush 过程)中调用时，需传入事件提供的 connection，
+        版本号通过该连接写入，db 仅用于注册提交后回调。
+        """
+        self.backend.bump(connection if connection is not None else db, namespaces)
+        self._notify(namespaces)
+        event.listen(
+            db, "after_commit", lambda session: self._notify(namespaces), once=True
+        )
+
+    def bump_keys(
+        self,
+        db: Session,
+        namespace: str,
+        *keys: int | str,
+        connection: Connection | None = None,
+    ):
+        """
+        记录命名空间下指定条目的变更
+
+        与 bump 相同，变更记录随业务事务一起提交，当前进程提交前后各失效一次；
+        其他进程轮询到变更记录后只失效这些条目。
+        """
+        keys = tuple(str(key) for key in keys)
+        if not keys:
+            return
+        self.backend.record_changes(
+            connection if connection is not None else db, namespace, keys
+        )
+        self._notify_keys(namespace, keys)
+        event.listen(
+            db,
+            "after_commit",
+            lambda session: self._notify_keys(namespace, keys),
+            once=True,
+        )
+
+    def _poll_versions(self):
+        versions = self.backend.fetch_versions()
+        previous = self._versions
+        self._versions = versions
+        if previous is None:
+            # 首次轮询只记录基线，进程内缓存此时尚为空
+            return
+        changed = [
+            namespace
+            for namespace, version in versions.items()
+            if previous.get(namespace) != version
+        ]
+        if changed:
+            self._notify(changed)
+
+    def _poll_changes(self):
+        now = time.monotonic()
+        if self._change_id is None:
+            # 首次轮询只记录基线
+            self._change_id = self.backend.latest_change_id()
+            self._last_change_poll = now
+            return
+        if now - self._last_change_poll > self.change_retention:
+            # 期间的变更记录可能已被清理，无法确定受影响的条目，整体失效
+            self._change_id = self.backend.latest_change_id()
+            self._last_change_poll = now
+            self._reset_keys()
+            return
+        since = datetime.now() - timedelta(
+            seconds=now - self._last_change_poll + self.change_overlap
+        )
+        changes = self.backend.fetch_changes(self._change_id, since)
+        self._last_change_poll = now
+        grouped: dict[str, set[str]] = {}
+        for change_id, namespace, key in changes:
+            self._change_id = max(self._change_id, change_id)
+            grouped.setdefault(namespace, set()).add(key)
+        for namespace, keys in grouped.items():
+            self._notify_keys(namespace, keys)
+        if now >= self._next_prune:
+            self._next_prune = now + self.change_retention / 2
+            self.backend.prune_changes(
+                datetime.now() - timedelta(seconds=self.change_retention)
+            )
+
+    def poll(self, force: bool = False):
+        """
+        检查其他进程的版本变更，按 poll_interval 限频
+
+        同一时刻只有一个线程执行查询，其他线程直接返回，不阻塞请求。
+        """
+        if not force and time.monotonic() < self._next_poll:
+            return
+        if not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = time.monotonic() + self.poll_interval
+            self._poll_versions()
+            if self._key_subscribers:
+                self._poll_changes()
+        except Exception as e:
+            log.warning(f"缓存版本轮询失败:{e}")
+        finally:
+            self._poll_lock.release()
+
+# 可用的版本后端
+CACHE_VERSION_BACKENDS: dict[str, type[CacheVersionBackend]] = {
+    "sql": SqlCacheVersionBackend,
+    "local": LocalCacheVersionBackend,
+}
+
+# 创建全局失效总线实例
+invalidation_bus = InvalidationBus(
+    backend=CACHE_VERSION_BACKENDS[BaseConfig.CACHE_VERSION_BACKEND](),
+    poll_interval=BaseConfig.CACHE_VERSION_POLL_INTERVAL,
+    change_retention=BaseConfig.CACHE_CHANGE_RETENTION,
+    change_overlap=BaseConfig.CACHE_CHANGE_OVERLAP,
+)
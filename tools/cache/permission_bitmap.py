@@ -0,0 +1,157 @@
+import time
+import threading
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.base_config import BaseConfig
+from config.permission_config import permissionConfig
+from models.system import PermissionsModel, role_to_permission
+
+
+class PermissionIndex:
+    """
+    权限字符位索引
+
+    启动时按 permissionConfig.permissions 的声明顺序为每个权限字符分配固定的位序号，
+    从数据库编译角色权限时出现的未声明权限字符(如手工添加的)追加分配新序号。
+    权限校验路径只查询不登记，未登记的权限字符位掩码为 0(无权限)。
+    """
+
+    def __init__(self, permissions: dict[str, list[dict]]):
+        self._index: dict[str, int] = {}
+        self._lock = threading.Lock()
+        for items in permissions.values():
+            for item in items:
+                self.register(item["key"])
+
+    def register(self, key: str) -> int:
+        """获取权限字符的位序号，未登记的权限字符追加登记，仅用于编译路径"""
+        index = self._index.get(key)
+        if index is None:
+            with self._lock:
+                index = self._index.setdefault(key, len(self._index))
+        return index
+
+    def index_of(self, key: str) -> int | None:
+        """获取权限字符的位序号，未登记时返回 None"""
+        return self._index.get(key)
+
+    def bit_of(self, key: str) -> int:
+        """获取权限字符对应的位掩码，未登记的权限字符返回 0"""
+        index = self._index.get(key)
+        return 0 if index is None else 1 << index
+
+    def mask_of(self, keys: Iterable[str]) -> int:
+        """将权限字符集合编译为位掩码，未登记的权限字符追加登记"""
+        mask = 0
+        for key in keys:
+            mask |= 1 << self.register(key)
+        return mask
+
+    def keys_of(self, mask: int) -> set[str]:
+        """将位掩码还原为权限字符集合"""
+        return {key for key, index in self._index.items() if mask >> index & 1}
+
+
+class RolePermissionCache:
+    """
+    角色权限位掩码缓存
+
+    每个角色的权限(role_to_permission)编译为一个 int 位掩码，
+    权限校验只需一次按位与。未缓存的角色通过一次关联查询批量编译。
+    角色权限变更时(configure_permissions)通过失效总线清空；
+    失效代数(generation)保护: 编译过程中发生失效时，旧掩码不会被写回缓存；
+    TTL 过期作为兜底，保证错过失效通知时权限最终与数据库一致。
+    """
+
+    def __init__(self, index: PermissionIndex, ttl: float):
+        self.index = index
+        self.ttl = ttl
+        self._masks: dict[int, tuple[float, int]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_masks(self, db: Session, role_ids: Iterable[int]) -> dict[int, int]:
+        """
+        获取角色的权限位掩码
+
+        Args:
+            db: 数据库会话，仅在存在未缓存角色时使用
+            role_ids: 角色ID集合
+
+        Returns:
+            dict: {角色ID: 位掩码}
+        """
+        role_ids = set(role_ids)
+        now = time.monotonic()
+        with self._lock:
+            masks = {}
+            for rid in role_ids:
+                entry = self._masks.get(rid)
+                if entry is not None and entry[0] >= now:
+                    masks[rid] = entry[1]
+            generation = self._generation
+        missing = role_ids - masks.keys()
+        if missing:
+            loaded = dict.fromkeys(missing, 0)
+            rows = db.execute(
+                select(role_to_permission.c.role_id, PermissionsModel.key)
+                .join(
+                    PermissionsModel,
+                    PermissionsModel.id == role_to_permission.c.permission_id,
+                )
+                .where(role_to_permission.c.role_id.in_(missing))
+            ).all()
+            for role_id, key in rows:
+                loaded[role_id] |= 1 << self.index.register(key)
+            with self._lock:
+                # 编译期间角色权限发生变更，本次结果仅返回不缓存
+                if generation == self._generation:
+                    expire_at = time.monotonic() + self.ttl
+                    self._masks.update(
+                        (rid, (expire_at, mask)) for rid, mask in loaded.items()
+                    )
+            masks.update(loaded)
+        return masks
+
+    def get_mask(self, db: Session, role_ids: Iterable[int]) -> int:
+        """获取多个角色合并后的权限位掩码"""
+        mask = 0
+        for role_mask in self.get_masks(db, role_ids).values():
+            mask |= role_mask
+        return mask
+
+    def has_permission(self, db: Session, role_ids: Iterable[int], key: str) -> bool:
+        """判断角色集合是否拥有指定权限字符"""
+        return bool(self.get_mask(db, role_ids) & self.index.bit_of(key))
+
+    def invalidate(self, *role_ids: int):
+        """失效指定角色的位掩码"""
+        with self._lock:
+            self._generation += 1
+            for role_id in role_ids:
+                self._masks.pop(int(role_id), None)
+
+    def clear(self):
+        """清空所有角色的位掩码"""
+        with self._lock:
+            self._generation += 1
+            self._masks.clear()
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {
+                "roles": len(self._masks),
+                "ttl": self.ttl,
+                "permissions": len(self.index._index),
+            }
+
+
+# 创建全局权限位索引和角色权限位掩码缓存
+permission_index = PermissionIndex(permissionConfig.permissions)
+role_permission_cache = RolePermissionCache(
+    permission_index, ttl=BaseConfig.ROLE_PERMISSION_CACHE_TTL
+)
@@ -0,0 +1,161 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.base_config import BaseConfig
+
+
+class PrincipalCache:
+    """
+    登录用户主体(LoginUser)进程内缓存
+
+    flask-login 的 user_loader 在每个 Dash 回调请求中都会执行，
+    缓存命中时不再访问数据库。
+
+    特性:
+    - 缓存键: (user_id, session_token)，重新登录后旧 token 自然失效
+    - TTL 过期 + LRU 淘汰，限制内存占用
+    - 按用户失效 / 全量失效，供角色权限、用户信息、登出等写操作调用
+    - 失效代数(generation)保护: 加载过程中发生失效时，旧数据不会被写回缓存
+
+    注意:
+        缓存对象会被多个请求线程共享，缓存的主体不能持有数据库会话等请求级资源。
+    """
+
+    def __init__(self, max_size: int, ttl: float, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._user_keys: dict[int, set[tuple]] = {}
+        self._generations: dict[int, int] = {}
+        self._global_generation = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _generation(self, user_id: int) -> tuple[int, int]:
+        return self._global_generation, self._generations.get(user_id, 0)
+
+    def get(self, user_id: int, session_token: Hashable) -> Any | None:
+        """获取缓存的用户主体，未命中或已过期返回 None"""
+        if not self.enabled:
+            return None
+        key = (user_id, session_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expire_at, principal = entry
+            if expire_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def set(self, user_id: int, session_token: Hashable, principal: Any):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if not self.enabled or principal is None:
+            return
+        key = (user_id, session_token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def get_or_load(
+        self, user_id: int, session_token: Hashable, loader: Callable[[], Any]
+    ) -> Any:
+        """
+        获取用户主体，未命中时调用 loader 加载并写入缓存
+
+        Args:
+            user_id: 用户ID
+            session_token: 当前请求携带的会话token
+            loader: 无参加载函数，返回 LoginUser 或 None
+
+        Returns:
+            用户主体对象或 None
+        """
+        principal = self.get(user_id, session_token)
+        if principal is not None:
+            return principal
+        with self._lock:
+            generation = self._generation(user_id)
+        principal = loader()
+        with self._lock:
+            # 加载期间发生过失效，本次结果可能是旧数据，仅返回不缓存
+            if generation == self._generation(user_id):
+                self.set(user_id, session_token, principal)
+        return principal
+
+    def _remove(self, key: tuple):
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._user_keys.pop(key[0], None)
+
+    def invalidate_user(self, *user_ids: int):
+        """失效指定用户的所有缓存条目(包括该用户所有 session_token)"""
+        with self._lock:
+            for user_id in user_ids:
+                user_id = int(user_id)
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+                for key in list(self._user_keys.get(user_id, ())):
+                    self._remove(key)
+
+    def invalidate_after_commit(self, db: Session, *user_ids: int):
+        """
+        立即失效，并在数据库会话提交后再次失效
+
+        写操作在事务提交前，其他请求仍可能读到旧数据并重新写入缓存，
+        提交后的二次失效保证缓存最终与数据库一致。
+        """
+        self.invalidate_user(*user_ids)
+        event.listen(
+            db, "after_commit", lambda session: self.invalidate_user(*user_ids), once=True
+        )
+
+    def clear(self):
+        """清空所有缓存条目(角色权限等影响多个用户的变更时调用)"""
+        with self._lock:
+            self._global_generation += 1
+            self._entries.clear()
+            self._user_keys.clear()
+            self._generations.clear()
+
+    def clear_after_commit(self, db: Session):
+        """立即清空，并在数据库会话提交后再次清空"""
+        self.clear()
+        event.listen(db, "after_commit", lambda session: self.clear(), once=True)
+
+    def get_status(self) -> dict:
+        """获取缓存状态"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 创建全局缓存实例
+principal_cache = PrincipalCache(
+    max_size=BaseConfig.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=BaseConfig.PRINCIPAL_CACHE_TTL,
+    enabled=BaseConfig.PRINCIPAL_CACHE_ENABLED,
+)
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from ..public.enum import OperationType
 from models.system.service import UserService
+from tools.cache import role_permission_cache, permission_index
 
 
 class LoginUser(UserMixin):
@@ -19,12 +20,14 @@ class LoginUser(UserMixin):
         self.data_scope_type = None
         self.session_token = None
         self.dept_id = None
-        self.user = None
+        self.permission_mask = 0
         self.avatar = None
 
     def _load(self, db: Session, user_id: int):
         """
         加载用户数据到当前实例中
+
+        实例会被 principal_cache 跨请求共享，只保存纯数据，不持有数据库会话
         """
 
         user_service = UserService(db, user_id)
@@ -43,7 +46,10 @@ class LoginUser(UserMixin):
         self.is_admin = is_admin
         self.session_token = user.session_token
         self.dept_id = user.dept_id
-        self.user = UserService(db, user_id)
+        # 角色权限合并为位掩码
+        self.permission_mask = role_permission_cache.get_mask(
+            db, (role.id for role in roles)
+        )
         self.avatar = user.avatar
         self.data_scope_type = data_scope_type
 
@@ -60,10 +66,10 @@ class LoginUser(UserMixin):
         """
         if self.is_admin:
             return True
-        if self.user:
-            return self.user.check_permission(
-                permission_tag=permission_tag, raise_exception=raise_exception
-            )
+        if self.permission_mask & permission_index.bit_of(permission_tag):
+            return True
+        if raise_exception:
+            raise PermissionError(f"缺少权限: {permission_tag}")
         return False
 
     @classmethod
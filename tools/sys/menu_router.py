@@ -2,6 +2,7 @@ from typing import List, Dict, Any
 from importlib import import_module
 
 from ..public.enum import PageType
+from ..sys_log.tracing import tracer
 
 
 class RouteFactory:
@@ -260,7 +261,8 @@ class RouteFactory:
         try:
             view_func = self._resolve_view_function(view_str)
             if view_func:
-                return view_func(*args, **kwargs)
+                with tracer.span(f"render {path}", kind="render", view=view_str):
+                    return view_func(*args, **kwargs)
             else:
                 return self._get_error_response(
                     "404 - 页面未找到，请检查是否有 render 函数。"
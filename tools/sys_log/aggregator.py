@@ -0,0 +1,243 @@
+"""
+日志汇聚进程
+
+多进程部署(多个 gunicorn worker)时，每个 worker 各自创建数据库日志处理器、写入线程和数据库连接池，
+连接数和写入开销随 worker 数成倍增加。开启 LOG_AGGREGATOR_ENABLED 后:
+
+- worker: 文件和数据库处理器替换为 AggregatorQueueHandler，日志在请求线程中组装好结构化字段后放入内存队列，
+  由 QueueListener 后台线程经本地套接字发送给汇聚进程，不占用请求线程，也不创建日志数据库连接
+- 汇聚进程: 唯一持有文件处理器和数据库处理器，按处理器级别分发日志，由数据库处理器统一批量写入
+
+日志记录以 pickle 传输(同标准库 SocketHandler)，汇聚进程只应监听本机 Unix 套接字或 127.0.0.1。
+
+用法(先于应用启动):
+    python -m tools.sys_log.aggregator
+    python -m tools.sys_log.aggregator --address 127.0.0.1:9020
+"""
+
+import argparse
+import copy
+import logging
+import os
+import pickle
+import queue
+import re
+import signal
+import socketserver
+import struct
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, SocketHandler
+
+from config.base_config import BaseConfig
+from .json_formatter import StructuredFormatter
+
+# 传输的日志记录属性，其余附加属性已组装在结构化字段中
+_RECORD_ATTRS = (
+    "name",
+    "msg",
+    "levelname",
+    "levelno",
+    "pathname",
+    "filename",
+    "module",
+    "lineno",
+    "funcName",
+    "created",
+    "msecs",
+    "relativeCreated",
+    "thread",
+    "threadName",
+    "processName",
+    "process",
+    "exc_text",
+    "stack_info",
+    StructuredFormatter._FIELDS_ATTR,
+)
+
+
+def parse_address(address: str) -> tuple[str, int | None]:
+    """汇聚进程地址 -> (host, port)，Unix 套接字返回 (路径, None)"""
+    matched = re.fullmatch(r"([\w.\-]+):(\d+)", address)
+    if matched:
+        return matched.group(1), int(matched.group(2))
+    return address, None
+
+
+class AggregatorSocketHandler(SocketHandler):
+    """
+    把日志记录发送给汇聚进程
+
+    只传输标准属性和结构化字段，不传输格式化缓存和不可序列化的附加属性；
+    汇聚进程不可用时丢弃日志并计数，按标准库 SocketHandler 的退避间隔重连
+    """
+
+    def __init__(self, address: str):
+        super().__init__(*parse_address(address))
+        self.dropped = 0
+
+    def makePickle(self, record: logging.LogRecord) -> bytes:
+        data = {name: record.__dict__[name] for name in _RECORD_ATTRS if name in record.__dict__}
+        payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        return struct.pack(">L", len(payload)) + payload
+
+    def send(self, s: bytes):
+        super().send(s)
+        if self.sock is None:
+            self.dropped += 1
+
+
+class AggregatorQueueHandler(QueueHandler):
+    """
+    worker 端日志处理器: 在调用线程中组装结构化字段后放入有界队列，由 QueueListener 发送给汇聚进程
+
+    队列满(汇聚进程处理不过来)时丢弃并计数，不阻塞调用线程
+    """
+
+    def __init__(self, address: str, max_size: int = 0):
+        super().__init__(queue.Queue(max_size))
+        self.socket_handler = AggregatorSocketHandler(address)
+        self.listener = QueueListener(self.queue, self.socket_handler)
+        self.dropped = 0
+        self._closed = False
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """组装结构化字段和异常文本，消息参数和异常对象不进入队列"""
+        formatter = self.formatter if isinstance(self.formatter, StructuredFormatter) else StructuredFormatter()
+        formatter.fields(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def get_status(self) -> dict:
+        """队列长度和丢弃数(队列满 + 汇聚进程不可用)"""
+        return {
+            "queue_size": self.queue.qsize(),
+            "dropped": self.dropped + self.socket_handler.dropped,
+        }
+
+    def close(self):
+        """发送队列中剩余的日志后关闭"""
+        if not self._closed:
+            self._closed = True
+            self.listener.stop()
+            self.socket_handler.close()
+        super().close()
+
+
+class _RecordStreamHandler(socketserver.StreamRequestHandler):
+    """读取一个 worker 连接上的日志记录(4 字节长度 + pickle)并分发"""
+
+    def handle(self):
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                return
+            length = struct.unpack(">L", header)[0]
+            payload = self.rfile.read(length)
+            if len(payload) < length:
+                return
+            self.server.aggregator.dispatch(logging.makeLogRecord(pickle.loads(payload)))
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+else:  # Windows 不支持 Unix 套接字，只能监听 host:port
+    _UnixServer = None
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LogAggregator:
+    """
+    日志汇聚服务: 每个 worker 连接一个线程，收到的日志按处理器级别分发给文件和数据库处理器
+
+    Args:
+        address: 监听地址，Unix 套接字路径或 host:port
+        handlers: 日志处理器
+    """
+
+    def __init__(self, address: str, handlers: list[logging.Handler]):
+        self.address = address
+        self.handlers = handlers
+        host, port = parse_address(address)
+        if port is None:
+            if _UnixServer is None:
+                raise ValueError(f"当前系统不支持 Unix 套接字，请使用 host:port 地址: {address}")
+            if os.path.exists(host):
+                os.remove(host)
+            self.server = _UnixServer(host, _RecordStreamHandler)
+            os.chmod(host, 0o660)
+        else:
+            self.server = _TCPServer((host, port), _RecordStreamHandler)
+        self.server.aggregator = self
+
+    def dispatch(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """停止接收，关闭处理器(数据库处理器写入剩余日志)"""
+        self.server.shutdown()
+        self.server.server_close()
+        host, port = parse_address(self.address)
+        if port is None and os.path.exists(host):
+            os.remove(host)
+        for handler in self.handlers:
+            handler.close()
+
+
+def main():
+    from .logconfig import _create_db_handler, _create_file_handler
+
+    parser = argparse.ArgumentParser(description="日志汇聚进程")
+    parser.add_argument("--address", default=BaseConfig.LOG_AGGREGATOR_ADDRESS, help="监听地址，Unix 套接字路径或 host:port")
+    args = parser.parse_args()
+
+    formatter = StructuredFormatter()
+    handlers = []
+    if getattr(BaseConfig, "LOG_TO_FILE", True):
+        handlers.append(_create_file_handler(formatter))
+    if getattr(BaseConfig, "LOG_TO_DB", False):
+        db_handler = _create_db_handler()
+        db_handler.setFormatter(formatter)
+        handlers.append(db_handler)
+    if not handlers:
+        sys.exit("LOG_TO_FILE 和 LOG_TO_DB 均未开启，无需启动日志汇聚进程")
+
+    aggregator = LogAggregator(args.address, handlers)
+    # serve_forever 所在线程不能调用 shutdown，收到信号时在新线程中停止
+    stop = lambda signum, frame: threading.Thread(target=aggregator.server.shutdown).start()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"日志汇聚进程已启动: {args.address}, 处理器: {', '.join(type(h).__name__ for h in handlers)}")
+    try:
+        aggregator.serve_forever()
+    finally:
+        aggregator.shutdown()
+        print("日志汇聚进程已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import logging
 import sys
-import queue
 import time
 import threading
 from datetime import datetime
@@ -15,26 +14,40 @@ from config.base_config import DB_Config, BaseConfig
 from contextlib import contextmanager
 
 
-from tools.public.enum import LogModule, OperationType  # 导入枚举类
+from .log_buffer import LogBuffer, create_policy
+from .json_formatter import StructuredFormatter
 
-# 使用配置中的数据库 URL，但可单独配置为其他数据库
-engine = create_engine(DB_Config.URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine)
+# 未设置结构化格式化器时用于组装数据库条目字段
+_fields_formatter = StructuredFormatter()
+
+# 日志写入使用独立的数据库连接池，首次写入时创建:
+# 未启用数据库日志或由汇聚进程统一写入(LOG_AGGREGATOR_ENABLED)时，worker 不会创建连接池
+_session_factory = None
+_session_factory_lock = threading.Lock()
+
+
+def get_log_session_factory() -> sessionmaker:
+    """日志写入的会话工厂，使用配置中的数据库 URL，但可单独配置为其他数据库"""
+    global _session_factory
+    if _session_factory is None:
+        with _session_factory_lock:
+            if _session_factory is None:
+                engine = create_engine(DB_Config.URL, pool_pre_ping=True)
+                _session_factory = sessionmaker(bind=engine)
+    return _session_factory
 
 
 @contextmanager
 def get_log_db():
     """数据库会话上下文管理器，确保连接自动关闭"""
-    db = SessionLocal()
+    db = get_log_session_factory()()
     try:
-        print("日志数据库连接")
         yield db
         db.commit()
     except Exception as e:
         db.rollback()
         raise
     finally:
-        print("日志数据库关闭连接")
         db.close()
 
 
@@ -54,85 +67,119 @@ class DatabaseLogHandler(logging.Handler):
         super().__init__(level=level)
         self.batch_size = batch_size
         self.flush_interval = flush_interval
-        self.log_queue = queue.Queue(maxsize=BaseConfig.LOG_QUEUE_MAX_SIZE)
+        # 有界缓冲区，写入永不阻塞，满载时按 LOG_BACKPRESSURE_POLICY 处理
+        self.buffer = LogBuffer(
+            max_size=BaseConfig.LOG_QUEUE_MAX_SIZE,
+            policy=create_policy(
+                getattr(BaseConfig, "LOG_BACKPRESSURE_POLICY", "drop_oldest"), BaseConfig
+            ),
+        )
         self._closed = False
+        # 写入失败的批次单独保留重试，不放回缓冲区
+        self._retry_batch: List[Dict[str, Any]] = []
         self.retry_count = 0
+        self._next_retry_time = 0.0
         self.log_to_db = BaseConfig.LOG_TO_DB  # 添加配置检查
+        # 写入线程唤醒事件: 缓冲区达到批量阈值或关闭时触发
+        self._wakeup = threading.Event()
+        self.flush_thread = None
         # 仅在启用数据库日志时启动线程
         if self.log_to_db:
             self.flush_thread = threading.Thread(target=self._flush_worker, daemon=True)
             self.flush_thread.start()
 
     def emit(self, record):
-        print("当前列队数量：",self.log_queue.qsize())
         if not sys.is_finalizing() and not self._closed:
             try:
                 # 转换为可序列化的字典
                 log_entry = self._convert_record(record)
-                self.log_queue.put(log_entry)
+                self.buffer.put(log_entry, record.levelno)
+                if len(self.buffer) >= self.batch_size:
+                    self._wakeup.set()
             except Exception as e:
                 self.handleError(record)
 
     def _convert_record(self, record) -> Dict[str, Any]:
-        """转换日志记录为数据库条目格式，处理枚举值"""
-        # 处理枚举值
-        logmodule = getattr(record, 'logmodule', LogModule.CUSTOM)
-        operation = getattr(record, 'operation', OperationType.CUSTOM)
-        return {
-            "log_level": record.levelname,
-            "message": record.getMessage(),
-            "status": getattr(record, "status", "成功"),
-            "duration_ms": getattr(record, "duration_ms", 0),
-            "description": dict(getattr(record, "description", {})),
-            "user_id": getattr(record, "user", "anonymous"),
-            "ip": getattr(record, "ip", "unknown"),
-            "logmodule": logmodule.code,
-            "operation": operation.code,
-            # 优化组合字段
-            "logmodule_operation": f"{logmodule.description}-{operation.description}",
-        }
+        """
+        转换日志记录为数据库条目格式
+
+        字段由结构化格式化器组装，与控制台、文件处理器共用同一个格式化器时直接复用已组装的字段
+        """
+        formatter = self.formatter if isinstance(self.formatter, StructuredFormatter) else _fields_formatter
+        return dict(formatter.fields(record))
 
     def _flush_worker(self):
-        """后台线程：定时批量写入日志"""
-        while not self._closed and self.log_to_db:  # 添加配置检查
-            time.sleep(self.flush_interval)
-            self._batch_write()
-
-    # @retry(
-    #     stop=stop_after_attempt(BaseConfig.LOG_DB_RETRY_MAX),
-    #     wait=wait_exponential(multiplier=1, min=1, max=10),
-    # )
+        """
+        后台线程：缓冲区达到批量阈值或刷新间隔到期(先到者)时唤醒，
+        每次唤醒连续写入直到缓冲区为空；关闭时写入剩余日志后退出
+        """
+        while not self._closed:
+            timeout = self.flush_interval
+            if self._retry_batch:
+                # 等待重试退避到期
+                timeout = min(timeout, max(0.0, self._next_retry_time - time.monotonic()))
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            self._drain()
+        self._drain(final=True)
+
+    def _drain(self, final: bool = False):
+        """
+        连续批量写入直到缓冲区为空，写入失败时等待下次唤醒重试
+
+        final 为 True 时(关闭)忽略重试退避，剩余写入失败的日志全部写入应急文件
+        """
+        while True:
+            if final and self._retry_batch:
+                self._next_retry_time = 0.0
+            if not self._batch_write():
+                break
+        if final:
+            remaining = self._retry_batch + self.buffer.get_batch(len(self.buffer))
+            if remaining:
+                self._write_to_emergency_file(remaining, RuntimeError("日志处理器关闭时未能写入数据库"))
+            self._retry_batch = []
+
     def _batch_write(self):
-        """批量写入日志到数据库，带有限重试机制"""
-        if self.log_queue.empty():
-            return
+        """
+        批量写入日志到数据库，带有限重试机制
 
-        batch: List[Dict[str, Any]] = []
-        try:
-            while len(batch) < self.batch_size and not self.log_queue.empty():
-                batch.append(self.log_queue.get_nowait())
+        写入失败的批次保留在重试区，按指数退避重试，期间新日志继续进入缓冲区；
+        超过最大重试次数后写入本地应急文件
 
+        返回:
+            bool: 是否处理了一个批次(写入成功或转入应急文件)，
+                  缓冲区为空、退避未到期或写入失败待重试时返回 False
+        """
+        if self._retry_batch:
+            if time.monotonic() < self._next_retry_time:
+                return False
+            batch = self._retry_batch
+        else:
+            self.buffer.recover()
+            batch = self.buffer.get_batch(self.batch_size)
             if not batch:
-                return
+                return False
 
+        try:
             with get_log_db() as db:
                 log_service = LogService(db)
                 log_service.batch_create_logs(batch)
-
         except Exception as e:
             # 有限重试机制
             if self.retry_count < BaseConfig.LOG_DB_RETRY_MAX:
                 self.retry_count += 1
-                time.sleep(BaseConfig.LOG_DB_RETRY_DELAY * (2 **(self.retry_count - 1)))  # 指数退避
-                self.log_queue.put(batch)
-                return
+                self._retry_batch = batch
+                self._next_retry_time = time.monotonic() + BaseConfig.LOG_DB_RETRY_DELAY * (
+                    2 ** (self.retry_count - 1)
+                )  # 指数退避
+                return False
 
             # 重试失败后写入本地应急文件
             self._write_to_emergency_file(batch, e)
-            self.retry_count = 0  # 重置重试计数器
-        else:
-            for _ in batch:
-                self.log_queue.task_done()
+        self._retry_batch = []
+        self.retry_count = 0  # 重置重试计数器
+        return True
 
     def _write_to_emergency_file(self, batch: list[dict], error: Exception):
         """写入应急日志文件，防止数据丢失"""
@@ -140,7 +187,7 @@ class DatabaseLogHandler(logging.Handler):
         if not emergency_path.exists():
             emergency_path.mkdir(parents=True, exist_ok=True)
 
-        filename = f"emergency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        filename = f"emergency_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.log"
         with open(emergency_path / filename, 'w', encoding='utf-8') as f:
             json.dump({
                 'timestamp': datetime.now().isoformat(),
@@ -150,21 +197,24 @@ class DatabaseLogHandler(logging.Handler):
             }, f, ensure_ascii=False, indent=2)
 
     def get_queue_status(self):
-        """获取队列状态"""
-
-        return {
-            "current_size": self.log_queue.qsize(),
-            "max_size": self.log_queue.maxsize,
-            "is_full": self.log_queue.full(),
-            
-        }
+        """获取队列状态，包含按原因统计的丢弃数和待重试条数"""
+        status = self.buffer.get_status()
+        status["retry_pending"] = len(self._retry_batch)
+        status["retry_count"] = self.retry_count
+        return status
 
     def close(self):
-        """关闭处理器，确保所有日志都被写入"""
+        """
+        关闭处理器，写入剩余日志
+
+        唤醒写入线程并等待其写完退出(最长 LOG_DB_CLOSE_TIMEOUT 秒)，
+        不使用 queue.join，写入线程异常退出时也不会永久阻塞
+        """
         if not self._closed:
             self._closed = True
-            # 等待队列处理完成
-            self.log_queue.join()
-            # 最后一次批量写入
-            self._batch_write()
+            self._wakeup.set()
+            if self.flush_thread is not None and self.flush_thread.is_alive():
+                self.flush_thread.join(getattr(BaseConfig, "LOG_DB_CLOSE_TIMEOUT", 10.0))
+            else:
+                self._drain(final=True)
         super().close()
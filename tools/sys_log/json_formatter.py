@@ -0,0 +1,101 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from ..public.enum import LogModule, OperationType
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+
+def _dumps_orjson(data: dict) -> str:
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _dumps_json(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+# JSON 编码函数，优先使用 orjson
+dumps = _dumps_orjson if orjson is not None else _dumps_json
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    结构化 JSON 日志格式化器
+
+    - 直接序列化日志记录的字段，不再拼接 JSON 形式的格式字符串，
+      消息中的引号、换行不会破坏 JSON，description 按 JSON 对象输出而不是 dict repr
+    - 字段顺序固定为 FIELDS，与 sys_logs 表字段同名
+    - 控制台、文件、数据库处理器共用同一个实例: 字段字典和 JSON 文本缓存在日志记录上，
+      每条日志只组装和序列化一次，数据库处理器直接使用字段字典
+    """
+
+    FIELDS = (
+        "timestamp",
+        "log_level",
+        "message",
+        "logmodule",
+        "operation",
+        "logmodule_operation",
+        "status",
+        "duration_ms",
+        "user_id",
+        "ip",
+        "description",
+    )
+    # 缓存在 LogRecord 上的属性名
+    _FIELDS_ATTR = "_structured_fields"
+    _TEXT_ATTR = "_structured_text"
+
+    def fields(self, record: logging.LogRecord) -> dict[str, Any]:
+        """
+        日志记录的结构化字段(按 FIELDS 顺序)，枚举转换为编码，timestamp 为日志产生时间
+
+        同一条日志记录只组装一次，调用方不能修改返回的字典
+        """
+        cached = record.__dict__.get(self._FIELDS_ATTR)
+        if cached is not None:
+            return cached
+        logmodule = getattr(record, "logmodule", LogModule.CUSTOM)
+        operation = getattr(record, "operation", OperationType.CUSTOM)
+        if isinstance(logmodule, LogModule) and isinstance(operation, OperationType):
+            logmodule_operation = f"{logmodule.description}-{operation.description}"
+            logmodule, operation = logmodule.code, operation.code
+        else:
+            logmodule_operation = getattr(record, "logmodule_operation", f"{logmodule}-{operation}")
+        fields = {
+            "timestamp": datetime.fromtimestamp(record.created),
+            "log_level": record.levelname,
+            "message": record.getMessage(),
+            "logmodule": logmodule,
+            "operation": operation,
+            "logmodule_operation": logmodule_operation,
+            "status": getattr(record, "status", "成功"),
+            "duration_ms": getattr(record, "duration_ms", 0),
+            "user_id": getattr(record, "user", "anonymous"),
+            "ip": getattr(record, "ip", "unknown"),
+            "description": dict(getattr(record, "description", None) or {}),
+        }
+        record.__dict__[self._FIELDS_ATTR] = fields
+        return fields
+
+    def format(self, record: logging.LogRecord) -> str:
+        """序列化为单行 JSON，同一条日志记录只序列化一次"""
+        cached = record.__dict__.get(self._TEXT_ATTR)
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        data = dict(self.fields(record))
+        data["timestamp"] = self.formatTime(record, self.datefmt)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        text = dumps(data)
+        record.__dict__[self._TEXT_ATTR] = (self, text)
+        return text
@@ -0,0 +1,220 @@
+import os
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+LogEntry = dict[str, Any]
+
+
+class BackpressurePolicy(ABC):
+    """
+    背压策略接口
+
+    缓冲区达到上限(或高水位)时决定新日志的去留，
+    在缓冲区锁内调用，实现类不能阻塞等待。
+    """
+
+    name = ""
+
+    @abstractmethod
+    def offer(
+        self, items: deque, max_size: int, entry: LogEntry, levelno: int
+    ) -> str | None:
+        """
+        尝试放入日志
+
+        返回:
+            str | None: 丢弃原因，None 表示没有日志被丢弃
+        """
+
+    def recover(self, buffer: "LogBuffer"):
+        """缓冲区空闲时回收暂存数据，默认无操作"""
+
+
+class DropOldestPolicy(BackpressurePolicy):
+    """缓冲区满时丢弃最早的日志，保留最新的日志"""
+
+    name = "drop_oldest"
+
+    def offer(self, items, max_size, entry, levelno):
+        reason = None
+        if len(items) >= max_size:
+            items.popleft()
+            reason = "drop_oldest"
+        items.append(entry)
+        return reason
+
+
+class DropBelowLevelPolicy(BackpressurePolicy):
+    """
+    超过高水位后只接收 min_level 及以上级别的日志，
+    缓冲区满时丢弃最早的日志
+    """
+
+    name = "drop_below_level"
+
+    def __init__(self, min_level: int, high_water: float):
+        self.min_level = min_level
+        self.high_water = high_water
+
+    def offer(self, items, max_size, entry, levelno):
+        if levelno < self.min_level and len(items) >= max_size * self.high_water:
+            return "below_level"
+        reason = None
+        if len(items) >= max_size:
+            items.popleft()
+            reason = "drop_oldest"
+        items.append(entry)
+        return reason
+
+
+class SamplePolicy(BackpressurePolicy):
+    """超过高水位后每 rate 条日志只保留 1 条，缓冲区满时丢弃新日志"""
+
+    name = "sample"
+
+    def __init__(self, rate: int, high_water: float):
+        self.rate = max(1, int(rate))
+        self.high_water = high_water
+        self._seen = 0
+
+    def offer(self, items, max_size, entry, levelno):
+        if len(items) >= max_size * self.high_water:
+            self._seen += 1
+            if self._seen % self.rate:
+                return "sampled"
+        if len(items) >= max_size:
+            return "full"
+        items.append(entry)
+        return None
+
+
+class SpillToDiskPolicy(BackpressurePolicy):
+    """
+    缓冲区满时把新日志追加写入本地 JSON Lines 文件，不丢弃；
+    缓冲区空闲后由写入线程调用 recover 读回
+    """
+
+    name = "spill"
+
+    def __init__(self, spill_path: str):
+        self.spill_dir = Path(spill_path)
+        self.spill_file = self.spill_dir / f"spill_{os.getpid()}.jsonl"
+        self.spilled = 0
+        self._file_lock = threading.Lock()
+
+    def offer(self, items, max_size, entry, levelno):
+        if len(items) < max_size:
+            items.append(entry)
+            return None
+        try:
+            with self._file_lock:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self.spilled += 1
+            return None
+        except OSError:
+            return "spill_failed"
+
+    def recover(self, buffer: "LogBuffer"):
+        """缓冲区低于一半时读回暂存文件，读回过程中再次写满会重新暂存"""
+        if len(buffer) >= buffer.max_size // 2:
+            return
+        with self._file_lock:
+            if not self.spill_file.exists():
+                return
+            recovering = self.spill_file.with_suffix(".recovering")
+            self.spill_file.replace(recovering)
+        with open(recovering, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    # 暂存时日期按字符串写入，读回时还原
+                    if isinstance(entry.get("timestamp"), str):
+                        entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+                    buffer.put(entry, logging.NOTSET)
+        recovering.unlink()
+
+
+class LogBuffer:
+    """
+    有界日志缓冲区
+
+    put 永不阻塞，缓冲区压力由背压策略处理，丢弃数按原因分别计数，
+    保证请求线程的耗时与日志数据库的健康状况无关
+    """
+
+    def __init__(self, max_size: int, policy: BackpressurePolicy):
+        self.max_size = max_size
+        self.policy = policy
+        self._items: deque[LogEntry] = deque()
+        self._lock = threading.Lock()
+        self.dropped: dict[str, int] = {}
+
+    def put(self, entry: LogEntry, levelno: int) -> bool:
+        """放入日志，返回是否有日志被丢弃"""
+        with self._lock:
+            reason = self.policy.offer(self._items, self.max_size, entry, levelno)
+            if reason is not None:
+                self.dropped[reason] = self.dropped.get(reason, 0) + 1
+        return reason is not None
+
+    def get_batch(self, size: int) -> list[LogEntry]:
+        """取出最多 size 条日志"""
+        with self._lock:
+            count = min(size, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+    def recover(self):
+        """回收策略暂存的数据"""
+        self.policy.recover(self)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_status(self) -> dict:
+        """获取缓冲区状态"""
+        with self._lock:
+            status = {
+                "current_size": len(self._items),
+                "max_size": self.max_size,
+                "is_full": len(self._items) >= self.max_size,
+                "policy": self.policy.name,
+                "dropped": dict(self.dropped),
+                "dropped_total": sum(self.dropped.values()),
+            }
+        if isinstance(self.policy, SpillToDiskPolicy):
+            status["spilled"] = self.policy.spilled
+        return status
+
+
+# 可用的背压策略
+BACKPRESSURE_POLICIES: dict[str, type[BackpressurePolicy]] = {
+    DropOldestPolicy.name: DropOldestPolicy,
+    DropBelowLevelPolicy.name: DropBelowLevelPolicy,
+    SamplePolicy.name: SamplePolicy,
+    SpillToDiskPolicy.name: SpillToDiskPolicy,
+}
+
+
+def create_policy(name: str, config) -> BackpressurePolicy:
+    """根据配置创建背压策略"""
+    if name not in BACKPRESSURE_POLICIES:
+        raise ValueError(f"未知的日志背压策略: {name}")
+    high_water = getattr(config, "LOG_BACKPRESSURE_HIGH_WATER", 0.8)
+    if name == DropBelowLevelPolicy.name:
+        min_level = logging.getLevelName(
+            getattr(config, "LOG_BACKPRESSURE_MIN_LEVEL", "WARNING").upper()
+        )
+        return DropBelowLevelPolicy(min_level, high_water)
+    if name == SamplePolicy.name:
+        return SamplePolicy(getattr(config, "LOG_BACKPRESSURE_SAMPLE_RATE", 10), high_water)
+    if name == SpillToDiskPolicy.name:
+        return SpillToDiskPolicy(getattr(config, "LOG_SPILL_PATH", "logs/spill"))
+    return BACKPRESSURE_POLICIES[name]()
@@ -0,0 +1,42 @@
+"""
+数据库日志保留任务
+
+按 LOG_RETENTION_DAYS 清理过期日志: 过期分区表整表归档后删除，
+sys_logs 历史表中的过期行归档后删除，归档方式见 LOG_RETENTION_MODE，
+同时清理对应的日志全文索引。
+
+用法(建议由 cron 等每天执行一次):
+    python -m tools.sys_log.log_retention
+    python -m tools.sys_log.log_retention --days 90 --mode drop
+"""
+
+import argparse
+
+from config.base_config import BaseConfig
+from models.base import engine
+from models.system.syslog.log_partition import LogRetention
+from models.system.syslog.log_search import log_search_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据库日志保留任务")
+    parser.add_argument("--days", type=int, default=BaseConfig.LOG_RETENTION_DAYS, help="日志保留天数")
+    parser.add_argument("--mode", choices=LogRetention.MODES, default=BaseConfig.LOG_RETENTION_MODE, help="过期日志处理方式")
+    parser.add_argument("--archive-path", default=BaseConfig.LOG_ARCHIVE_PATH, help="归档目录")
+    args = parser.parse_args()
+
+    retention = LogRetention(
+        engine,
+        retention_days=args.days,
+        mode=args.mode,
+        archive_path=args.archive_path,
+        search_backend=log_search_backend,
+    )
+    report = retention.run()
+    for table_name, count in report.items():
+        print(f"{table_name}: 清理 {count} 条")
+    print(f"保留期限: {retention.cutoff():%Y-%m-%d %H:%M:%S}, 共清理 {sum(report.values())} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,17 @@ import logging
 import os
 import sys
 from pathlib import Path
-from logging.handlers import TimedRotatingFileHandler
 from typing import  Any
 
 # 注册退出钩子
 import atexit
 
-# 导入 SafeFormatter 支持默认字段填充
-from .logger import SafeFormatter, dash_logger
+from .logger import dash_logger
+from .json_formatter import StructuredFormatter
+from .rotating_handler import SizeTimedRotatingFileHandler
 from config.base_config import BaseConfig
 from .db_log_handler import DatabaseLogHandler
+from .aggregator import AggregatorQueueHandler
 
 
 def setup_logging(app) -> None:
@@ -36,20 +37,8 @@ def setup_logging(app) -> None:
         log_dir = Path(app.root_path) / "logs"
         _ensure_directory(log_dir)
 
-        # 构建统一的结构化日志格式
-        formatter = SafeFormatter(
-            "{"
-            '"timestamp": "%(asctime)s", '
-            '"level": "%(levelname)s", '
-            '"message": "%(message)s", '
-            '"logmodule": "%(logmodule)s", '
-            '"operation": "%(operation)s", '
-            '"status": "%(status)s", '
-            '"duration_ms": %(duration_ms)d, '
-            '"logmodule_operation": "%(logmodule_operation)s", '
-            '"description": %(description)s, '
-            "}"
-        )
+        # 构建统一的结构化日志格式化器，控制台、文件、数据库处理器共用，每条日志只序列化一次
+        formatter = StructuredFormatter()
 
         # 获取并配置日志器
         root_logger = logging.getLogger()
@@ -133,6 +122,20 @@ def _configure_logger(
                 f"控制台日志处理器已初始化，级别: {BaseConfig.LOG_LEVEL}"
             )
 
+    # 汇聚模式: 文件和数据库日志发送给汇聚进程统一写入
+    if getattr(BaseConfig, "LOG_AGGREGATOR_ENABLED", False):
+        try:
+            aggregator_handler = _create_aggregator_handler(formatter)
+            if aggregator_handler is not None:
+                flask_logger.addHandler(aggregator_handler)
+                root_logger.addHandler(aggregator_handler)
+                flask_logger.info(
+                    f"日志汇聚处理器已初始化，地址: {BaseConfig.LOG_AGGREGATOR_ADDRESS}"
+                )
+        except Exception as e:
+            flask_logger.error(f"日志汇聚处理器创建失败: {str(e)}")
+        return
+
     # 配置文件处理器
     if getattr(BaseConfig, "LOG_TO_FILE", True):
         try:
@@ -172,9 +175,9 @@ def _create_console_handler(formatter: logging.Formatter) -> logging.StreamHandl
     return console_handler
 
 
-def _create_file_handler(formatter: logging.Formatter) -> TimedRotatingFileHandler:
+def _create_file_handler(formatter: logging.Formatter) -> SizeTimedRotatingFileHandler:
     """
-    创建文件日志处理器，支持自动轮转
+    创建文件日志处理器，按大小或时间轮转，轮转文件在后台线程压缩
     :param formatter: 日志格式化器
     :return: 配置好的文件处理器
     """
@@ -186,14 +189,20 @@ def _create_file_handler(formatter: logging.Formatter) -> TimedRotatingFileHandl
     when = getattr(BaseConfig, "LOG_ROTATE_WHEN", "midnight")
     interval = getattr(BaseConfig, "LOG_ROTATE_INTERVAL", 1)
     backup_count = getattr(BaseConfig, "LOG_FILE_BACKUP_COUNT", 30)
+    max_bytes = getattr(BaseConfig, "LOG_FILE_MAX_BYTES", 0)
+    compress = getattr(BaseConfig, "LOG_FILE_COMPRESS", True)
+    per_process = getattr(BaseConfig, "LOG_FILE_PER_PROCESS", False)
     encoding = getattr(BaseConfig, "LOG_FILE_ENCODING", "utf-8")
     delay = getattr(BaseConfig, "LOG_FILE_DELAY", False)
 
-    file_handler = TimedRotatingFileHandler(
+    file_handler = SizeTimedRotatingFileHandler(
         log_file_path,
         when=when,
         interval=interval,
-        backupCount=backup_count,
+        backup_count=backup_count,
+        max_bytes=max_bytes,
+        compress=compress,
+        per_process=per_process,
         encoding=encoding,
         delay=delay,
     )
@@ -202,12 +211,32 @@ def _create_file_handler(formatter: logging.Formatter) -> TimedRotatingFileHandl
     file_level = getattr(BaseConfig, "LOG_FILE_LEVEL", "INFO").upper()
     file_handler.setLevel(logging.getLevelName(file_level))
     file_handler.setFormatter(formatter)
-
-    # 添加日志轮转后缀格式
-    file_handler.suffix = "%Y-%m-%d.log"
     return file_handler
 
 
+def _create_aggregator_handler(formatter: logging.Formatter) -> AggregatorQueueHandler | None:
+    """
+    创建日志汇聚处理器，级别取文件和数据库日志中较低的级别，汇聚进程再按各自级别过滤
+    :param formatter: 日志格式化器
+    :return: 配置好的汇聚处理器，文件和数据库日志均未开启时返回 None
+    """
+    levels = []
+    if getattr(BaseConfig, "LOG_TO_FILE", True):
+        levels.append(getattr(BaseConfig, "LOG_FILE_LEVEL", "INFO"))
+    if getattr(BaseConfig, "LOG_TO_DB", False):
+        levels.append(getattr(BaseConfig, "LOG_DB_LEVEL", "INFO"))
+    if not levels:
+        return None
+
+    aggregator_handler = AggregatorQueueHandler(
+        getattr(BaseConfig, "LOG_AGGREGATOR_ADDRESS", "logs/aggregator.sock"),
+        max_size=getattr(BaseConfig, "LOG_QUEUE_MAX_SIZE", 0),
+    )
+    aggregator_handler.setLevel(min(logging.getLevelName(level.upper()) for level in levels))
+    aggregator_handler.setFormatter(formatter)
+    return aggregator_handler
+
+
 def _create_db_handler() -> Any:
     """
     创建数据库日志处理器
@@ -229,6 +258,8 @@ def _create_db_handler() -> Any:
 # 确保应用退出时正确关闭日志处理器
 def shutdown_logging() -> None:
     """关闭所有日志处理器，确保资源正确释放"""
+    # 先输出异步队列中剩余的日志，再关闭处理器
+    dash_logger.close()
     root_logger = logging.getLogger()
     for handler in root_logger.handlers:
         try:
@@ -1,11 +1,19 @@
+import re
+import sys
+import queue
+import string
 import inspect
 import logging
 import functools
+import threading
 import time
+import traceback
+from bisect import bisect_left
 from flask import request
 from typing import Any
 from ..public.enum import OperationType, LogModule
 from config.base_config import BaseConfig
+from .tracing import tracer
 
 # 导入配置
 
@@ -36,6 +44,109 @@ class SafeFormatter(logging.Formatter):
         return defaults.get(key, None)
 
 
+class CompiledTemplate:
+    """
+    预编译的日志消息模板
+
+    装饰时解析一次模板字段和函数签名，调用时按参数位置直接取值，
+    不再对每次调用执行 inspect.signature / bind / apply_defaults
+    """
+
+    def __init__(self, template: str, func):
+        self.template = template or ""
+        sig = inspect.signature(func)
+        fields = set()
+        for _, field_name, _, _ in string.Formatter().parse(self.template):
+            if field_name is None:
+                continue
+            root = re.split(r"[.\[]", field_name, maxsplit=1)[0]
+            if not root or root.isdigit():
+                raise ValueError(f"日志模板只支持命名参数: {self.template}")
+            fields.add(root)
+        missing = fields - set(sig.parameters)
+        if missing:
+            raise ValueError(
+                f"Action template missing required parameter: {', '.join(sorted(missing))}"
+            )
+        self.fields = frozenset(fields)
+        # (参数名, 位置索引(仅关键字参数为None), 默认值)
+        self._getters: list[tuple[str, int | None, Any]] = []
+        self._sig = None
+        positional = [
+            name
+            for name, param in sig.parameters.items()
+            if param.kind
+            in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        ]
+        for name in self.fields:
+            param = sig.parameters[name]
+            if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+                # *args/**kwargs 字段无法按位置取值，回退为签名绑定
+                self._sig = sig
+                break
+            default = None if param.default is inspect.Parameter.empty else param.default
+            index = positional.index(name) if name in positional else None
+            self._getters.append((name, index, default))
+
+    def render(self, args: tuple, kwargs: dict) -> str:
+        """用调用参数渲染模板"""
+        if not self.fields:
+            return self.template
+        if self._sig is not None:
+            bound_args = self._sig.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            return self.template.format(**bound_args.arguments)
+        values = {}
+        for name, index, default in self._getters:
+            if index is not None and index < len(args):
+                values[name] = args[index]
+            else:
+                values[name] = kwargs.get(name, default)
+        return self.template.format(**values)
+
+
+class OperationStats:
+    """被 log_operation 装饰函数的调用统计: 调用次数、失败次数、耗时直方图"""
+
+    # 耗时直方图上界(毫秒)，最后一个桶统计超过最大上界的调用
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(self.BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms: float, failed: bool = False):
+        """记录一次调用"""
+        index = bisect_left(self.BUCKETS_MS, duration_ms)
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+            self.total_ms += duration_ms
+            if duration_ms > self.max_ms:
+                self.max_ms = duration_ms
+            self.histogram[index] += 1
+
+    def snapshot(self) -> dict:
+        """获取统计快照"""
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in self.BUCKETS_MS]
+            labels.append(f">{self.BUCKETS_MS[-1]}ms")
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "errors": self.errors,
+                "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0,
+                "max_ms": round(self.max_ms, 3),
+                "histogram": dict(zip(labels, self.histogram)),
+            }
+
+
 class DashLogger:
     """
     一个支持动态参数解析、数据库存储和异步写入的日志类。
@@ -48,22 +159,112 @@ class DashLogger:
 
     配置项：
     - LOG_TO_DB: 是否启用数据库日志（True/False）
+    - LOG_ASYNC: 是否异步输出日志（True/False）
+
+    调用路径：
+    - 日志级别未启用时直接返回，不做任何格式化
+    - 调用方信息通过 sys._getframe 获取，不读取源码
+    - 异步模式下调用线程只采集必要信息入队，上下文组装、脱敏、
+      处理器输出(控制台/文件/数据库)都在后台消费线程中执行
+    - 异步队列长度上限为 LOG_QUEUE_MAX_SIZE，队列已满时丢弃新日志并计数，
+      不阻塞调用线程
     """
 
+    # 调用方栈帧深度: _capture_caller <- _log <- info/warning/... <- 调用方
+    CALLER_DEPTH = 3
+
     def __init__(self):
         self.logger = None  # Flask 的 logger 实例
         self.logmodule = LogModule
         self.operation = OperationType
-
-    def init_app(self, app_logger):
+        self.async_mode = getattr(BaseConfig, "LOG_ASYNC", True)
+        self._queue: queue.Queue | None = None  # 异步模式下的日志队列
+        self.queue_max_size = getattr(BaseConfig, "LOG_QUEUE_MAX_SIZE", 0)  # 队列最大长度，0 表示不限制
+        self.dropped = 0  # 队列已满时丢弃的日志条数
+        self._dropped_lock = threading.Lock()
+        self._consumer: threading.Thread | None = None  # 后台消费线程
+        self._operation_stats: dict[str, OperationStats] = {}  # 被装饰函数的调用统计
+
+    def init_app(self, app_logger, async_mode: bool | None = None):
         """
         绑定 Flask 的 logger
 
         参数:
             app_logger (logging.Logger): Flask 默认的 logger 实例
+            async_mode (bool): 是否异步输出日志，默认读取 BaseConfig.LOG_ASYNC
         """
         self.logger = app_logger
         self.logger.propagate = False  # ❗阻止传播到 root logger
+        if async_mode is not None:
+            self.async_mode = async_mode
+        if self.async_mode:
+            self._start_consumer()
+
+    def _start_consumer(self):
+        """启动后台消费线程"""
+        if self._consumer is not None and self._consumer.is_alive():
+            return
+        self._queue = queue.Queue(maxsize=self.queue_max_size)
+        self._consumer = threading.Thread(
+            target=self._consume, args=(self._queue,), name="dash-logger", daemon=True
+        )
+        self._consumer.start()
+
+    def _consume(self, log_queue: queue.Queue):
+        """后台消费线程: 组装日志上下文并交给处理器输出"""
+        while True:
+            item = log_queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                # flush 标记，之前入队的日志都已输出
+                item.set()
+                continue
+            try:
+                self._emit(*item)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """
+        等待已入队的日志全部输出
+
+        返回:
+            bool: 是否在超时前完成
+        """
+        log_queue = self._queue
+        if log_queue is None:
+            return True
+        done = threading.Event()
+        try:
+            log_queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        """停止后台消费线程，之后的日志改为同步输出"""
+        log_queue, consumer = self._queue, self._consumer
+        if log_queue is None:
+            return
+        self._queue = None
+        try:
+            log_queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        if consumer is not None:
+            consumer.join(timeout)
+        self._consumer = None
+
+    def get_queue_status(self) -> dict:
+        """获取异步日志队列状态，与 DatabaseLogHandler.get_queue_status 一起用于监控"""
+        log_queue = self._queue
+        return {
+            "async_mode": log_queue is not None,
+            "size": log_queue.qsize() if log_queue is not None else 0,
+            "max_size": self.queue_max_size,
+            "dropped": self.dropped,
+        }
 
     def info(
         self,
@@ -157,8 +358,33 @@ class DashLogger:
                 sanitized[field] = "***"
         return sanitized
 
+    def _capture_caller(self) -> tuple[str, str, str, int]:
+        """
+        获取调用方信息，只读取栈帧属性，不读取源码
+
+        返回:
+            tuple: (模块名, 文件路径, 函数名, 行号)
+        """
+        try:
+            frame = sys._getframe(self.CALLER_DEPTH)
+        except ValueError:
+            return "unknown", "unknown", "unknown", 0
+        code = frame.f_code
+        return (
+            frame.f_globals.get("__name__", "unknown"),
+            code.co_filename,
+            code.co_name,
+            frame.f_lineno,
+        )
+
     def _format_context(
-        self, logmodule: LogModule, operation: OperationType, extra: dict | None = None
+        self,
+        logmodule: LogModule,
+        operation: OperationType,
+        extra: dict | None,
+        caller: tuple[str, str, str, int],
+        ip: str,
+        trace_id: str | None = None,
     ):
         """
         格式化日志上下文信息，确保字段完整性
@@ -167,22 +393,13 @@ class DashLogger:
             logmodule (LogModule): 日志模块枚举
             operation (OperationType): 操作类型枚举
             extra (dict): 用户提供的额外字段
+            caller (tuple): _capture_caller 采集的调用方信息
+            ip (str): 客户端 IP
+            trace_id (str): 请求的链路追踪 ID，开启 LOG_TRACE_ENABLED 时写入 description
         返回:
             dict: 包含完整日志上下文的字典
         """
-        if extra is None:
-            extra = {}
-        stack = inspect.stack()
-        # 动态计算安全索引
-        safe_index = min(3, len(stack) - 1)
-        caller_frame = stack[safe_index] if len(stack) > 3 else None
-
-        # 添加空值保护
-        frame_info = {"log_module": "unknown", "log_funcName": "unknown"}
-        if caller_frame and hasattr(caller_frame, "frame"):
-            frame_globals = caller_frame.frame.f_globals
-            frame_info["log_module"] = frame_globals.get("__name__", "unknown")
-            frame_info["log_funcName"] = caller_frame.function
+        module_name, _, func_name, lineno = caller
         context = {
             "logmodule": logmodule,
             "operation": operation,
@@ -192,13 +409,15 @@ class DashLogger:
             "description": self._sanitize_data(
                 {
                     "user_id":"",
-                    "ip": self._get_ip(),
-                    "页面模块": frame_info["log_module"],
-                    "函数名": frame_info["log_funcName"],
-                    "行号": caller_frame.lineno if caller_frame else 0,
+                    "ip": ip,
+                    "页面模块": module_name,
+                    "函数名": func_name,
+                    "行号": lineno,
                 }
             ),
         }
+        if trace_id:
+            context["description"]["trace_id"] = trace_id
 
         if extra:
             self._merge_dict(context, extra)
@@ -227,19 +446,89 @@ class DashLogger:
         """
         通用日志方法，处理日志记录的公共逻辑
 
+        调用线程只做级别判断和必要信息采集(调用方、IP、时间、异常、trace_id)，
+        异步模式下入队后立即返回
+
         参数:
             level (str): 日志级别，如 "INFO", "ERROR"
             message (str): 日志消息内容
             logmodule (LogModule): 日志模块枚举
             operation (OperationType): 操作类型枚举
-            extra (dict): 附加信息，用于填充模板和扩展字段
+            extra (dict): 附加信息，用于填充模板和扩展字段，入队后调用方不应再修改
         """
         if not self.logger:
             return
-            # 控制台处理器
-        extra = self._format_context(logmodule, operation, extra)
-        log_method = getattr(self.logger, level.lower())
-        log_method(message, exc_info=(level == "ERROR"), extra=extra or {})
+        levelno = logging.getLevelName(level)
+        if not self.logger.isEnabledFor(levelno):
+            return
+        thread = threading.current_thread()
+        exc_info = sys.exc_info() if level == "ERROR" else None
+        if exc_info is not None and exc_info[0] is None:
+            exc_info = None
+        item = (
+            levelno,
+            message,
+            logmodule,
+            operation,
+            extra,
+            self._capture_caller(),
+            self._get_ip(),
+            time.time(),
+            (thread.ident, thread.name),
+            exc_info,
+            tracer.current_trace_id(),
+        )
+        log_queue = self._queue
+        if log_queue is not None:
+            try:
+                log_queue.put_nowait(item)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+        else:
+            self._emit(*item)
+
+    def _emit(
+        self,
+        levelno: int,
+        message: str,
+        logmodule: LogModule,
+        operation: OperationType,
+        extra: dict,
+        caller: tuple[str, str, str, int],
+        ip: str,
+        created: float,
+        thread: tuple[int | None, str],
+        exc_info,
+        trace_id: str | None = None,
+    ):
+        """组装日志上下文并构造 LogRecord，保留调用时的时间、线程和调用方信息"""
+        context = self._format_context(logmodule, operation, extra, caller, ip, trace_id)
+        _, pathname, func_name, lineno = caller
+        record = self.logger.makeRecord(
+            self.logger.name,
+            levelno,
+            pathname,
+            lineno,
+            message,
+            None,
+            exc_info,
+            func=func_name,
+            extra=context,
+        )
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        record.relativeCreated = (created - logging._startTime) * 1000
+        record.thread, record.threadName = thread
+        self.logger.handle(record)
+
+    def is_enabled_for(self, levelno: int) -> bool:
+        """判断日志级别是否启用，未绑定 logger 时视为未启用"""
+        return self.logger is not None and self.logger.isEnabledFor(levelno)
+
+    def get_operation_stats(self) -> list[dict]:
+        """获取所有被 log_operation 装饰函数的调用统计"""
+        return [stats.snapshot() for stats in self._operation_stats.values()]
 
     def log_operation(
         self,
@@ -251,6 +540,10 @@ class DashLogger:
     ):
         """
         日志装饰器
+
+        消息模板和函数签名在装饰时预编译；日志级别未启用时不解析参数、不格式化消息，
+        只记录调用统计(见 get_operation_stats 和被装饰函数的 stats 属性)；
+        请求内调用时记录为链路追踪的 operation span
         参数:
             message (str):日志消息,支持关联函数的 入参变量,如: 当前访问页面{pathname}
             logmodule (LogModule): 日志模块
@@ -260,70 +553,65 @@ class DashLogger:
         返回:
             function: 装饰后的函数
         """
+        log_methods = {
+            "INFO": self.info,
+            "DEBUG": self.debug,
+            "WARNING": self.warning,
+            "ERROR": self.error,
+        }
+        log_level = level.upper() if level.upper() in log_methods else "INFO"
+        log_method = log_methods[log_level]
+        levelno = logging.getLevelName(log_level)
 
         def decorator(f):
+            template = CompiledTemplate(message_str, f)
+            stats_name = f"{f.__module__}.{f.__qualname__}"
+            stats = self._operation_stats.setdefault(stats_name, OperationStats(stats_name))
+            func_name = f.__name__ if f.__name__ else "未知"
+
             @functools.wraps(f)
             def wrapped(*args, **kwargs):
+                # 执行原函数
+                start_time = time.perf_counter()
                 try:
-                    # 解析函数签名并获取实际参数
-                    from inspect import signature
-
-                    sig = signature(f)
-
-                    bound_args = sig.bind(*args, **kwargs)
-                    bound_args.apply_defaults()
-                    # 构建 action 字符串,为字典形式
-                    action_values = dict(bound_args.arguments)
-                    try:
-                        message_kwargs = ""
-                        if message_str:
-                            message_kwargs = message_str.format(**action_values)
-                    except KeyError as e:
-                        raise ValueError(
-                            f"Action template missing required parameter: {e}"
-                        )
-
-                    # 执行原函数
-                    start_time = time.time()
-                    result = f(*args, **kwargs)
-                    # 构造日志信息
-                    duration = int((time.time() - start_time) * 1000)  # 毫秒
-                    message = f"{logmodule.description}.{operation.description},{message_kwargs},状态:成功,耗时:{duration}ms"
-                    out_extra = {
-                        "duration_ms": duration,
-                        "status": "成功",
-                        "description": {
-                            "函数名": f.__name__ if f.__name__ else "未知",
-                        },
-                    }
-                    if extra:
-                        out_extra.update(extra)
-
-                    # 根据指定的日志等级记录日志
-                    if level.upper() == "INFO":
-                        self.info(message, logmodule, operation, extra=out_extra)
-                    elif level.upper() == "DEBUG":
-                        self.debug(message, logmodule, operation, extra=out_extra)
-                    elif level.upper() == "WARNING":
-                        self.warning(message, logmodule, operation, extra=out_extra)
-                    elif level.upper() == "ERROR":
-                        self.error(message, logmodule, operation, extra=out_extra)
-                    else:
-                        self.info(message, logmodule, operation, extra=out_extra)
-
-                    return result
-
+                    with tracer.span(stats_name, kind="operation"):
+                        result = f(*args, **kwargs)
                 except Exception as e:
+                    stats.record((time.perf_counter() - start_time) * 1000, failed=True)
                     # 异常情况下也记录错误日志
-                    error_message = f"函数执行失败:{message_kwargs},错误信息 {str(e)}"
-                    self.error(
-                        error_message,
-                        logmodule,
-                        operation,
-                        extra={"status": "失败", "error": str(e)},
-                    )
+                    if self.is_enabled_for(logging.ERROR):
+                        error_message = f"函数执行失败:{template.render(args, kwargs)},错误信息 {str(e)}"
+                        self.error(
+                            error_message,
+                            logmodule,
+                            operation,
+                            extra={"status": "失败", "error": str(e)},
+                        )
                     raise
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                stats.record(duration_ms)
+                if not self.is_enabled_for(levelno):
+                    return result
+
+                # 构造日志信息
+                message_kwargs = template.render(args, kwargs)
+                duration = int(duration_ms)  # 毫秒
+                message = f"{logmodule.description}.{operation.description},{message_kwargs},状态:成功,耗时:{duration}ms"
+                out_extra = {
+                    "duration_ms": duration,
+                    "status": "成功",
+                    "description": {
+                        "函数名": func_name,
+                    },
+                }
+                if extra:
+                    out_extra.update(extra)
+
+                # 根据指定的日志等级记录日志
+                log_method(message, logmodule, operation, extra=out_extra)
+                return result
 
+            wrapped.stats = stats
             return wrapped
 
         return decorator
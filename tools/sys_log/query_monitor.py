@@ -0,0 +1,199 @@
+"""
+SQL 查询监控
+
+通过 SQLAlchemy 引擎事件统计每个请求(Dash 回调)执行的 SQL 条数、数据库总耗时和重复语句:
+
+- 关系加载(selectin/joined)和循环中的查询不会直接体现在代码里，开启 LOG_QUERY_MONITOR_ENABLED 后，
+  超过 LOG_QUERY_MAX_COUNT / LOG_QUERY_MAX_DURATION_MS，或同一语句(只有参数不同)
+  执行次数达到 LOG_QUERY_DUPLICATE_THRESHOLD(疑似 N+1)时，记录 WARNING 日志
+- assert_max_queries: 回归测试辅助，代码块内执行的 SQL 超过指定条数时抛出 AssertionError，
+  不依赖 LOG_QUERY_MONITOR_ENABLED
+
+用法:
+    from models.base import get_db
+    from models.system.user.user_service import UserService
+    from tools.sys_log.query_monitor import assert_max_queries
+
+    with get_db() as db, assert_max_queries(3):
+        UserService(db, current_user_id=1).get_all_by_fields(page=1, page_size=10)
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from config.base_config import BaseConfig
+from .tracing import is_ignored_request, request_name
+
+# 当前上下文中进行统计的收集器(可嵌套，如请求内的 assert_max_queries)
+_active_stats: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+# IN 列表等连续的绑定参数，不同长度视为同一语句
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """语句形状: 合并空白、折叠绑定参数列表，只有参数不同的语句形状相同"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """一段代码(请求或 assert_max_queries 代码块)执行的 SQL 统计"""
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.count = 0
+        self.duration_ms = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.shapes[statement_shape(statement)] += 1
+
+    def duplicates(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """执行次数不少于 threshold 的语句形状，按次数倒序"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self, limit: int = 10) -> str:
+        """按执行次数倒序列出语句，用于断言失败信息"""
+        lines = [f"{self.count} 条 SQL，耗时 {self.duration_ms:.1f}ms:"]
+        lines.extend(f"  {n} x {shape}" for shape, n in self.shapes.most_common(limit))
+        if len(self.shapes) > limit:
+            lines.append(f"  ... 共 {len(self.shapes)} 种语句")
+        return "\n".join(lines)
+
+
+@contextmanager
+def collect_queries(name: str = "") -> Iterator[QueryStats]:
+    """统计代码块内当前上下文执行的 SQL(引擎需已调用 QueryMonitor.instrument_engine)"""
+    stats = QueryStats(name)
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+class QueryMonitor:
+    """
+    SQL 查询监控入口
+
+    - instrument_engine: 注册引擎事件，没有进行中的统计时只有一次 ContextVar 读取
+    - init_app: 注册 Flask 请求钩子，请求结束时按阈值检查(未开启 LOG_QUERY_MONITOR_ENABLED 时不注册)
+    """
+
+    def __init__(self):
+        self.enabled = getattr(BaseConfig, "LOG_QUERY_MONITOR_ENABLED", False)
+        self.max_count = getattr(BaseConfig, "LOG_QUERY_MAX_COUNT", 30)
+        self.max_duration_ms = getattr(BaseConfig, "LOG_QUERY_MAX_DURATION_MS", 500)
+        self.duplicate_threshold = getattr(BaseConfig, "LOG_QUERY_DUPLICATE_THRESHOLD", 5)
+        self._instrumented: set[int] = set()
+
+    def instrument_engine(self, engine):
+        """注册引擎事件，同一个引擎只注册一次"""
+        if id(engine) in self._instrumented:
+            return
+        from sqlalchemy import event
+
+        self._instrumented.add(id(engine))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if _active_stats.get() and context is not None:
+                context._query_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            start = getattr(context, "_query_start", None)
+            if start is None:
+                return
+            context._query_start = None
+            duration_ms = (time.perf_counter() - start) * 1000
+            for stats in _active_stats.get():
+                stats.record(statement, duration_ms)
+
+    def init_app(self, server):
+        """注册请求钩子"""
+        if not self.enabled:
+            return
+        from flask import g, request
+
+        @server.before_request
+        def _start_query_stats():
+            if is_ignored_request(request):
+                return
+            stats = QueryStats(request_name(request))
+            g._query_stats = stats, _active_stats.set(_active_stats.get() + (stats,))
+
+        @server.teardown_request
+        def _check_query_stats(error):
+            collected = g.pop("_query_stats", None)
+            if collected is None:
+                return
+            stats, token = collected
+            _active_stats.reset(token)
+            self.check(stats)
+
+    def check(self, stats: QueryStats) -> list[str]:
+        """
+        按阈值检查统计结果，超过时记录 WARNING 日志
+
+        返回:
+            list[str]: 超过的阈值说明，未超过时为空
+        """
+        problems = []
+        if self.max_count and stats.count > self.max_count:
+            problems.append(f"SQL 条数 {stats.count} 超过 {self.max_count}")
+        if self.max_duration_ms and stats.duration_ms > self.max_duration_ms:
+            problems.append(f"数据库耗时 {stats.duration_ms:.0f}ms 超过 {self.max_duration_ms}ms")
+        duplicates = stats.duplicates(self.duplicate_threshold) if self.duplicate_threshold else []
+        if duplicates:
+            problems.append(f"疑似 N+1: {len(duplicates)} 种语句重复执行不少于 {self.duplicate_threshold} 次")
+        if problems:
+            from .logger import dash_logger
+
+            dash_logger.warning(
+                f"SQL 查询超过阈值: {stats.name}, {'; '.join(problems)}",
+                logmodule=dash_logger.logmodule.MONITOR,
+                operation=dash_logger.operation.QUERY,
+                extra={
+                    "duration_ms": int(stats.duration_ms),
+                    "description": {
+                        "query_count": stats.count,
+                        "query_duration_ms": round(stats.duration_ms, 3),
+                        "duplicates": [
+                            {"count": n, "statement": shape[:500]} for shape, n in duplicates[:10]
+                        ],
+                    },
+                },
+            )
+        return problems
+
+
+@contextmanager
+def assert_max_queries(n: int, engine=None) -> Iterator[QueryStats]:
+    """
+    回归测试辅助: 代码块内执行的 SQL 超过 n 条时抛出 AssertionError，信息中列出执行的语句
+
+    参数:
+        n: 允许的最大 SQL 条数
+        engine: 统计的引擎，默认为应用数据库引擎 models.base.engine
+    """
+    if engine is None:
+        from models.base import engine
+    query_monitor.instrument_engine(engine)
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > n:
+        raise AssertionError(f"期望最多 {n} 条 SQL，实际执行 {stats.report()}")
+
+
+# 全局 SQL 查询监控实例
+query_monitor = QueryMonitor()
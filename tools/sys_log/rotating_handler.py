@@ -0,0 +1,239 @@
+import os
+import re
+import gzip
+import time
+import queue
+import shutil
+import threading
+from contextlib import contextmanager
+from logging.handlers import TimedRotatingFileHandler
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，只支持单进程轮转
+    fcntl = None
+
+
+class SizeTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    按大小或时间轮转、后台压缩的日志文件处理器
+
+    - 轮转: 到达时间点(when/interval)或文件超过 max_bytes 时轮转，先到者触发
+    - 压缩: 轮转出的文件由后台线程 gzip 压缩并清理超出 backup_count 的历史文件，
+      不占用写日志的线程
+    - 多进程(多个 gunicorn worker 写同一个文件):
+        per_process=True: 每个进程写自己的文件 app.<pid>.log，互不影响
+        per_process=False: 所有进程以追加方式(O_APPEND)写同一个文件，写入无需加锁；
+            每次写入前检查文件是否已被其他进程轮转(inode 变化)并重新打开；
+            轮转时对 <文件名>.lock 加文件锁，加锁后再次确认是否仍需轮转，避免重复轮转
+
+    轮转文件命名:
+        时间轮转: app.2025-08-01.log (时间段开始时间，格式同 TimedRotatingFileHandler.suffix)
+        大小轮转: app.2025-08-01.1.log、app.2025-08-01.2.log ...
+        压缩后追加 .gz
+    """
+
+    # 多进程共用文件时，轮转出的文件最后一次写入后等待多久再压缩(秒)
+    COMPRESS_GRACE = 1.0
+
+    def __init__(
+        self,
+        filename: str,
+        when: str = "midnight",
+        interval: int = 1,
+        backup_count: int = 0,
+        max_bytes: int = 0,
+        compress: bool = True,
+        per_process: bool = False,
+        encoding: str | None = None,
+        delay: bool = False,
+    ):
+        self.root, self.ext = os.path.splitext(os.path.abspath(filename))
+        self.per_process = per_process
+        if per_process:
+            filename = f"{self.root}.{os.getpid()}{self.ext}"
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._stream_id: tuple[int, int] | None = None
+        # 触发轮转判断的日志长度，加锁后按同样的条件再次确认
+        self._pending = 0
+        self._compress_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._compressor: threading.Thread | None = None
+        super().__init__(
+            filename,
+            when=when,
+            interval=interval,
+            backupCount=backup_count,
+            encoding=encoding,
+            delay=delay,
+        )
+        self.lock_filename = f"{self.baseFilename}.lock"
+        # 历史文件: 文件名中含时间段的轮转文件(含其他进程的)，不含正在写入的文件
+        self._backup_pattern = re.compile(
+            rf"^{re.escape(os.path.basename(self.root))}(\.\d+)?\.\d{{4}}-\d{{2}}-\d{{2}}"
+            rf"[^/\\]*{re.escape(self.ext)}(\.gz)?$"
+        )
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._stream_id = (stat.st_dev, stat.st_ino)
+        return stream
+
+    def _sync_stream(self) -> int:
+        """文件被其他进程轮转(或删除)后重新打开，返回当前文件大小"""
+        if self.stream is None:
+            self.stream = self._open()
+        if not self.per_process:
+            try:
+                stat = os.stat(self.baseFilename)
+            except FileNotFoundError:
+                stat = None
+            if stat is None or (stat.st_dev, stat.st_ino) != self._stream_id:
+                self.stream.close()
+                self.stream = self._open()
+            elif stat is not None:
+                return stat.st_size
+        return os.fstat(self.stream.fileno()).st_size
+
+    def _size_due(self, size: int, pending: int = 0) -> bool:
+        return self.max_bytes > 0 and size > 0 and size + pending >= self.max_bytes
+
+    def shouldRollover(self, record) -> bool:
+        size = self._sync_stream()
+        if int(time.time()) >= self.rolloverAt:
+            return True
+        if self.max_bytes > 0:
+            # 格式化结果缓存在日志记录上，写入时不会重复序列化
+            self._pending = len(self.format(record)) + 1
+            return self._size_due(size, self._pending)
+        return False
+
+    @contextmanager
+    def _rotation_lock(self):
+        """多进程共用文件时，对锁文件加排他锁"""
+        if self.per_process or fcntl is None:
+            yield
+            return
+        with open(self.lock_filename, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rotated_name(self, period_start: float, sequence: int | None = None) -> str:
+        name = f"{os.path.splitext(self.baseFilename)[0]}.{time.strftime(self.suffix, time.localtime(period_start))}"
+        if sequence is not None:
+            name = f"{name}.{sequence}"
+        return name + self.ext
+
+    def _next_sequence(self, now: float) -> int:
+        """大小轮转的序号: 同一时间段内已有最大序号 + 1，已清理的序号不会复用"""
+        prefix = os.path.basename(os.path.splitext(self._rotated_name(now))[0]) + "."
+        sequences = [0]
+        for name in os.listdir(os.path.dirname(self.baseFilename)):
+            if name.startswith(prefix):
+                sequence = name[len(prefix):].split(".", 1)[0]
+                if sequence.isdigit():
+                    sequences.append(int(sequence))
+        return max(sequences) + 1
+
+    @staticmethod
+    def _exists(path: str) -> bool:
+        return os.path.exists(path) or os.path.exists(f"{path}.gz")
+
+    def doRollover(self):
+        now = int(time.time())
+        rotated = None
+        with self._rotation_lock():
+            # 加锁后重新确认: 其他进程可能已完成轮转
+            size = self._sync_stream()
+            period_start = self.rolloverAt - self.interval
+            time_due = now >= self.rolloverAt and not self._exists(self._rotated_name(period_start))
+            if time_due or self._size_due(size, self._pending):
+                if time_due:
+                    rotated = self._rotated_name(period_start)
+                else:
+                    rotated = self._rotated_name(now, self._next_sequence(now))
+                self.stream.close()
+                self.stream = None
+                if os.path.exists(self.baseFilename) and size > 0:
+                    os.rename(self.baseFilename, rotated)
+                else:
+                    rotated = None
+                self.stream = self._open()
+        if now >= self.rolloverAt:
+            self.rolloverAt = self.computeRollover(now)
+        if rotated is not None:
+            self._submit(rotated)
+
+    def _submit(self, path: str):
+        """把轮转出的文件交给后台线程压缩和清理"""
+        if self._compressor is None or not self._compressor.is_alive():
+            self._compressor = threading.Thread(
+                target=self._compress_worker, name="log-file-compressor", daemon=True
+            )
+            self._compressor.start()
+        self._compress_queue.put(path)
+
+    def _compress_worker(self):
+        while True:
+            path = self._compress_queue.get()
+            if path is None:
+                return
+            try:
+                if self.compress:
+                    if not self.per_process:
+                        # 其他进程可能在检查文件后、写入前文件被轮转，等待在途写入完成
+                        delay = os.path.getmtime(path) + self.COMPRESS_GRACE - time.time()
+                        if delay > 0:
+                            time.sleep(delay)
+                    self._gzip(path)
+                self._delete_old_backups()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _gzip(path: str):
+        """
+        压缩为 path.gz，先写临时文件再改名，压缩中断不会留下不完整的 .gz；
+        压缩期间文件仍有写入时重新压缩。.gz 保留原文件的修改时间，清理时按轮转先后排序
+        """
+        tmp_path = f"{path}.gz.tmp"
+        while True:
+            stat = os.stat(path)
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            if os.path.getsize(path) == stat.st_size:
+                break
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, f"{path}.gz")
+        os.remove(path)
+
+    def _delete_old_backups(self):
+        """只保留最新的 backup_count 个历史文件(所有进程合计)"""
+        if self.backupCount <= 0:
+            return
+        directory = os.path.dirname(self.baseFilename)
+        backups = []
+        for name in os.listdir(directory):
+            if self._backup_pattern.match(name):
+                path = os.path.join(directory, name)
+                try:
+                    backups.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    continue
+        backups.sort()
+        for _, path in backups[: max(0, len(backups) - self.backupCount)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self, timeout: float = 5.0):
+        """关闭文件，等待后台线程完成已提交的压缩(最多 timeout 秒)"""
+        super().close()
+        if self._compressor is not None and self._compressor.is_alive():
+            self._compress_queue.put(None)
+            self._compressor.join(timeout)
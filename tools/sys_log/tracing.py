@@ -0,0 +1,361 @@
+"""
+请求链路追踪
+
+每个请求在 before_request 中创建 trace(trace_id 写入 DashLogger 日志的 description 和响应头 X-Trace-Id)，
+请求内的操作(log_operation 装饰的服务方法)、SQL 语句、页面渲染(route_menu.render_by_url)记录为嵌套的 span，
+请求结束时总耗时不低于 LOG_TRACE_MIN_DURATION_MS 的 trace 导出到 JSON Lines 文件或日志数据库，
+用于定位慢回调的耗时分布。
+
+当前 span 保存在 contextvars 中，没有进行中的 trace(未开启追踪、静态资源请求、后台线程)时，
+span() 直接返回，不产生额外开销。
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+from typing import Any, Iterator
+
+from config.base_config import BaseConfig
+
+# 当前 span(请求根 span 或嵌套 span)
+_current_span: ContextVar["Span | None"] = ContextVar("trace_span", default=None)
+
+# 不追踪的请求路径(前缀)
+IGNORED_PATH_PREFIXES = ("/assets/", "/_dash-component-suites/", "/_reload-hash", "/_favicon.ico")
+# 沿用上游传入的请求 ID(X-Request-ID)作为 trace_id 时的格式要求
+_REQUEST_ID_PATTERN = re.compile(r"[\w\-]{1,64}")
+# SQL 语句记录的最大长度
+SQL_MAX_LENGTH = 500
+
+
+def is_ignored_request(request) -> bool:
+    """静态资源等不需要追踪和统计的请求"""
+    return request.path.startswith(IGNORED_PATH_PREFIXES)
+
+
+def request_name(request) -> str:
+    """请求名称: Dash 回调请求按回调输出命名，其他请求为 方法 + 路径"""
+    if request.path == "/_dash-update-component":
+        body = request.get_json(silent=True) or {}
+        return f"callback {body.get('output', '')}"
+    return f"{request.method} {request.path}"
+
+
+class Span:
+    """
+    一段计时的操作
+
+    属性:
+        trace: 所属 trace
+        span_id: 在 trace 内的编号，根 span 为 1
+        parent_id: 父 span 编号，根 span 为 None
+        name: 名称
+        kind: 类型，request/operation/sql/render
+        attributes: 附加信息
+        status: 成功/失败
+    """
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "attributes", "status", "_start", "duration_ms")
+
+    def __init__(self, trace: "Trace", parent_id: int | None, name: str, kind: str, attributes: dict | None = None):
+        self.trace = trace
+        self.span_id = trace.next_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = "成功"
+        self._start = time.perf_counter()
+        self.duration_ms = 0.0
+
+    def finish(self, error: BaseException | None = None):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.status = "失败"
+            self.attributes["error"] = f"{type(error).__name__}: {error}"
+        self.trace.add(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "offset_ms": round((self._start - self.trace.start) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """一个请求的全部 span，超过 max_spans 的 span 只计数不保存"""
+
+    def __init__(self, name: str, trace_id: str | None = None, max_spans: int = 500):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.name = name
+        self.timestamp = datetime.now()
+        self.start = time.perf_counter()
+        self.max_spans = max_spans
+        self.spans: list[Span] = []
+        self.dropped_spans = 0
+        self._ids = count(1)
+        self.root = Span(self, None, name, "request")
+
+    def next_span_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, span: Span):
+        if len(self.spans) < self.max_spans or span is self.root:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        """导出格式: 请求信息 + 按开始时间排序的 span 列表"""
+        spans = sorted(self.spans, key=lambda span: span._start)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "timestamp": self.timestamp.isoformat(sep=" ", timespec="milliseconds"),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.root.status,
+            "attributes": self.root.attributes,
+            "span_count": len(spans) + self.dropped_spans,
+            "dropped_spans": self.dropped_spans,
+            "summary": self.summary(),
+            "spans": [span.to_dict() for span in spans],
+        }
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """按 span 类型汇总次数和耗时(不含根 span)"""
+        summary: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            if span is self.root:
+                continue
+            item = summary.setdefault(span.kind, {"count": 0, "duration_ms": 0.0})
+            item["count"] += 1
+            item["duration_ms"] = round(item["duration_ms"] + span.duration_ms, 3)
+        return summary
+
+
+class TraceExporter(ABC):
+    """trace 导出接口"""
+
+    name = ""
+
+    @abstractmethod
+    def export(self, trace: Trace):
+        """导出一个已结束的 trace"""
+
+
+class JsonlTraceExporter(TraceExporter):
+    """按天写入 <path>/trace-YYYYMMDD.jsonl，每行一个 trace，多进程以追加方式写同一个文件"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_dict(), ensure_ascii=False, default=str) + "\n"
+        filename = os.path.join(self.path, f"trace-{trace.timestamp:%Y%m%d}.jsonl")
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(filename, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class LogTraceExporter(TraceExporter):
+    """作为 WARNING 级别日志输出(慢请求)，随数据库日志处理器写入日志库，span 保存在 description 中"""
+
+    name = "log"
+
+    def export(self, trace: Trace):
+        from .logger import dash_logger
+
+        dash_logger.warning(
+            f"慢请求: {trace.name}, 耗时:{int(trace.duration_ms)}ms",
+            logmodule=dash_logger.logmodule.WEB,
+            operation=dash_logger.operation.ACCESS,
+            extra={
+                "duration_ms": int(trace.duration_ms),
+                "status": trace.root.status,
+                "description": {"trace": trace.to_dict()},
+            },
+        )
+
+
+# 可用的 trace 导出方式
+TRACE_EXPORTERS: dict[str, type[TraceExporter]] = {
+    JsonlTraceExporter.name: JsonlTraceExporter,
+    LogTraceExporter.name: LogTraceExporter,
+}
+
+
+def create_exporter(name: str, config=BaseConfig) -> TraceExporter:
+    """根据配置创建 trace 导出器"""
+    if name not in TRACE_EXPORTERS:
+        raise ValueError(f"未知的 trace 导出方式: {name}")
+    if name == JsonlTraceExporter.name:
+        return JsonlTraceExporter(getattr(config, "LOG_TRACE_PATH", "logs/trace"))
+    return TRACE_EXPORTERS[name]()
+
+
+class Tracer:
+    """
+    链路追踪入口
+
+    - init_app: 注册 Flask 请求钩子，每个请求一个 trace
+    - instrument_engine: 注册 SQLAlchemy 事件，请求内执行的 SQL 记录为 span
+    - span: 上下文管理器，记录嵌套 span
+    - current_trace_id: 当前请求的 trace_id，DashLogger 写入日志 description
+    """
+
+    def __init__(self):
+        self.enabled = getattr(BaseConfig, "LOG_TRACE_ENABLED", False)
+        self.min_duration_ms = getattr(BaseConfig, "LOG_TRACE_MIN_DURATION_MS", 0)
+        self.max_spans = getattr(BaseConfig, "LOG_TRACE_MAX_SPANS", 500)
+        self.exporter: TraceExporter | None = None
+        self._instrumented: set[int] = set()
+
+    def init_app(self, server):
+        """注册请求钩子(未开启 LOG_TRACE_ENABLED 时不注册)"""
+        if not self.enabled:
+            return
+        from flask import g, request
+
+        if self.exporter is None:
+            self.exporter = create_exporter(getattr(BaseConfig, "LOG_TRACE_EXPORTER", "file"))
+
+        @server.before_request
+        def _start_request_trace():
+            if is_ignored_request(request):
+                return
+            name = request_name(request)
+            request_id = request.headers.get("X-Request-ID", "")
+            g._trace_root = self.start_trace(
+                name,
+                trace_id=request_id if _REQUEST_ID_PATTERN.fullmatch(request_id) else None,
+                path=request.path,
+            )
+
+        @server.after_request
+        def _add_trace_header(response):
+            root = g.get("_trace_root")
+            if root is not None:
+                root.attributes["status_code"] = response.status_code
+                response.headers["X-Trace-Id"] = root.trace.trace_id
+            return response
+
+        @server.teardown_request
+        def _end_request_trace(error):
+            root = g.pop("_trace_root", None)
+            if root is not None:
+                self.end_trace(root, error)
+
+    def start_trace(self, name: str, trace_id: str | None = None, **attributes) -> Span:
+        """开始一个 trace，返回根 span，之后的 span 都挂在其下"""
+        trace = Trace(name, trace_id=trace_id, max_spans=self.max_spans)
+        trace.root.attributes.update(attributes)
+        _current_span.set(trace.root)
+        return trace.root
+
+    def end_trace(self, root: Span, error: BaseException | None = None) -> Trace:
+        """结束 trace，总耗时达到阈值时导出"""
+        _current_span.set(None)
+        root.finish(error)
+        trace = root.trace
+        if self.exporter is not None and trace.duration_ms >= self.min_duration_ms:
+            try:
+                self.exporter.export(trace)
+            except Exception as e:
+                print(f"trace 导出失败: {e}", file=sys.stderr)
+        return trace
+
+    @staticmethod
+    def current_trace_id() -> str | None:
+        span = _current_span.get()
+        return span.trace.trace_id if span is not None else None
+
+    @staticmethod
+    @contextmanager
+    def span(name: str, kind: str = "operation", **attributes) -> Iterator[Span | None]:
+        """
+        记录一个嵌套 span，没有进行中的 trace 时不记录
+
+        用法:
+            with tracer.span("导出用户", kind="operation", rows=100):
+                ...
+        """
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(parent.trace, parent.span_id, name, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.finish(e)
+            raise
+        else:
+            span.finish()
+        finally:
+            _current_span.reset(token)
+
+    def instrument_engine(self, engine):
+        """SQL 语句记录为当前 span 的子 span(未开启 LOG_TRACE_ENABLED 时不注册)"""
+        if not self.enabled or id(engine) in self._instrumented:
+            return
+        from sqlalchemy import event
+
+        self._instrumented.add(id(engine))
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            parent = _current_span.get()
+            if parent is None or context is None:
+                return
+            context._trace_span = Span(
+                parent.trace,
+                parent.span_id,
+                statement.split(None, 1)[0].upper() if statement else "SQL",
+                "sql",
+                {"statement": statement[:SQL_MAX_LENGTH], "executemany": executemany},
+            )
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            span = getattr(context, "_trace_span", None)
+            if span is not None:
+                context._trace_span = None
+                if cursor.rowcount is not None and cursor.rowcount >= 0:
+                    span.attributes["rowcount"] = cursor.rowcount
+                span.finish()
+
+        @event.listens_for(engine, "handle_error")
+        def _handle_error(exception_context):
+            context = exception_context.execution_context
+            span = getattr(context, "_trace_span", None)
+            if span is not None:
+                context._trace_span = None
+                span.finish(exception_context.original_exception)
+
+
+# 全局链路追踪实例
+tracer = Tracer()
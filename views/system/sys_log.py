@@ -1,11 +1,13 @@
 import feffery_antd_components as fac
-from dash import html
+from dash import html, dcc
 from tools.public.enum import LogModule, OperationType
 from callbacks.system_c import sys_log_c
 
 
 def render(*args, **kwargs):
     return [
+        # 日志列表游标分页续页令牌存储容器
+        dcc.Store(id="log-page-cursor-store"),
         fac.AntdRow(
             [
                 fac.AntdCol(
@@ -17,6 +19,18 @@ def render(*args, **kwargs):
                                         [
                                             fac.AntdForm(
                                                 [
+                                                    fac.AntdFormItem(
+                                                        # 日志内容全文搜索输入框
+                                                        fac.AntdInput(
+                                                            id="log-keyword-input",
+                                                            name="keyword",
+                                                            placeholder="搜索日志内容",
+                                                            autoComplete="off",
+                                                            allowClear=True,
+                                                            style={"width": 200},
+                                                        ),
+                                                        label="关键字",
+                                                    ),
                                                     fac.AntdFormItem(
                                                         # 日志等级搜索选择框
                                                         fac.AntdSelect(
@@ -17,6 +17,8 @@ def render(*args, **kwargs):
         dcc.Store(id="user-form-store"),
         # 用户管理模块删除操作行key存储容器
         dcc.Store(id="user-delete-ids-store"),
+        # 用户列表游标分页续页令牌存储容器
+        dcc.Store(id="user-page-cursor-store"),
         dcc.Store(id="dept-tree-store"),  # 存储原始部门数据
         fac.AntdRow(
             [